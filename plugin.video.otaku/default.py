@@ -16,8 +16,6 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-# import time
-# t0 = time.perf_counter_ns()
 import sys
 
 from resources.lib.ui import control
@@ -32,11 +30,17 @@ if control.ADDON_VERSION != control.getSetting('version'):
 
 if __name__ == "__main__":
     from resources.lib import Main  # noQA
+    if control.settingids.request_trace:
+        from resources.lib.ui import client
+        client.trace_begin()
     plugin_url = control.get_plugin_url(sys.argv[0])
     plugin_params = control.get_plugin_params(sys.argv[2])
     router_process(plugin_url, plugin_params)
     control.log(f'Finished Running: {plugin_url=} {plugin_params=}')
-
-# t1 = time.perf_counter_ns()
-# totaltime = (t1-t0)/1_000_000
-# control.print(totaltime, 'ms')
+    from resources.lib.ui import database, thread_pool
+    control.log(f'Memory cache: {database.memory_cache.stats()}', 'debug')
+    control.log(f'Thread pool: {thread_pool.pool.stats()}', 'debug')
+    if mapping_stats := database.mapping_index_stats():
+        control.log(f'Mapping index: {mapping_stats}', 'debug')
+    if control.settingids.request_trace:
+        client.trace_dump(f'{plugin_url} {plugin_params}')
@@ -2009,7 +2009,8 @@ class AniListBrowser(BrowserBase):
         hasNextPage = json_res['pageInfo']['hasNextPage']
         get_meta.collect_meta(json_res['ANIME'])
         mapfunc = partial(self.base_anilist_view, completed=self.open_completed())
-        all_results = list(filter(lambda x: True if x else False, map(mapfunc, json_res['ANIME'])))
+        with database.prefetch([x.get('idMal') for x in json_res['ANIME']], anilist_id=[x.get('id') for x in json_res['ANIME']]):
+            all_results = list(filter(lambda x: True if x else False, map(mapfunc, json_res['ANIME'])))
         all_results += self.handle_paging(hasNextPage, base_plugin_url, page)
         return all_results
 
@@ -2018,7 +2019,8 @@ class AniListBrowser(BrowserBase):
         res = [edge['node']['mediaRecommendation'] for edge in json_res['edges'] if edge['node']['mediaRecommendation']]
         get_meta.collect_meta(res)
         mapfunc = partial(self.base_anilist_view, completed=self.open_completed())
-        all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
+        with database.prefetch([x.get('idMal') for x in res], anilist_id=[x.get('id') for x in res]):
+            all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
         all_results += self.handle_paging(hasNextPage, base_plugin_url, page)
         return all_results
 
@@ -2031,14 +2033,16 @@ class AniListBrowser(BrowserBase):
                 res.append(tnode)
         get_meta.collect_meta(res)
         mapfunc = partial(self.base_anilist_view, completed=self.open_completed())
-        all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
+        with database.prefetch([x.get('idMal') for x in res], anilist_id=[x.get('id') for x in res]):
+            all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
         return all_results
 
     def process_watch_order_view(self, json_res):
         res = json_res
         get_meta.collect_meta(res)
         mapfunc = partial(self.base_anilist_view, completed=self.open_completed())
-        all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
+        with database.prefetch([x.get('idMal') for x in res], anilist_id=[x.get('id') for x in res]):
+            all_results = list(filter(lambda x: True if x else False, map(mapfunc, res)))
         return all_results
 
     def process_res(self, res):
@@ -2444,7 +2448,8 @@ class AniListBrowser(BrowserBase):
 
         mapfunc = partial(self.base_anilist_view, completed=self.open_completed())
         get_meta.collect_meta(anime_res)
-        all_results = list(map(mapfunc, anime_res))
+        with database.prefetch([x.get('idMal') for x in anime_res], anilist_id=[x.get('id') for x in anime_res]):
+            all_results = list(map(mapfunc, anime_res))
         all_results += self.handle_paging(hasNextPage, base_plugin_url, page)
         return all_results
 
@@ -418,7 +418,7 @@ class AnimeScheduleCalendar:
 
     def _search_anime_by_route(self, route):
         """
-        Fetch anime by route slug using direct endpoint with retry logic
+        Fetch anime by route slug using direct endpoint, transient failures are retried by the client
 
         Args:
             route (str): Anime route slug
@@ -426,33 +426,20 @@ class AnimeScheduleCalendar:
         Returns:
             dict: Anime data if found, None otherwise
         """
-        import time
-
-        max_attempts = 2
-        retry_delay = 0.2  # Reduced from 0.3 for faster retries
-
-        for attempt in range(max_attempts):
-            try:
-                # Use direct route endpoint: /anime/{route}
-                url = f"{BASE_URL}/anime/{route}"
-
-                response = client.get(url, timeout=6)  # Reduced from 8 to 6 seconds
+        try:
+            # Use direct route endpoint: /anime/{route}
+            url = f"{BASE_URL}/anime/{route}"
 
-                if response.status_code == 200:
-                    data = response.json()
-                    # Direct endpoint returns single anime object, not a list
-                    if data and isinstance(data, dict):
-                        return data
+            response = client.get(url, timeout=6)  # Reduced from 8 to 6 seconds
 
-                # If we got here, no results or bad status - try again
-                if attempt < max_attempts - 1:
-                    time.sleep(retry_delay)
+            if response.status_code == 200:
+                data = response.json()
+                # Direct endpoint returns single anime object, not a list
+                if data and isinstance(data, dict):
+                    return data
 
-            except Exception as e:
-                if attempt < max_attempts - 1:
-                    time.sleep(retry_delay)
-                else:
-                    control.log(f"Error fetching route {route} after {max_attempts} attempts: {str(e)}", "debug")
+        except Exception as e:
+            control.log(f"Error fetching route {route}: {str(e)}", "debug")
 
         return None
 
@@ -1943,7 +1943,6 @@ def remove_punctuation(s):
 
 
 def find_episode_by_title(mal_ids, episode_titles):
-    import time
     from resources.lib.indexers.jikanmoe import JikanAPI
     from resources.lib.ui.source_utils import get_fuzzy_match
     # Split titles on '|' and clean each part
@@ -1955,40 +1954,12 @@ def find_episode_by_title(mal_ids, episode_titles):
     from resources.lib.ui.source_utils import clean_text
     cleaned_titles = [clean_text(t) for t in split_titles]
     jikan_api = JikanAPI()
-    requests_made = 0
-    last_request_time = time.time()
     for mal_id in mal_ids:
-        # Rate limit: max 3 requests every 4 seconds, space each request by at least 1.33 seconds
-        if requests_made == 3:
-            elapsed = time.time() - last_request_time
-            if elapsed < 4.0:
-                time.sleep(4.0 - elapsed)
-            requests_made = 0
-            last_request_time = time.time()
-        # Space each request by at least 1.33 seconds
-        if requests_made > 0:
-            time.sleep(1.33)
-        # Retry logic for HTTP 429
-        retries = 0
-        max_retries = 3
-        backoff = 2
-        while retries <= max_retries:
-            try:
-                episodes = jikan_api.get_episode_meta(mal_id)
-                requests_made += 1
-                break
-            except Exception as e:
-                if hasattr(e, 'response') and getattr(e.response, 'status_code', None) == 429:
-                    control.log(f"Jikan API rate limited (429) for mal_id {mal_id}, retrying in {backoff} seconds...")
-                    time.sleep(backoff)
-                    retries += 1
-                    backoff *= 2
-                else:
-                    control.log(f"Jikan API error for mal_id {mal_id}: {e}")
-                    episodes = []
-                    break
-        else:
-            control.log(f"Jikan API failed for mal_id {mal_id} after {max_retries} retries.")
+        # client spaces Jikan requests and retries 429/5xx answers
+        try:
+            episodes = jikan_api.get_episode_meta(mal_id)
+        except Exception as e:
+            control.log(f"Jikan API error for mal_id {mal_id}: {e}")
             episodes = []
         # Prepare candidate episode titles from Jikan
         episode_candidates = []
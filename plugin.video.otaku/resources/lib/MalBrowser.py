@@ -38,7 +38,8 @@ class MalBrowser(BrowserBase):
     def process_mal_view(self, res, base_plugin_url, page):
         get_meta.collect_meta(res['data'])
         mapfunc = partial(self.base_mal_view, completed=self.open_completed())
-        all_results = list(map(mapfunc, res['data']))
+        with database.prefetch([x['mal_id'] for x in res['data']]):
+            all_results = list(map(mapfunc, res['data']))
         hasNextPage = res['pagination']['has_next_page']
         all_results += self.handle_paging(hasNextPage, base_plugin_url, page)
         return all_results
@@ -141,29 +142,19 @@ class MalBrowser(BrowserBase):
         get_meta.collect_meta(recommendations['data'])
 
         recommendation_res = []
-        count = 0
-        retry_limit = 3
 
+        # Transient Jikan failures are retried by the client's RetryPolicy
         for recommendation in recommendations['data']:
             entry = recommendation.get('entry')
             if entry and entry.get('mal_id'):
-                retries = 0
-                while retries < retry_limit:
-                    res_data = database.get(self.get_base_res, 24, f"{self._BASE_URL}/anime/{entry['mal_id']}")
-                    if res_data is not None and 'data' in res_data:
-                        res_data['data']['votes'] = recommendation.get('votes')
-                        recommendation_res.append(res_data['data'])
-                        break
-                    else:
-                        retries += 1
-                        control.sleep(int(100 * retries))  # Reduced linear backoff
-
-                count += 1
-                if count % 3 == 0:
-                    control.sleep(1000)  # Ensure we do not exceed 3 requests per second
+                res_data = database.get(self.get_base_res, 24, f"{self._BASE_URL}/anime/{entry['mal_id']}")
+                if res_data is not None and 'data' in res_data:
+                    res_data['data']['votes'] = recommendation.get('votes')
+                    recommendation_res.append(res_data['data'])
 
         mapfunc = partial(self.base_mal_view, completed=self.open_completed())
-        all_results = list(map(mapfunc, recommendation_res))
+        with database.prefetch([x['mal_id'] for x in recommendation_res]):
+            all_results = list(map(mapfunc, recommendation_res))
         return all_results
 
     def get_relations(self, mal_id):
@@ -172,29 +163,18 @@ class MalBrowser(BrowserBase):
         get_meta.collect_meta(meta_ids)
 
         relation_res = []
-        count = 0
-        retry_limit = 3
 
         for relation in relations['data']:
             for entry in relation['entry']:
                 if entry['type'] == 'anime':
-                    retries = 0
-                    while retries < retry_limit:
-                        res_data = database.get(self.get_base_res, 24, f"{self._BASE_URL}/anime/{entry['mal_id']}")
-                        if res_data is not None and 'data' in res_data:
-                            res_data['data']['relation'] = relation['relation']
-                            relation_res.append(res_data['data'])
-                            break
-                        else:
-                            retries += 1
-                            control.sleep(int(100 * retries))  # Reduced linear backoff
-
-                    count += 1
-                    if count % 3 == 0:
-                        control.sleep(1000)  # Ensure we do not exceed 3 requests per second
+                    res_data = database.get(self.get_base_res, 24, f"{self._BASE_URL}/anime/{entry['mal_id']}")
+                    if res_data is not None and 'data' in res_data:
+                        res_data['data']['relation'] = relation['relation']
+                        relation_res.append(res_data['data'])
 
         mapfunc = partial(self.base_mal_view, completed=self.open_completed())
-        all_results = list(map(mapfunc, relation_res))
+        with database.prefetch([x['mal_id'] for x in relation_res]):
+            all_results = list(map(mapfunc, relation_res))
         return all_results
 
     def get_watch_order(self, mal_id):
@@ -219,27 +199,15 @@ class MalBrowser(BrowserBase):
             get_meta.collect_meta(meta_ids)
 
             watch_order_list = []
-            count = 0
-            retry_limit = 3
 
             for idmal in mal_ids:
-                retries = 0
-                while retries < retry_limit:
-                    mal_item = database.get(self.get_base_res, 24, f'{self._BASE_URL}/anime/{idmal}')
-
-                    if mal_item is not None and 'data' in mal_item:
-                        watch_order_list.append(mal_item['data'])
-                        break
-                    else:
-                        retries += 1
-                        control.sleep(int(100 * retries))  # Reduced linear backoff
-
-                count += 1
-                if count % 3 == 0:
-                    control.sleep(1000)  # Ensure we do not exceed 3 requests per second
+                mal_item = database.get(self.get_base_res, 24, f'{self._BASE_URL}/anime/{idmal}')
+                if mal_item is not None and 'data' in mal_item:
+                    watch_order_list.append(mal_item['data'])
 
         mapfunc = partial(self.base_mal_view, completed=self.open_completed())
-        all_results = list(map(mapfunc, watch_order_list))
+        with database.prefetch([x['mal_id'] for x in watch_order_list]):
+            all_results = list(map(mapfunc, watch_order_list))
         return all_results
 
     def get_search(self, query, page, format, prefix=None):
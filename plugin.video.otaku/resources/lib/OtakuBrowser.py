@@ -73,7 +73,8 @@ class OtakuBrowser(BrowserBase):
             anilist_item = anilist_by_mal_id.get(mal_id)
             return self.base_otaku_view(mal_item, anilist_item, completed=self.open_completed())
 
-        all_results = [mapfunc(mal_item) for mal_item in mal_items_flat]
+        with database.prefetch(mal_ids, anilist_id=[x.get('id') for x in anilist_res]):
+            all_results = [mapfunc(mal_item) for mal_item in mal_items_flat]
         # Only handle paging if 'pagination' exists
         hasNextPage = False
         if 'pagination' in mal_res:
@@ -224,27 +225,16 @@ class OtakuBrowser(BrowserBase):
             get_meta.collect_meta(meta_ids)
 
             watch_order_list = []
-            count = 0
-            retry_limit = 3
 
+            # Transient Jikan failures are retried by the client's RetryPolicy
             for idmal in mal_ids:
-                retries = 0
-                while retries < retry_limit:
-                    mal_item = database.get(self.get_mal_base_res, 24, f'{self._BASE_URL}/anime/{idmal}')
-
-                    if mal_item is not None and 'data' in mal_item:
-                        watch_order_list.append(mal_item['data'])
-                        break
-                    else:
-                        retries += 1
-                        control.sleep(int(100 * retries))  # Reduced linear backoff
-
-                count += 1
-                if count % 3 == 0:
-                    control.sleep(1000)  # Ensure we do not exceed 3 requests per second
+                mal_item = database.get(self.get_mal_base_res, 24, f'{self._BASE_URL}/anime/{idmal}')
+                if mal_item is not None and 'data' in mal_item:
+                    watch_order_list.append(mal_item['data'])
 
         mapfunc = partial(self.base_otaku_view, completed=self.open_completed())
-        all_results = list(map(mapfunc, watch_order_list))
+        with database.prefetch([x['mal_id'] for x in watch_order_list]):
+            all_results = list(map(mapfunc, watch_order_list))
         return all_results
 
     def get_search(self, query, page, format, prefix=None):
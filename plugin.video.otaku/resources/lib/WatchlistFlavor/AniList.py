@@ -197,7 +197,8 @@ class AniListWLF(WatchlistFlavorBase):
 
         # If next_up is True, reverse the order if needed.
         all_results = map(self._base_next_up_view, entries) if next_up else map(self.base_watchlist_status_view, entries)
-        all_results = list(all_results)
+        with database.prefetch([x['media'].get('idMal') for x in entries], anilist_id=[x['media']['id'] for x in entries]):
+            all_results = list(all_results)
         return all_results
 
     @div_flavor
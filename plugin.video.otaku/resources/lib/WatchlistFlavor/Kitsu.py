@@ -177,7 +177,8 @@ class KitsuWLF(WatchlistFlavorBase):
             anilist_item = anilist_by_mal_id.get(mal_id)
             return self._base_next_up_view(res, eres, anilist_res=anilist_item) if next_up else self._base_watchlist_view(res, eres, anilist_res=anilist_item)
 
-        all_results = [viewfunc(res, eres) for res, eres in zip(_list, el)]
+        with database.prefetch(mal_ids, kitsu_id=[eres['id'] for eres in el]):
+            all_results = [viewfunc(res, eres) for res, eres in zip(_list, el)]
         all_results += self.handle_paging(result['links'].get('next'), base_plugin_url, page)
         return all_results
 
@@ -175,7 +175,8 @@ class MyAnimeListWLF(WatchlistFlavorBase):
             anilist_item = anilist_by_mal_id.get(mal_id)
             return self._base_next_up_view(res, anilist_res=anilist_item) if next_up else self._base_watchlist_status_view(res, anilist_res=anilist_item)
 
-        all_results = list(map(viewfunc, results['data']))
+        with database.prefetch(mal_ids, anilist_id=[x.get('id') for x in anilist_data]):
+            all_results = list(map(viewfunc, results['data']))
         all_results += self.handle_paging(results.get('paging', {}).get('next'), base_plugin_url, page)
         return all_results
 
@@ -130,7 +130,9 @@ class SimklWLF(WatchlistFlavorBase):
             anilist_item = anilist_by_mal_id.get(mal_id)
             return self._base_next_up_view(res, anilist_res=anilist_item) if next_up else self._base_watchlist_status_view(res, anilist_res=anilist_item)
 
-        all_results = list(map(viewfunc, results['anime']))
+        show_ids = [anime['show']['ids'] for anime in results['anime']]
+        with database.prefetch(mal_ids, anilist_id=[x.get('anilist') for x in show_ids], kitsu_id=[x.get('kitsu') for x in show_ids]):
+            all_results = list(map(viewfunc, results['anime']))
 
         if int(self.sort) == 0:  # anime_title
             all_results = sorted(all_results, key=lambda x: x['info']['title'])
@@ -1,8 +1,7 @@
-import threading
-
 from copy import deepcopy
+from functools import partial
 from resources.lib.debrid import premiumize, torbox, easydebrid
-from resources.lib.ui import control
+from resources.lib.ui import control, thread_pool
 
 
 class Debrid:
@@ -16,47 +15,42 @@ class Debrid:
         self.alldebridUnCached = []
         self.debridlinkUnCached = []
         self.torboxUnCached = []
-        self.threads = []
 
     def torrentCacheCheck(self, torrent_list):
         enabled_debrids = control.enabled_debrid()
+        workers = []
         if enabled_debrids['realdebrid']:
-            t = threading.Thread(target=self.real_debrid_worker, args=(deepcopy(torrent_list),))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.real_debrid_worker, deepcopy(torrent_list)))
 
         if enabled_debrids['debridlink']:
-            t = threading.Thread(target=self.debrid_link_worker, args=(deepcopy(torrent_list),))
-            self.threads.append(t)
-            t.start()
+            workers.append(partial(self.debrid_link_worker, deepcopy(torrent_list)))
 
         if enabled_debrids['premiumize']:
-            t = threading.Thread(target=self.premiumize_worker, args=(deepcopy(torrent_list),))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.premiumize_worker, deepcopy(torrent_list)))
 
         if enabled_debrids['alldebrid']:
-            t = threading.Thread(target=self.all_debrid_worker, args=(deepcopy(torrent_list),))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.all_debrid_worker, deepcopy(torrent_list)))
 
         if enabled_debrids['torbox']:
-            t = threading.Thread(target=self.torbox_worker, args=(deepcopy(torrent_list),))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.torbox_worker, deepcopy(torrent_list)))
 
         if enabled_debrids['easydebrid']:
-            t = threading.Thread(target=self.easydebrid_worker, args=(deepcopy(torrent_list),))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.easydebrid_worker, deepcopy(torrent_list)))
 
-        for i in self.threads:
-            i.join()
+        thread_pool.pool.map(self.run_worker, workers)
 
         cached_list = self.premiumizeCached + self.torboxCached + self.easydebridCached
         uncached_list = self.realdebridUnCached + self.premiumizeUnCached + self.alldebridUnCached + self.debridlinkUnCached + self.torboxUnCached
         return cached_list, uncached_list
 
+    @staticmethod
+    def run_worker(worker):
+        # one failing service must not drop the results of the others
+        try:
+            worker()
+        except Exception as e:
+            control.log(f'Debrid cache check failed: {str(e)}', 'warning')
+
     def all_debrid_worker(self, torrent_list):
         if len(torrent_list) > 0:
             for i in torrent_list:
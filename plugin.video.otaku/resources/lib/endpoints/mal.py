@@ -1,5 +1,4 @@
 import json
-import time
 import os
 from resources.lib.ui import client, control
 
@@ -14,18 +13,9 @@ class Mal:
         for day in days_of_week:
             day_results = []
             current_page = page
-            request_count = 0
 
             while True:
-                retries = 3
-                popular = None
-                while retries > 0:
-                    popular = self.get_airing_calendar_res(day, current_page)
-                    if popular and 'data' in popular:
-                        break
-                    retries -= 1
-                    time.sleep(1)  # Add delay before retrying
-
+                popular = self.get_airing_calendar_res(day, current_page)
                 if not popular or 'data' not in popular:
                     break
 
@@ -35,11 +25,6 @@ class Mal:
                     break
 
                 current_page += 1
-                request_count += 1
-
-                if request_count >= 3:
-                    time.sleep(1)  # Add delay to respect API rate limit
-                    request_count = 0
 
             day_results.reverse()
             list_.extend(day_results)
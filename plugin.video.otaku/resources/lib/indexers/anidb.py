@@ -19,15 +19,8 @@ class ANIDBAPI:
         return meta_ids.get('anidb_id')
 
     def get_episode_meta(self, mal_id):
-        import time
         anidb_id = self.get_anidb_id(mal_id)
-        # Use Kodi settings for persistent rate limiting
-        last_request = control.getInt('anidb_last_request')
-        now = int(time.time())
-        if last_request > 0:
-            elapsed = now - last_request
-            if elapsed < 4:
-                time.sleep(4 - elapsed)
+        # client keeps requests to AniDB 4 seconds apart, across invocations too
         params = {
             'request': 'anime',
             'client': self.client_name,
@@ -36,7 +29,6 @@ class ANIDBAPI:
             'aid': anidb_id
         }
         response = client.get(self.base_url, params=params)
-        control.setInt('anidb_last_request', int(time.time()))
         alt_titles = []
         episodes = []
         if response:
@@ -149,7 +141,8 @@ class ANIDBAPI:
         result_ep = result['episodes']
         mapfunc = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data)
         # Parallelize episode parsing for faster processing
-        all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
+        with database.episode_batch(mal_id):
+            all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
         all_results = sorted(all_results, key=lambda x: x['info']['episode'])
 
         if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
@@ -167,7 +160,8 @@ class ANIDBAPI:
             season = episodes[0]['season']
             mapfunc2 = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data, episodes=episodes)
             # Parallelize episode parsing
-            all_results = utils.parallel_process(result['episodes'], mapfunc2, max_workers=8)
+            with database.episode_batch(mal_id):
+                all_results = utils.parallel_process(result['episodes'], mapfunc2, max_workers=8)
             if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
                 control.notify("AniDB", f'{tvshowtitle} Appended to Database', icon=poster)
         else:
@@ -89,7 +89,8 @@ class ANIZIPAPI:
         season = result_ep[0].get('seasonNumber', 1)
         mapfunc = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data)
         # Parallelize episode parsing for faster processing
-        all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
+        with database.episode_batch(mal_id):
+            all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
 
         if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
             control.notify("Anizip", f'{tvshowtitle} Added to Database', icon=poster)
@@ -103,7 +104,8 @@ class ANIZIPAPI:
             season = episodes[0]['season']
             mapfunc2 = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=None, episodes=episodes)
             # Parallelize episode parsing
-            all_results = utils.parallel_process(result_ep, mapfunc2, max_workers=8)
+            with database.episode_batch(mal_id):
+                all_results = utils.parallel_process(result_ep, mapfunc2, max_workers=8)
             if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
                 control.notify("ANIZIP Appended", f'{tvshowtitle} Appended to Database', icon=poster)
         else:
@@ -1,6 +1,5 @@
 import pickle
 import datetime
-import time
 import random
 
 from functools import partial
@@ -30,7 +29,7 @@ class JikanAPI:
         if not res['pagination']['has_next_page']:
             return res_data
 
-        # Fetch all pages in batches to respect Jikan's 3 req/sec rate limit
+        # Fetch the remaining pages in parallel, client spaces them to Jikan's 3 req/sec rate limit
         last_page = res['pagination']['last_visible_page']
         control.log(f"Jikan: Fetching {last_page} pages of episodes (3 req/sec limit)")
 
@@ -45,18 +44,8 @@ class JikanAPI:
                 control.log(f"Jikan: Failed to fetch page {page_num}: {str(e)}")
                 return []
 
-        # Split remaining pages into batches of 3 to respect rate limit
         page_numbers = list(range(2, last_page + 1))
-        batches = [page_numbers[i:i+3] for i in range(0, len(page_numbers), 3)]
-
-        all_page_results = []
-        for i, batch in enumerate(batches):
-            if i > 0:
-                time.sleep(1.1)  # Wait 1.1 seconds between batches (safe margin)
-
-            # Fetch 3 pages in parallel (respects 3 req/sec limit)
-            batch_results = utils.parallel_process(batch, fetch_page, max_workers=3)
-            all_page_results.extend(batch_results)
+        all_page_results = utils.parallel_process(page_numbers, fetch_page, max_workers=3)
 
         # Combine all results
         for page_data in all_page_results:
@@ -132,7 +121,8 @@ class JikanAPI:
 
         mapfunc = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data)
         # Parallelize episode parsing for faster processing
-        all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
+        with database.episode_batch(mal_id):
+            all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
         all_results = sorted(all_results, key=lambda x: x['info']['episode'])
 
         if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
@@ -146,7 +136,8 @@ class JikanAPI:
             season = episodes[0]['season']
             mapfunc2 = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data, episodes=episodes)
             # Parallelize episode parsing
-            all_results = utils.parallel_process(result, mapfunc2, max_workers=8)
+            with database.episode_batch(mal_id):
+                all_results = utils.parallel_process(result, mapfunc2, max_workers=8)
             if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
                 control.notify("Jikanmoe", f'{tvshowtitle} Appended to Database', icon=poster)
         else:
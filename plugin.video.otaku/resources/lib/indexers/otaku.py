@@ -4,7 +4,7 @@ import time
 import random
 
 from functools import partial
-from resources.lib.ui import utils, database, client, control
+from resources.lib.ui import utils, database, client, control, thread_pool
 from resources.lib import indexers
 
 
@@ -106,15 +106,8 @@ class OtakuAPI:
         return meta_ids.get('anidb_id')
 
     def get_anidb_episode_meta(self, mal_id):
-        import time
         anidb_id = self.get_anidb_id(mal_id)
-        # Rate limit: ensure at least 4 seconds between requests
-        last_request = control.getInt('anidb_last_request')
-        now = int(time.time())
-        if last_request > 0:
-            elapsed = now - last_request
-            if elapsed < 4:
-                time.sleep(4 - elapsed)
+        # client keeps requests to AniDB 4 seconds apart, across invocations too
         params = {
             'request': 'anime',
             'client': self.anidbClientName,
@@ -123,7 +116,6 @@ class OtakuAPI:
             'aid': anidb_id
         }
         response = client.get(self.anidbBaseUrl, params=params)
-        control.setInt('anidb_last_request', int(time.time()))
         episodes = []
         if response:
             import xml.etree.ElementTree as ET
@@ -392,8 +384,7 @@ class OtakuAPI:
         title_list = [name['title'] for name in result['titles']]
         season = utils.get_season(title_list, mal_id)
 
-        # Fetch all episode meta from all providers in parallel using ThreadPoolExecutor
-        import concurrent.futures
+        # Fetch all episode meta from all providers in parallel on the shared thread pool
         meta_cache = {}
 
         def fetch_anidb():
@@ -435,19 +426,8 @@ class OtakuAPI:
 
         # Fetch from all providers concurrently
         control.log(f"Fetching episode metadata from 5 providers in parallel for MAL ID: {mal_id}")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [
-                executor.submit(fetch_anidb),
-                executor.submit(fetch_simkl),
-                executor.submit(fetch_jikan),
-                executor.submit(fetch_anizip),
-                executor.submit(fetch_kitsu)
-            ]
-
-            # Wait for all to complete and populate meta_cache
-            for future in concurrent.futures.as_completed(futures):
-                provider, data = future.result()
-                meta_cache[provider] = data
+        for provider, data in thread_pool.pool.run(fetch_anidb, fetch_simkl, fetch_jikan, fetch_anizip, fetch_kitsu):
+            meta_cache[provider] = data
 
         control.log(f"Episode metadata fetched - AniDB: {len(meta_cache.get('anidb', []))}, SIMKL: {len(meta_cache.get('simkl', []))}, Jikan: {len(meta_cache.get('jikan', []))}, AniZip: {len(meta_cache.get('anizip', []))}, Kitsu: {len(meta_cache.get('kitsu', []))}")
 
@@ -460,7 +440,8 @@ class OtakuAPI:
 
         # Parse episodes in parallel for faster processing
         mapfunc = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data, meta_cache=meta_cache)
-        all_results = utils.parallel_process(base_ep_list, mapfunc, max_workers=8)
+        with database.episode_batch(mal_id):
+            all_results = utils.parallel_process(base_ep_list, mapfunc, max_workers=8)
         all_results = sorted(all_results, key=lambda x: x['info']['episode'])
 
         if control.getBool('override.meta.api') and control.getBool('override.meta.notify'):
@@ -474,7 +455,8 @@ class OtakuAPI:
             season = episodes[0]['season']
             mapfunc2 = partial(self.parse_episode_view, mal_id=mal_id, season=season, poster=poster, fanart=fanart, clearart=clearart, clearlogo=clearlogo, eps_watched=eps_watched, update_time=update_time, tvshowtitle=tvshowtitle, dub_data=dub_data, filler_data=filler_data, episodes=episodes)
             # Parallelize episode parsing
-            all_results = utils.parallel_process(result, mapfunc2, max_workers=8)
+            with database.episode_batch(mal_id):
+                all_results = utils.parallel_process(result, mapfunc2, max_workers=8)
         else:
             mapfunc1 = partial(indexers.parse_episodes, eps_watched=eps_watched, dub_data=dub_data)
             # Parallelize episode parsing
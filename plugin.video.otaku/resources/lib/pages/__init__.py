@@ -1,8 +1,9 @@
-import threading
+import re
 import time
 
 from resources.lib.pages import nyaa, animetosho, debrid_cloudfiles, animixplay, aniwave, animesdg, animess, animepahe, hianime, watchnixtoons2, localfiles
-from resources.lib.ui import control, database
+from resources.lib.ui import control, database, scrape_engine
+from resources.lib.ui.source_collector import SourceCollector
 from resources.lib.windows.get_sources_window import GetSources
 from resources.lib.windows import sort_select
 
@@ -51,7 +52,8 @@ class Sources(GetSources):
         self.embeds_qual_len = [0, 0, 0, 0, 0]
         self.return_data = []
         self.progress = 1
-        self.threads = []
+        self.engine = None
+        self.collector = None
 
         self.torrentSources = []
         self.torrentCacheSources = []
@@ -84,6 +86,19 @@ class Sources(GetSources):
         control.setInt('aniwave.skipoutro.start', -1)
         control.setInt('aniwave.skipoutro.end', -1)
 
+        # every provider runs as a job of one scrape engine with the dialog timeout as its deadline
+        timeout = 60 if rescrape else control.getInt('general.timeout')
+        self.engine = scrape_engine.Engine()
+
+        # providers push their sources into the collector as they return, the dialog reads its counters
+        self.collector = SourceCollector.from_settings()
+        self.torrentSources = self.collector.torrents
+        self.torrentCacheSources = self.collector.cached_torrents
+        self.torrentUnCacheSources = self.collector.uncached_torrents
+        self.embedSources = self.collector.embeds
+        self.cloud_files = self.collector.cloud
+        self.local_files = self.collector.local
+
         enabled_debrids = control.enabled_debrid()
         enabled_clouds = control.enabled_cloud()
 
@@ -95,16 +110,12 @@ class Sources(GetSources):
 
         if any(enabled_debrids.values()):
             if control.getBool('provider.nyaa'):
-                t = threading.Thread(target=self.nyaa_worker, args=(query, mal_id, episode, status, media_type, rescrape))
-                t.start()
-                self.threads.append(t)
+                self.engine.submit('nyaa', self.nyaa_worker, query, mal_id, episode, status, media_type, rescrape, deadline=timeout)
             else:
                 self.remainingProviders.remove('nyaa')
 
             if control.getBool('provider.animetosho'):
-                t = threading.Thread(target=self.animetosho_worker, args=(query, mal_id, episode, status, media_type, rescrape))
-                t.start()
-                self.threads.append(t)
+                self.engine.submit('animetosho', self.animetosho_worker, query, mal_id, episode, status, media_type, rescrape, deadline=timeout)
             else:
                 self.remainingProviders.remove('animetosho')
 
@@ -114,78 +125,57 @@ class Sources(GetSources):
 
         # cloud #
         if common_debrids:
-            t = threading.Thread(target=self.user_cloud_inspection, args=(query, mal_id, episode))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('Cloud Inspection', self.user_cloud_inspection, query, mal_id, episode, deadline=timeout)
         else:
             self.remainingProviders.remove('Cloud Inspection')
 
         # local #
         if control.getBool('provider.localfiles'):
-            t = threading.Thread(target=self.user_local_inspection, args=(query, mal_id, episode))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('Local Inspection', self.user_local_inspection, query, mal_id, episode, deadline=timeout)
         else:
             self.remainingProviders.remove('Local Inspection')
 
         # embeds #
         if control.getBool('provider.animepahe'):
-            t = threading.Thread(target=self.animepahe_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('animepahe', self.animepahe_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('animepahe')
 
         if control.getBool('provider.animesdg'):
-            t = threading.Thread(target=self.animesdg_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('animesdigital', self.animesdg_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('animesdigital')
 
         if control.getBool('provider.animess'):
-            t = threading.Thread(target=self.animess_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('animesfhd', self.animess_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('animesfhd')
 
         if control.getBool('provider.animix'):
-            t = threading.Thread(target=self.animix_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('animix', self.animix_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('animix')
 
         if control.getBool('provider.aniwave'):
-            t = threading.Thread(target=self.aniwave_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('aniwave', self.aniwave_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('aniwave')
 
         # if control.getBool('provider.gogo'):
-        #     t = threading.Thread(target=self.gogo_worker, args=(mal_id, episode, rescrape))
-        #     t.start()
-        #     self.threads.append(t)
+        #     self.engine.submit('gogo', self.gogo_worker, mal_id, episode, rescrape, deadline=timeout)
         # else:
         #     self.remainingProviders.remove('gogo')
 
         if control.getBool('provider.hianime'):
-            t = threading.Thread(target=self.hianime_worker, args=(mal_id, episode, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('hianime', self.hianime_worker, mal_id, episode, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('hianime')
 
         if control.getBool('provider.watchnixtoons2'):
-            t = threading.Thread(target=self.watchnixtoons2_worker, args=(mal_id, episode, media_type, rescrape))
-            t.start()
-            self.threads.append(t)
+            self.engine.submit('watchnixtoons2', self.watchnixtoons2_worker, mal_id, episode, media_type, rescrape, deadline=timeout)
         else:
             self.remainingProviders.remove('watchnixtoons2')
 
-        timeout = 60 if rescrape else control.getInt('general.timeout')
         start_time = time.perf_counter()
         runtime = 0
 
@@ -199,19 +189,25 @@ class Sources(GetSources):
                     control.colorstr(self.torrents_qual_len[3] + self.embeds_qual_len[3]),
                     control.colorstr(self.torrents_qual_len[4] + self.embeds_qual_len[4])
                 ))
-            control.sleep(500)
-
-            if (
-                self.canceled
-                or not self.remainingProviders
-                or (control.settingids.terminateoncloud and len(self.cloud_files) > 0)
-                or (control.settingids.terminateonlocal and len(self.local_files) > 0)
-            ):
+            # wake up as soon as a provider finishes instead of polling
+            finished = self.engine.next_result(0.5)
+            if finished and finished[0] in self.remainingProviders:
+                # the only place a submitted provider is removed, whether it returned, failed or timed out;
+                # a timed out worker thread keeps running and must not touch the list
+                self.remainingProviders.remove(finished[0])
+
+            if self.canceled or not self.remainingProviders:
+                break
+            if self.collector.done.is_set():
+                # an early exit rule holds, play what we have instead of waiting on the slow providers
+                control.log(f'Stopped scraping early, {self.collector.reason}. Still running: {self.remainingProviders}')
                 break
 
             runtime = time.perf_counter() - start_time
             self.progress = runtime / timeout * 100
 
+        self.collector.close()
+        self.engine.close()
         if len(self.torrentSources) + len(self.embedSources) + len(self.cloud_files) + len(self.local_files) == 0:
             self.return_data = []
         else:
@@ -230,10 +226,7 @@ class Sources(GetSources):
         if all_sources is None:
             all_sources = {'cached': [], 'uncached': []}
 
-        self.torrentUnCacheSources += all_sources['uncached']
-        self.torrentCacheSources += all_sources['cached']
-        self.torrentSources += all_sources['cached'] + all_sources['uncached']
-        self.remainingProviders.remove('nyaa')
+        self.collector.add('nyaa', cached=all_sources['cached'], uncached=all_sources['uncached'])
 
     def animetosho_worker(self, query, mal_id, episode, status, media_type, rescrape):
         if rescrape:
@@ -245,46 +238,43 @@ class Sources(GetSources):
         if all_sources is None:
             all_sources = {'cached': [], 'uncached': []}
 
-        self.torrentUnCacheSources += all_sources['uncached']
-        self.torrentCacheSources += all_sources['cached']
-        self.torrentSources += all_sources['cached'] + all_sources['uncached']
-        self.remainingProviders.remove('animetosho')
+        self.collector.add('animetosho', cached=all_sources['cached'], uncached=all_sources['uncached'])
 
     # embeds #
     def animepahe_worker(self, mal_id, episode, rescrape):
         if rescrape:
-            self.embedSources += animepahe.Sources().get_sources(mal_id, episode)
+            embeds = animepahe.Sources().get_sources(mal_id, episode)
         else:
-            self.embedSources += database.get(animepahe.Sources().get_sources, 8, mal_id, episode, key='animepahe')
-        self.remainingProviders.remove('animepahe')
+            embeds = database.get(animepahe.Sources().get_sources, 8, mal_id, episode, key='animepahe')
+        self.collector.add('animepahe', embeds=embeds)
 
     def animesdg_worker(self, mal_id, episode, rescrape):
         if rescrape:
-            self.embedSources += animesdg.Sources().get_sources(mal_id, episode)
+            embeds = animesdg.Sources().get_sources(mal_id, episode)
         else:
-            self.embedSources += database.get(animesdg.Sources().get_sources, 8, mal_id, episode, key='animesdg')
-        self.remainingProviders.remove('animesdigital')
+            embeds = database.get(animesdg.Sources().get_sources, 8, mal_id, episode, key='animesdg')
+        self.collector.add('animesdigital', embeds=embeds)
 
     def animess_worker(self, mal_id, episode, rescrape):
         if rescrape:
-            self.embedSources += animess.Sources().get_sources(mal_id, episode)
+            embeds = animess.Sources().get_sources(mal_id, episode)
         else:
-            self.embedSources += database.get(animess.Sources().get_sources, 8, mal_id, episode, key='animess')
-        self.remainingProviders.remove('animesfhd')
+            embeds = database.get(animess.Sources().get_sources, 8, mal_id, episode, key='animess')
+        self.collector.add('animesfhd', embeds=embeds)
 
     def animix_worker(self, mal_id, episode, rescrape):
         if rescrape:
-            self.embedSources += animixplay.Sources().get_sources(mal_id, episode)
+            embeds = animixplay.Sources().get_sources(mal_id, episode)
         else:
-            self.embedSources += database.get(animixplay.Sources().get_sources, 8, mal_id, episode, key='animix')
-        self.remainingProviders.remove('animix')
+            embeds = database.get(animixplay.Sources().get_sources, 8, mal_id, episode, key='animix')
+        self.collector.add('animix', embeds=embeds)
 
     def aniwave_worker(self, mal_id, episode, rescrape):
         if rescrape:
             aniwave_sources = aniwave.Sources().get_sources(mal_id, episode)
         else:
             aniwave_sources = database.get(aniwave.Sources().get_sources, 8, mal_id, episode, key='aniwave')
-        self.embedSources += aniwave_sources
+        self.collector.add('aniwave', embeds=aniwave_sources)
         for x in aniwave_sources:
             if x.get('skip'):
                 if x['skip'].get('intro') and x['skip']['intro']['start'] != 0:
@@ -293,21 +283,19 @@ class Sources(GetSources):
                 if x['skip'].get('outro') and x['skip']['outro']['start'] != 0:
                     control.setInt('aniwave.skipoutro.start', int(x['skip']['outro']['start']))
                     control.setInt('aniwave.skipoutro.end', int(x['skip']['outro']['end']))
-        self.remainingProviders.remove('aniwave')
 
     # def gogo_worker(self, mal_id, episode, rescrape):
     #     if rescrape:
     #         self.embedSources += gogoanime.Sources().get_sources(mal_id, episode)
     #     else:
     #         self.embedSources += database.get(gogoanime.Sources().get_sources, 8, mal_id, episode, key='gogoanime')
-    #     self.remainingProviders.remove('gogo')
 
     def hianime_worker(self, mal_id, episode, rescrape):
         if rescrape:
             hianime_sources = hianime.Sources().get_sources(mal_id, episode)
         else:
             hianime_sources = database.get(hianime.Sources().get_sources, 8, mal_id, episode, key='hianime')
-        self.embedSources += hianime_sources
+        self.collector.add('hianime', embeds=hianime_sources)
         for x in hianime_sources:
             if x.get('skip'):
                 if x['skip'].get('intro') and x['skip']['intro']['start'] != 0:
@@ -316,32 +304,58 @@ class Sources(GetSources):
                 if x['skip'].get('outro') and x['skip']['outro']['start'] != 0:
                     control.setInt('hianime.skipoutro.start', int(x['skip']['outro']['start']))
                     control.setInt('hianime.skipoutro.end', int(x['skip']['outro']['end']))
-        self.remainingProviders.remove('hianime')
 
     def watchnixtoons2_worker(self, mal_id, episode, media_type, rescrape):
         if rescrape:
-            self.embedSources += watchnixtoons2.Sources().get_sources(mal_id, episode, media_type)
+            embeds = watchnixtoons2.Sources().get_sources(mal_id, episode, media_type)
         else:
-            self.embedSources += database.get(watchnixtoons2.Sources().get_sources, 8, mal_id, episode, media_type, key='watchnixtoons2')
-        self.remainingProviders.remove('watchnixtoons2')
+            embeds = database.get(watchnixtoons2.Sources().get_sources, 8, mal_id, episode, media_type, key='watchnixtoons2')
+        self.collector.add('watchnixtoons2', embeds=embeds)
 
     # Local & Cloud #
     def user_local_inspection(self, query, mal_id, episode):
         episode_data = database.get_episode(mal_id)
         season = episode_data.get('season') if episode_data else None
-        self.local_files += localfiles.Sources().get_sources(query, mal_id, episode, season)
-        self.remainingProviders.remove('Local Inspection')
+        self.collector.add('Local Inspection', local=localfiles.Sources().get_sources(query, mal_id, episode, season))
 
     def user_cloud_inspection(self, query, mal_id, episode):
         episode_data = database.get_episode(mal_id)
         season = episode_data.get('season') if episode_data else None
-        self.cloud_files += debrid_cloudfiles.Sources().get_sources(query, mal_id, episode, season)
-        self.remainingProviders.remove('Cloud Inspection')
+        self.collector.add('Cloud Inspection', cloud=debrid_cloudfiles.Sources().get_sources(query, mal_id, episode, season))
+
+    @staticmethod
+    def release_title_check():
+        """
+        The general.release_title_filter settings as one predicate over a lowercased release title,
+        None when the filter is off. The filter words are joined into a single pattern per mode
+        """
+        if not control.getBool('general.release_title_filter.enabled'):
+            return None
+        filters = [(control.getSetting(f'general.release_title_filter.value{x}').lower(), control.getBool(f'general.release_title_filter.exclude{x}')) for x in range(1, 6)]
+        excluded = [value for value, exclude in filters if exclude]
+        release_title_logic = control.getInt('general.release_title_filter.logic')
+        if release_title_logic == 0:
+            # AND filter: none of the excluded words may appear, plain words are ignored
+            if not excluded:
+                return None
+            excluded_re = re.compile('|'.join(map(re.escape, excluded)))
+            return lambda title: not excluded_re.search(title)
+        if release_title_logic == 1:
+            # OR filter: a plain word that appears or an excluded word that is missing keeps the source
+            included = [value for value, exclude in filters if value and not exclude]
+            excluded = [value for value in excluded if value]
+            included_re = re.compile('|'.join(map(re.escape, included))) if included else None
+            return lambda title: bool(included_re and included_re.search(title)) or any(value not in title for value in excluded)
+        return None
 
     @staticmethod
     def sortSources(torrent_list, embed_list, cloud_files, local_files, media_type, duration):
-        all_list = torrent_list + embed_list + cloud_files + local_files
-        sortedList = [x for x in all_list if control.getInt('general.minResolution') <= x['quality'] <= control.getInt('general.maxResolution')]
+        # Settings are read once up front, every stage below is a check on a single source
+        min_resolution = control.getInt('general.minResolution')
+        max_resolution = control.getInt('general.maxResolution')
+
+        # Torrent only stages: size and release title
+        torrent_checks = []
 
         # Filter by size
         filter_option = control.getInt('general.fileFilter')
@@ -350,14 +364,10 @@ class Sources(GetSources):
             # web speed limit
             webspeed = control.getInt('general.webspeed')
             len_in_sec = int(duration) * 60
-
-            _torrent_list = torrent_list
-            torrent_list = [i for i in _torrent_list if i['size'] != 'NA' and ((float(i['size'][:-3]) * 8000) / len_in_sec) <= webspeed]
+            torrent_checks.append(lambda i: i['size'] != 'NA' and ((float(i['size'][:-3]) * 8000) / len_in_sec) <= webspeed)
 
         elif filter_option == 2:
             # hard limit
-            _torrent_list = torrent_list
-
             if media_type == 'movie':
                 max_GB = float(control.getInt('general.movie.maxGB'))
                 min_GB = control.getNumber('general.movie.minGB')
@@ -365,119 +375,65 @@ class Sources(GetSources):
                 max_GB = float(control.getInt('general.episode.maxGB'))
                 min_GB = control.getNumber('general.episode.minGB')
 
-            torrent_list = []
-            for i in _torrent_list:
-                if i['size'] != 'NA':
-                    size = float(i['size'][:-3])
-                    unit = i['size'][-2:].strip()
-
-                    if unit == 'MB':
-                        size /= 1024  # convert MB to GB for comparison
-
-                    if min_GB <= size <= max_GB:
-                        torrent_list.append(i)
+            def size_check(i):
+                if i['size'] == 'NA':
+                    return False
+                size = float(i['size'][:-3])
+                if i['size'][-2:].strip() == 'MB':
+                    size /= 1024  # convert MB to GB for comparison
+                return min_GB <= size <= max_GB
+            torrent_checks.append(size_check)
 
         # Filter by release title
-        if control.getBool('general.release_title_filter.enabled'):
-            release_title_filter1 = control.getSetting('general.release_title_filter.value1')
-            release_title_filter2 = control.getSetting('general.release_title_filter.value2')
-            release_title_filter3 = control.getSetting('general.release_title_filter.value3')
-            release_title_filter4 = control.getSetting('general.release_title_filter.value4')
-            release_title_filter5 = control.getSetting('general.release_title_filter.value5')
-
-            # Get the new settings
-            exclude_filter1 = control.getBool('general.release_title_filter.exclude1')
-            exclude_filter2 = control.getBool('general.release_title_filter.exclude2')
-            exclude_filter3 = control.getBool('general.release_title_filter.exclude3')
-            exclude_filter4 = control.getBool('general.release_title_filter.exclude4')
-            exclude_filter5 = control.getBool('general.release_title_filter.exclude5')
-
-            _torrent_list = torrent_list
-            release_title_logic = control.getInt('general.release_title_filter.logic')
-            if release_title_logic == 0:
-                # AND filter (case-insensitive)
-                torrent_list = [
-                    i for i in _torrent_list
-                    if (not exclude_filter1 or release_title_filter1.lower() not in i['release_title'].lower())
-                    and (not exclude_filter2 or release_title_filter2.lower() not in i['release_title'].lower())
-                    and (not exclude_filter3 or release_title_filter3.lower() not in i['release_title'].lower())
-                    and (not exclude_filter4 or release_title_filter4.lower() not in i['release_title'].lower())
-                    and (not exclude_filter5 or release_title_filter5.lower() not in i['release_title'].lower())
-                ]
-            if release_title_logic == 1:
-                # OR filter (case-insensitive)
-                torrent_list = [
-                    i for i in _torrent_list
-                    if (release_title_filter1 != "" and (exclude_filter1 ^ (release_title_filter1.lower() in i['release_title'].lower())))
-                    or (release_title_filter2 != "" and (exclude_filter2 ^ (release_title_filter2.lower() in i['release_title'].lower())))
-                    or (release_title_filter3 != "" and (exclude_filter3 ^ (release_title_filter3.lower() in i['release_title'].lower())))
-                    or (release_title_filter4 != "" and (exclude_filter4 ^ (release_title_filter4.lower() in i['release_title'].lower())))
-                    or (release_title_filter5 != "" and (exclude_filter5 ^ (release_title_filter5.lower() in i['release_title'].lower())))
-                ]
-
-        # Update sortedList to include the filtered torrent_list
-        sortedList = [x for x in sortedList if x in torrent_list or x in embed_list or x in cloud_files or x in local_files]
+        if title_check := Sources.release_title_check():
+            torrent_checks.append(lambda i: title_check(i['release_title'].lower()))
 
         # Apply general.filters (comprehensive filtering like Seren)
         filter_list = control.getStringList("general.filters")
-        if filter_list:
-            current_filters = set(filter_list)
-            # Special HDR/DV handling (like Seren does for HYBRID sources)
-            disable_dv = "DV" in current_filters
-            disable_hdr = "HDR" in current_filters
-            filter_set = current_filters.difference({"HDR", "DV"})
-
-            filtered = []
-            for source in sortedList:
+        current_filters = set(filter_list)
+        # Special HDR/DV handling (like Seren does for HYBRID sources)
+        disable_dv = "DV" in current_filters
+        disable_hdr = "HDR" in current_filters
+        filter_set = current_filters.difference({"HDR", "DV"})
+
+        # Filter by language source
+        lang_source = control.getInt("general.source")
+        allowed_lang = {1: {0, 1, 2}, 2: {0, 1, 3}}.get(lang_source)
+
+        # Torrents are told apart by identity, the other lists are never size or title filtered
+        torrent_ids = {id(i) for i in torrent_list} if torrent_checks else ()
+
+        sortedList = []
+        for source in torrent_list + embed_list + cloud_files + local_files:
+            if not min_resolution <= source['quality'] <= max_resolution:
+                continue
+            if id(source) in torrent_ids and not all(check(source) for check in torrent_checks):
+                continue
+            if filter_list:
+                info = set(source['info'])
                 # Skip if ANY filtered tag is in source info (set intersection)
-                if filter_set & set(source['info']):
+                if filter_set & info:
                     continue
+                hybrid = "HYBRID" in info
                 # DV filter: exclude DV sources unless they're HYBRID
-                if disable_dv and "DV" in source['info'] and "HYBRID" not in source['info']:
+                if disable_dv and "DV" in info and not hybrid:
                     continue
                 # HDR filter: exclude HDR sources unless they're HYBRID
-                if disable_hdr and "HDR" in source['info'] and "HYBRID" not in source['info']:
+                if disable_hdr and "HDR" in info and not hybrid:
                     continue
                 # Hybrid filter: if both DV and HDR are disabled, exclude HYBRID too
-                if disable_dv and disable_hdr and "HYBRID" in source['info']:
+                if disable_dv and disable_hdr and hybrid:
                     continue
-                filtered.append(source)
-            sortedList = filtered
+            if allowed_lang and source['lang'] not in allowed_lang:
+                continue
+            sortedList.append(source)
 
-        # Filter by language source
-        source = control.getInt("general.source")
-        if source != 0:
-            if source == 1:
-                sortedList = [i for i in sortedList if i['lang'] in [0, 1, 2]]
-            elif source == 2:
-                sortedList = [i for i in sortedList if i['lang'] in [0, 1, 3]]
-
-        # Sort Sources
-        SORT_METHODS = sort_select.SORT_METHODS
-        sort_options = sort_select.sort_options
-
-        for x in range(len(SORT_METHODS), 0, -1):
-            reverse = sort_options[f'sortmethod.{x}.reverse']
-            method = SORT_METHODS[int(sort_options[f'sortmethod.{x}'])]
-            # Replace spaces with underscores in the method name
-            method = method.replace(' ', '_')
-            sortedList = getattr(sort_select, f'sort_by_{method}')(sortedList, not reverse)
+        # Sort Sources, every configured sort level in a single sort
+        sort_select.sort_sources(sortedList)
 
         return sortedList
 
     def updateProgress(self):
-        self.torrents_qual_len = [
-            len([i for i in self.torrentSources if i['quality'] == 4]),
-            len([i for i in self.torrentSources if i['quality'] == 3]),
-            len([i for i in self.torrentSources if i['quality'] == 2]),
-            len([i for i in self.torrentSources if i['quality'] == 1]),
-            len([i for i in self.torrentSources if i['quality'] == 0])
-        ]
-
-        self.embeds_qual_len = [
-            len([i for i in self.embedSources if i['quality'] == 4]),
-            len([i for i in self.embedSources if i['quality'] == 3]),
-            len([i for i in self.embedSources if i['quality'] == 2]),
-            len([i for i in self.embedSources if i['quality'] == 1]),
-            len([i for i in self.embedSources if i['quality'] == 0])
-        ]
+        # counted by the collector as sources arrive
+        self.torrents_qual_len = list(self.collector.torrent_counts)
+        self.embeds_qual_len = list(self.collector.embed_counts)
@@ -216,10 +216,9 @@ class Sources(BrowserBase):
         return {'cached': self.cached, 'uncached': self.uncached}
 
     def process_animetosho_episodes(self, url, params, mal_id, episode, season, part):
-        response = client.get(url, params=params)
+        response = client.get(url, params=params, stream=True)
         if response:
-            html = response.text
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(response.raw, "html.parser")
             soup_all = soup.find('div', id='content').find_all('div', class_='home_list_entry')
             rex = r'(magnet:)+[^"]*'
             list_ = []
@@ -265,10 +264,9 @@ class Sources(BrowserBase):
         return []
 
     def process_animetosho_movie(self, url, params, mal_id):
-        response = client.get(url, params=params)
+        response = client.get(url, params=params, stream=True)
         if response:
-            html = response.text
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(response.raw, "html.parser")
             # Assuming the movie results use the same container as episodes:
             soup_all = soup.find('div', id='content').find_all('div', class_='home_list_entry')
             rex = r'(magnet:)+[^"]*'
@@ -314,20 +312,21 @@ class Sources(BrowserBase):
 
     @staticmethod
     def parse_animetosho_view(res, episode, cached=True):
+        title_info = source_utils.ReleaseTitleInfo(res['name'])
         source = {
             'release_title': res['name'],
             'hash': res['hash'],
             'type': 'torrent',
-            'quality': source_utils.getQuality(res['name']),
+            'quality': title_info.quality,
             'debrid_provider': res.get('debrid_provider'),
             'provider': 'animetosho',
             'episode_re': episode,
             'size': res['size'],
-            'info': source_utils.getInfo(res['name']),
+            'info': title_info.info,
             'byte_size': 0,
-            'lang': source_utils.getAudio_lang(res['name']),
-            'channel': source_utils.getAudio_channel(res['name']),
-            'sub': source_utils.getSubtitle_lang(res['name']),
+            'lang': title_info.lang,
+            'channel': title_info.channel,
+            'sub': title_info.sub,
             'cached': cached,
             'seeders': res['seeders'],
         }
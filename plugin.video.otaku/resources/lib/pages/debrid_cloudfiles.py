@@ -1,7 +1,7 @@
 import re
-import threading
 
-from resources.lib.ui import source_utils, control
+from functools import partial
+from resources.lib.ui import source_utils, control, thread_pool
 from resources.lib.ui.BrowserBase import BrowserBase
 from resources.lib.debrid import real_debrid, premiumize, all_debrid, torbox
 
@@ -9,31 +9,29 @@ from resources.lib.debrid import real_debrid, premiumize, all_debrid, torbox
 class Sources(BrowserBase):
     def __init__(self):
         self.cloud_files = []
-        self.threads = []
 
     def get_sources(self, query, mal_id, episode, season=None):
         debrid = control.enabled_debrid()
         cloud = control.enabled_cloud()
+        workers = []
         if debrid.get('realdebrid') and cloud.get('realdebrid'):
-            t = threading.Thread(target=self.rd_cloud_inspection, args=(query, mal_id, episode, season))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.rd_cloud_inspection, query, mal_id, episode, season))
         if debrid.get('premiumize') and cloud.get('premiumize'):
-            t = threading.Thread(target=self.premiumize_cloud_inspection, args=(query, mal_id, episode, season))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.premiumize_cloud_inspection, query, mal_id, episode, season))
         if debrid.get('alldebrid') and cloud.get('alldebrid'):
-            t = threading.Thread(target=self.alldebrid_cloud_inspection, args=(query, mal_id, episode, season))
-            t.start()
-            self.threads.append(t)
+            workers.append(partial(self.alldebrid_cloud_inspection, query, mal_id, episode, season))
         if debrid.get('torbox') and cloud.get('torbox'):
-            t = threading.Thread(target=self.torbox_cloud_inspection, args=(query, mal_id, episode, season))
-            t.start()
-            self.threads.append(t)
-        for i in self.threads:
-            i.join()
+            workers.append(partial(self.torbox_cloud_inspection, query, mal_id, episode, season))
+        thread_pool.pool.map(self.run_worker, workers)
         return self.cloud_files
 
+    @staticmethod
+    def run_worker(worker):
+        try:
+            worker()
+        except Exception as e:
+            control.log(f'Cloud inspection failed: {str(e)}', 'warning')
+
     def rd_cloud_inspection(self, query, mal_id, episode, season=None):
         api = real_debrid.RealDebrid()
         torrents = api.list_torrents()
@@ -52,17 +50,18 @@ class Sources(BrowserBase):
             if not any(source_utils.is_file_ext_valid(tor_file['path'].lower()) for tor_file in torrent_files):
                 continue
 
+            title_info = source_utils.ReleaseTitleInfo(torrent['filename'])
             self.cloud_files.append(
                 {
-                    'quality': source_utils.getQuality(torrent['filename']),
-                    'lang': source_utils.getAudio_lang(torrent['filename']),
-                    'channel': source_utils.getAudio_channel(torrent['filename']),
-                    'sub': source_utils.getSubtitle_lang(torrent['filename']),
+                    'quality': title_info.quality,
+                    'lang': title_info.lang,
+                    'channel': title_info.channel,
+                    'sub': title_info.sub,
                     'hash': torrent_info['links'],
                     'provider': 'Cloud',
                     'type': 'cloud',
                     'release_title': torrent['filename'],
-                    'info': source_utils.getInfo(torrent['filename']),
+                    'info': title_info.info,
                     'debrid_provider': 'Real-Debrid',
                     'size': source_utils.get_size(torrent['bytes']),
                     'seeders': 0,
@@ -88,19 +87,20 @@ class Sources(BrowserBase):
                 if not source_utils.is_file_ext_valid(filename):
                     continue
 
+            title_info = source_utils.ReleaseTitleInfo(torrent['name'])
             self.cloud_files.append(
                 {
                     'id': torrent['id'],
                     'torrent_type': torrent['type'],
-                    'quality': source_utils.getQuality(torrent['name']),
-                    'lang': source_utils.getAudio_lang(torrent['name']),
-                    'channel': source_utils.getAudio_channel(torrent['name']),
-                    'sub': source_utils.getSubtitle_lang(torrent['name']),
+                    'quality': title_info.quality,
+                    'lang': title_info.lang,
+                    'channel': title_info.channel,
+                    'sub': title_info.sub,
                     'hash': torrent.get('link', ''),
                     'provider': 'Cloud',
                     'type': 'cloud',
                     'release_title': torrent['name'],
-                    'info': source_utils.getInfo(torrent['name']),
+                    'info': title_info.info,
                     'debrid_provider': 'Premiumize',
                     'size': source_utils.get_size(int(torrent.get('size', 0))),
                     'seeders': 0,
@@ -122,18 +122,19 @@ class Sources(BrowserBase):
             if not any(source_utils.is_file_ext_valid(tor_file['short_name'].lower()) for tor_file in torrent['files']):
                 continue
 
+            title_info = source_utils.ReleaseTitleInfo(torrent['name'])
             self.cloud_files.append(
                 {
                     'id': torrent['id'],
-                    'quality': source_utils.getQuality(torrent['name']),
-                    'lang': source_utils.getAudio_lang(torrent['name']),
-                    'channel': source_utils.getAudio_channel(torrent['name']),
-                    'sub': source_utils.getSubtitle_lang(torrent['name']),
+                    'quality': title_info.quality,
+                    'lang': title_info.lang,
+                    'channel': title_info.channel,
+                    'sub': title_info.sub,
                     'hash': torrent['files'],
                     'provider': 'Cloud',
                     'type': 'cloud',
                     'release_title': torrent['name'],
-                    'info': source_utils.getInfo(torrent['name']),
+                    'info': title_info.info,
                     'debrid_provider': 'TorBox',
                     'size': source_utils.get_size(torrent['size']),
                     'seeders': 0,
@@ -162,17 +163,18 @@ class Sources(BrowserBase):
                 continue
 
             url = api.resolve_hoster(torrent['link'])
+            title_info = source_utils.ReleaseTitleInfo(torrent['filename'])
             self.cloud_files.append(
                 {
-                    'quality': source_utils.getQuality(torrent['filename']),
-                    'lang': source_utils.getAudio_lang(torrent['filename']),
-                    'channel': source_utils.getAudio_channel(torrent['filename']),
-                    'sub': source_utils.getSubtitle_lang(torrent['filename']),
+                    'quality': title_info.quality,
+                    'lang': title_info.lang,
+                    'channel': title_info.channel,
+                    'sub': title_info.sub,
                     'hash': url,
                     'provider': 'Cloud',
                     'type': 'cloud',
                     'release_title': torrent['filename'],
-                    'info': source_utils.getInfo(torrent['filename']),
+                    'info': title_info.info,
                     'debrid_provider': 'Alldebrid',
                     'size': source_utils.get_size(torrent['size']),
                     'seeders': 0,
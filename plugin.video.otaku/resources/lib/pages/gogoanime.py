@@ -136,6 +136,7 @@ class Sources(BrowserBase):
                 if link.startswith('//'):
                     link = 'https:' + link
 
+                title_info = source_utils.ReleaseTitleInfo(title)
                 source = {
                     'release_title': title,
                     'hash': link,
@@ -148,8 +149,8 @@ class Sources(BrowserBase):
                     'byte_size': 0,
                     'info': [f"{server.upper()} {lang.upper()}"],
                     'lang': 3 if lang == 'dub' else 2,
-                    'channel': source_utils.getAudio_channel(title),
-                    'sub': source_utils.getSubtitle_lang(title),
+                    'channel': title_info.channel,
+                    'sub': title_info.sub,
                 }
                 sources.append(source)
                 control.log(f"GogoAnime: Found source from server '{server}'")
@@ -36,22 +36,23 @@ class Sources(BrowserBase):
             full_path = file_info['path']
             file_size = os.path.getsize(full_path)
 
+            title_info = source_utils.ReleaseTitleInfo(file_info['name'])
             self.local_files.append(
                 {
                     'release_title': file_info['name'],
                     'hash': full_path,
                     'provider': 'Local',
                     'type': 'local',
-                    'quality': source_utils.getQuality(file_info['name']),
+                    'quality': title_info.quality,
                     'debrid_provider': 'Local-Debrid',
                     'episode': episode,
                     'size': source_utils.get_size(file_size),
                     'seeders': 0,
                     'byte_size': file_size,
-                    'info': source_utils.getInfo(file_info['name']),
-                    'lang': source_utils.getAudio_lang(file_info['name']),
-                    'channel': source_utils.getAudio_channel(file_info['name']),
-                    'sub': source_utils.getSubtitle_lang(file_info['name'])
+                    'info': title_info.info,
+                    'lang': title_info.lang,
+                    'channel': title_info.channel,
+                    'sub': title_info.sub
                 }
             )
         return self.local_files
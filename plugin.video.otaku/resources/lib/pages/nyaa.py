@@ -1,10 +1,9 @@
 import re
 import pickle
 
-from functools import partial
 from bs4 import BeautifulSoup, SoupStrainer
 from resources.lib.debrid import Debrid
-from resources.lib.ui import database, source_utils, control, client, utils
+from resources.lib.ui import database, source_utils, control, scrape_engine
 from resources.lib.ui.BrowserBase import BrowserBase
 
 
@@ -18,10 +17,14 @@ class Sources(BrowserBase):
         self.sources = []
 
     def get_sources(self, query, mal_id, episode, status, media_type):
+        # Sync entry point for database.get and the sources window, runs on the active scrape engine
+        return scrape_engine.run_sync(self.get_sources_async, query, mal_id, episode, status, media_type)
+
+    async def get_sources_async(self, query, mal_id, episode, status, media_type):
         query = self._clean_title(query).replace('-', ' ')
         self.media_type = media_type
         if media_type == 'movie':
-            return self.get_movie_sources(query, mal_id)
+            return await self.get_movie_sources(query, mal_id)
 
         if 'part' in query.lower() or 'cour' in query.lower():
             part_match = re.search(r'(?:part|cour) ?(\d+)', query.lower())
@@ -34,12 +37,14 @@ class Sources(BrowserBase):
 
         # If the part could not be determined from the query, try to get it from the MAL mappings.
         if part is None:
-            mal_mapping = database.get_mappings(mal_id, 'mal_id')
+            mal_mapping = await scrape_engine.run_blocking(database.get_mappings, mal_id, 'mal_id')
             if mal_mapping and 'thetvdb_part' in mal_mapping:
                 part = mal_mapping['thetvdb_part']
 
-        episode_sources = self.get_episode_sources(query, mal_id, episode, part, status)
-        show_sources = self.get_show_sources(query, mal_id, episode, part)
+        episode_sources, show_sources = await scrape_engine.gather(
+            self.get_episode_sources(query, mal_id, episode, part, status),
+            self.get_show_sources(query, mal_id, episode, part)
+        )
         self.sources = episode_sources + show_sources
 
         if not self.sources and ':' in query:
@@ -47,14 +52,14 @@ class Sources(BrowserBase):
             q1 = q1[1:-1].split(':')[0]
             q2 = q2[1:-1].split(':')[0]
             query2 = '({0})|({1})'.format(q1, q2)
-            self.sources = self.get_episode_sources(query2, mal_id, episode, part, status)
+            self.sources = await self.get_episode_sources(query2, mal_id, episode, part, status)
 
         # remove any duplicate sources
         self.append_cache_uncached_noduplicates()
         return {'cached': self.cached, 'uncached': self.uncached}
 
-    def get_episode_sources(self, show, mal_id, episode, part, status):
-        season = database.get_episode(mal_id)['season']
+    async def get_episode_sources(self, show, mal_id, episode, part, status):
+        season = (await scrape_engine.run_blocking(database.get_episode, mal_id))['season']
         season_zfill = str(season).zfill(2)
         episode_zfill = episode.zfill(2)
 
@@ -72,7 +77,8 @@ class Sources(BrowserBase):
         # Batch/Complete series search (only for finished shows)
         if status in ["FINISHED", "Finished Airing"]:
             query2 = '%s "Batch"|"Complete Series"' % show
-            episodes = pickle.loads(database.get_show(mal_id)['kodi_meta'])['episodes']
+            show_row = await scrape_engine.run_blocking(database.get_show, mal_id)
+            episodes = pickle.loads(show_row['kodi_meta'])['episodes']
             if episodes:
                 query2 += f'|"01-{episode_zfill}"|"01~{episode_zfill}"|"01 - {episode_zfill}"|"01 ~ {episode_zfill}"|"E{episode_zfill}"|"Episode {episode_zfill}"'
             if season_zfill:
@@ -115,19 +121,19 @@ class Sources(BrowserBase):
             'name': 'additional'
         })
 
-        # Execute all searches in parallel
+        # Execute all searches concurrently on the scrape engine
         control.log(f"Nyaa: Running {len(search_tasks)} searches in parallel for episode {episode_zfill}")
 
-        def run_search(task):
+        async def run_search(task):
             try:
-                sources = self.process_nyaa_episodes(self._BASE_URL, task['params'], mal_id, episode_zfill, season_zfill, part)
+                sources = await self.process_nyaa_episodes(self._BASE_URL, task['params'], mal_id, episode_zfill, season_zfill, part)
                 control.log(f"Nyaa: {task['name']} search returned {len(sources)} sources")
                 return sources
             except Exception as e:
                 control.log(f"Nyaa: {task['name']} search failed: {str(e)}")
                 return []
 
-        all_search_results = utils.parallel_process(search_tasks, run_search, max_workers=4)
+        all_search_results = await scrape_engine.gather(*[run_search(task) for task in search_tasks])
 
         # Combine all results
         nyaa_sources = []
@@ -137,9 +143,9 @@ class Sources(BrowserBase):
         control.log(f"Nyaa: Episode search complete - returning {len(nyaa_sources)} total sources")
         return nyaa_sources
 
-    def get_show_sources(self, show, mal_id, episode, part):
+    async def get_show_sources(self, show, mal_id, episode, part):
         control.log(f"Nyaa: Searching show/batch sources for '{show}'")
-        season = database.get_episode(mal_id)['season']
+        season = (await scrape_engine.run_blocking(database.get_episode, mal_id))['season']
         season_zfill = str(season).zfill(2)
         episode_zfill = episode.zfill(2)
         query = show
@@ -152,11 +158,11 @@ class Sources(BrowserBase):
             'o': 'desc'
         }
 
-        nyaa_sources = self.process_nyaa_episodes(self._BASE_URL, params, mal_id, episode_zfill, season_zfill, part)
+        nyaa_sources = await self.process_nyaa_episodes(self._BASE_URL, params, mal_id, episode_zfill, season_zfill, part)
         control.log(f"Nyaa: Show search complete - found {len(nyaa_sources)} sources")
         return nyaa_sources
 
-    def get_movie_sources(self, query, mal_id):
+    async def get_movie_sources(self, query, mal_id):
         control.log(f"Nyaa: Searching movie sources for '{query}'")
         params = {
             'f': '0',
@@ -166,106 +172,107 @@ class Sources(BrowserBase):
             'o': 'desc'
         }
 
-        self.sources = self.process_nyaa_movie(self._BASE_URL, params, mal_id)
+        self.sources = await self.process_nyaa_movie(self._BASE_URL, params, mal_id)
 
         # make sure no duplicate sources
         self.append_cache_uncached_noduplicates()
         return {'cached': self.cached, 'uncached': self.uncached}
 
-    def process_nyaa_episodes(self, url, params, mal_id, episode_zfill, season_zfill, part):
-        response = client.get(url, params=params)
+    async def process_nyaa_episodes(self, url, params, mal_id, episode_zfill, season_zfill, part):
+        response = await scrape_engine.fetch(url, params=params, stream=True)
         if response:
-            html = response.text
-            mlink = SoupStrainer('div', {'class': 'table-responsive'})
-            soup = BeautifulSoup(html, "html.parser", parse_only=mlink)
-            rex = r'(magnet:)+[^"]*'
-            list_ = [
-                {'magnet': i.find('a', {'href': re.compile(rex)}).get('href'),
-                 'name': i.find_all('a', {'class': None})[1].get('title'),
-                 'size': i.find_all('td', {'class': 'text-center'})[1].text.replace('i', ''),
-                 'downloads': int(i.find_all('td', {'class': 'text-center'})[-1].text),
-                 'seeders': int(i.find_all('td', {'class': 'text-center'})[-3].text)
-                 } for i in soup.select("tr.danger,tr.default,tr.success")
-            ]
-
-            for idx, torrent in enumerate(list_):
-                torrent['hash'] = re.findall(r'btih:(.*?)(?:&|$)', torrent['magnet'])[0]
-
-            filtered_list = source_utils.filter_sources('nyaa', list_, mal_id, int(season_zfill), int(episode_zfill), part)
-
-            cache_list, uncashed_list_ = Debrid().torrentCacheCheck(filtered_list)
-            cache_list = sorted(cache_list, key=lambda k: k['downloads'], reverse=True)
-
-            uncashed_list = [i for i in uncashed_list_ if i['seeders'] > 0]
-            uncashed_list = sorted(uncashed_list, key=lambda k: k['seeders'], reverse=True)
-
-            # Parse sources in parallel for faster processing
-            mapfunc = partial(self.parse_nyaa_view, episode=episode_zfill)
-            all_results = utils.parallel_process(cache_list, mapfunc, max_workers=5) if cache_list else []
-            if control.settingids.showuncached and uncashed_list:
-                mapfunc2 = partial(self.parse_nyaa_view, episode=episode_zfill, cached=False)
-                all_results += utils.parallel_process(uncashed_list, mapfunc2, max_workers=5)
-            return all_results
-
-    def process_nyaa_movie(self, url, params, mal_id):
-        response = client.get(url, params=params)
+            list_ = await scrape_engine.run_blocking(self.parse_episode_listing, response)
+            filtered_list = await scrape_engine.run_blocking(source_utils.filter_sources, 'nyaa', list_, mal_id, int(season_zfill), int(episode_zfill), part)
+            return await self.check_cache(filtered_list, episode_zfill)
+        return []
+
+    async def process_nyaa_movie(self, url, params, mal_id):
+        response = await scrape_engine.fetch(url, params=params, stream=True)
         if response:
-            res = response.text
-            results = BeautifulSoup(res, 'html.parser')
-            rex = r'(magnet:)+[^"]*'
-            search_results = [
-                (i.find_all('a', {'href': re.compile(rex)})[0].get('href'),
-                 i.find_all('a', {'class': None})[1].get('title'),
-                 i.find_all('td', {'class': 'text-center'})[1].text,
-                 i.find_all('td', {'class': 'text-center'})[-1].text,
-                 i.find_all('td', {'class': 'text-center'})[-3].text
-                 ) for i in results.select("tr.danger,tr.default,tr.success")]
-
-            list_ = [
-                {
-                    'magnet': magnet,
-                    'name': name,
-                    'size': size.replace('i', ''),
-                    'downloads': int(downloads),
-                    'seeders': int(seeders)
-                } for magnet, name, size, downloads, seeders in search_results
-            ]
-
-            for idx, torrent in enumerate(list_):
-                torrent['hash'] = re.findall(r'btih:(.*?)(?:&|$)', torrent['magnet'])[0]
-
-            filtered_list = source_utils.filter_sources('nyaa', list_, mal_id)
-
-            cache_list, uncashed_list_ = Debrid().torrentCacheCheck(filtered_list)
-            cache_list = sorted(cache_list, key=lambda k: k['downloads'], reverse=True)
-
-            uncashed_list = [i for i in uncashed_list_ if i['seeders'] > 0]
-            uncashed_list = sorted(uncashed_list, key=lambda k: k['seeders'], reverse=True)
-
-            # Parse sources in parallel for faster processing
-            mapfunc = partial(self.parse_nyaa_view, episode=1)
-            all_results = utils.parallel_process(cache_list, mapfunc, max_workers=5) if cache_list else []
-            if control.settingids.showuncached and uncashed_list:
-                mapfunc2 = partial(self.parse_nyaa_view, episode=1, cached=False)
-                all_results += utils.parallel_process(uncashed_list, mapfunc2, max_workers=5)
-            return all_results
+            list_ = await scrape_engine.run_blocking(self.parse_movie_listing, response)
+            filtered_list = await scrape_engine.run_blocking(source_utils.filter_sources, 'nyaa', list_, mal_id)
+            return await self.check_cache(filtered_list, 1)
+        return []
+
+    async def check_cache(self, filtered_list, episode):
+        cache_list, uncashed_list_ = await scrape_engine.run_blocking(Debrid().torrentCacheCheck, filtered_list)
+        cache_list = sorted(cache_list, key=lambda k: k['downloads'], reverse=True)
+
+        uncashed_list = [i for i in uncashed_list_ if i['seeders'] > 0]
+        uncashed_list = sorted(uncashed_list, key=lambda k: k['seeders'], reverse=True)
+
+        if not control.settingids.showuncached:
+            uncashed_list = []
+        return await scrape_engine.run_blocking(self.parse_nyaa_views, cache_list, uncashed_list, episode)
+
+    def parse_nyaa_views(self, cache_list, uncashed_list, episode):
+        # One executor hop for the whole list, parse_nyaa_view is pure regex work and a
+        # thread per source would only add overhead under the GIL
+        all_results = [self.parse_nyaa_view(i, episode) for i in cache_list]
+        all_results += [self.parse_nyaa_view(i, episode, cached=False) for i in uncashed_list]
+        return all_results
+
+    @staticmethod
+    def parse_episode_listing(response):
+        mlink = SoupStrainer('div', {'class': 'table-responsive'})
+        soup = BeautifulSoup(response.raw, "html.parser", parse_only=mlink)
+        rex = r'(magnet:)+[^"]*'
+        list_ = [
+            {'magnet': i.find('a', {'href': re.compile(rex)}).get('href'),
+             'name': i.find_all('a', {'class': None})[1].get('title'),
+             'size': i.find_all('td', {'class': 'text-center'})[1].text.replace('i', ''),
+             'downloads': int(i.find_all('td', {'class': 'text-center'})[-1].text),
+             'seeders': int(i.find_all('td', {'class': 'text-center'})[-3].text)
+             } for i in soup.select("tr.danger,tr.default,tr.success")
+        ]
+
+        for idx, torrent in enumerate(list_):
+            torrent['hash'] = re.findall(r'btih:(.*?)(?:&|$)', torrent['magnet'])[0]
+        return list_
+
+    @staticmethod
+    def parse_movie_listing(response):
+        results = BeautifulSoup(response.raw, 'html.parser')
+        rex = r'(magnet:)+[^"]*'
+        search_results = [
+            (i.find_all('a', {'href': re.compile(rex)})[0].get('href'),
+             i.find_all('a', {'class': None})[1].get('title'),
+             i.find_all('td', {'class': 'text-center'})[1].text,
+             i.find_all('td', {'class': 'text-center'})[-1].text,
+             i.find_all('td', {'class': 'text-center'})[-3].text
+             ) for i in results.select("tr.danger,tr.default,tr.success")]
+
+        list_ = [
+            {
+                'magnet': magnet,
+                'name': name,
+                'size': size.replace('i', ''),
+                'downloads': int(downloads),
+                'seeders': int(seeders)
+            } for magnet, name, size, downloads, seeders in search_results
+        ]
+
+        for idx, torrent in enumerate(list_):
+            torrent['hash'] = re.findall(r'btih:(.*?)(?:&|$)', torrent['magnet'])[0]
+        return list_
 
     @staticmethod
     def parse_nyaa_view(res, episode, cached=True):
+        title_info = source_utils.ReleaseTitleInfo(res['name'])
         source = {
             'release_title': res['name'],
             'hash': res['hash'],
             'type': 'torrent',
-            'quality': source_utils.getQuality(res['name']),
+            'quality': title_info.quality,
             'debrid_provider': res.get('debrid_provider'),
             'provider': 'nyaa',
             'episode_re': episode,
             'size': res['size'],
             'byte_size': 0,
-            'info': source_utils.getInfo(res['name']),
-            'lang': source_utils.getAudio_lang(res['name']),
-            'channel': source_utils.getAudio_channel(res['name']),
-            'sub': source_utils.getSubtitle_lang(res['name']),
+            'info': title_info.info,
+            'lang': title_info.lang,
+            'channel': title_info.channel,
+            'sub': title_info.sub,
             'cached': cached,
             'seeders': res['seeders']
         }
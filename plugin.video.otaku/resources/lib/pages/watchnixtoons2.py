@@ -4,9 +4,8 @@ import time
 import urllib.parse
 import json
 from bs4 import BeautifulSoup
-from resources.lib.ui import control, database, client
+from resources.lib.ui import control, database, client, thread_pool
 from resources.lib.ui.BrowserBase import BrowserBase
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
 
@@ -154,27 +153,23 @@ class Sources(BrowserBase):
         def search_title_worker(search_data):
             search_type, search_title = search_data
             control.log(f"Searching for {search_type} version with title: {search_title}")
-            return self._search_and_get_episode(search_title, season, mapped_episode, search_type)
+            try:
+                return self._search_and_get_episode(search_title, season, mapped_episode, search_type)
+            except Exception as e:
+                control.log(f"Search failed for {search_type}: {str(e)}")
+                return None
 
         # Process searches concurrently
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_search = {executor.submit(search_title_worker, search_data): search_data for search_data in search_titles}
-
-            for future in as_completed(future_to_search):
-                search_data = future_to_search[future]
-                search_type = search_data[0]
-                try:
-                    episode_result = future.result()
-                    if episode_result:
-                        # Use URL as key to avoid duplicates
-                        episode_url = episode_result['url']
-                        if episode_url not in found_episodes:
-                            found_episodes[episode_url] = episode_result
-                            control.log(f"Added {search_type} episode: {episode_result['title']}")
-                        else:
-                            control.log(f"Duplicate episode found for {search_type}, skipping")
-                except Exception as e:
-                    control.log(f"Search failed for {search_type}: {str(e)}")
+        search_results = thread_pool.pool.map(search_title_worker, search_titles, max_workers=3)
+        for (search_type, _), episode_result in zip(search_titles, search_results):
+            if episode_result:
+                # Use URL as key to avoid duplicates
+                episode_url = episode_result['url']
+                if episode_url not in found_episodes:
+                    found_episodes[episode_url] = episode_result
+                    control.log(f"Added {search_type} episode: {episode_result['title']}")
+                else:
+                    control.log(f"Duplicate episode found for {search_type}, skipping")
 
         # Convert found episodes to sources with concurrent processing
         sources = []
@@ -196,42 +191,32 @@ class Sources(BrowserBase):
 
             control.log(f"WatchNixtoons2: Processing '{version_type}' episode: {episode_data.get('title', 'Unknown')}")
 
-            # Get the episode page content
-            resp = self._make_request(episode_data['url'])
-            if resp:
-                # First try to find direct video sources using the advanced method
-                advanced_sources = self._extract_advanced_sources(episode_data['url'], resp, version_type, lang, episode_data['title'])
-                if advanced_sources:
-                    return (advanced_sources, lang)
-                else:
-                    # Fallback to basic iframe extraction
-                    iframe_sources = self._extract_iframe_sources(resp, version_type, lang, episode_data)
-                    if iframe_sources:
-                        return (iframe_sources, lang)
-            else:
+            try:
+                # Get the episode page content
+                resp = self._make_request(episode_data['url'])
+                if resp:
+                    # First try to find direct video sources using the advanced method
+                    advanced_sources = self._extract_advanced_sources(episode_data['url'], resp, version_type, lang, episode_data['title'])
+                    if advanced_sources:
+                        result = (advanced_sources, lang)
+                    else:
+                        # Fallback to basic iframe extraction
+                        iframe_sources = self._extract_iframe_sources(resp, version_type, lang, episode_data)
+                        result = (iframe_sources, lang) if iframe_sources else None
+                    if result:
+                        sources_found_per_lang[lang] = True
+                    return result
                 control.log(f"Failed to get episode page: {episode_data['url']}")
+            except Exception as e:
+                control.log(f"Source extraction failed for {episode_data.get('title', 'Unknown')}: {str(e)}")
             return None
 
         # Process episodes concurrently for faster source extraction
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            future_to_episode = {executor.submit(extract_sources_worker, episode_data): episode_data for episode_data in found_episodes.values()}
-
-            for future in as_completed(future_to_episode):
-                episode_data = future_to_episode[future]
-                try:
-                    result = future.result()
-                    if result:
-                        episode_sources, lang = result
-                        sources.extend(episode_sources)
-                        sources_found_per_lang[lang] = True
-                        control.log(f"WatchNixtoons2: Found {len(episode_sources)} sources for lang {lang}")
-
-                        # If we have both SUB and DUB, we can stop early
-                        if len(sources_found_per_lang) >= 2:
-                            control.log("WatchNixtoons2: Found sources for both SUB and DUB - stopping early")
-                            break
-                except Exception as e:
-                    control.log(f"Source extraction failed for {episode_data.get('title', 'Unknown')}: {str(e)}")
+        for result in thread_pool.pool.map(extract_sources_worker, list(found_episodes.values()), max_workers=2):
+            if result:
+                episode_sources, lang = result
+                sources.extend(episode_sources)
+                control.log(f"WatchNixtoons2: Found {len(episode_sources)} sources for lang {lang}")
 
         control.log(f"WatchNixtoons2: Returning {len(sources)} total sources")
         return sources
@@ -454,18 +439,18 @@ class Sources(BrowserBase):
 
                     # Process iframes concurrently
                     if promising_iframes:
-                        with ThreadPoolExecutor(max_workers=2) as executor:
-                            iframe_futures = {executor.submit(process_iframe_worker, iframe_url): iframe_url for iframe_url in promising_iframes}
-
-                            for future in as_completed(iframe_futures):
-                                try:
-                                    iframe_sources = future.result()
-                                    if iframe_sources:
-                                        sources.extend(iframe_sources)
-                                        # Break after first successful iframe to save time
-                                        break
-                                except Exception as e:
-                                    control.log(f"Iframe processing failed: {str(e)}")
+                        def safe_iframe_worker(iframe_url):
+                            try:
+                                return process_iframe_worker(iframe_url)
+                            except Exception as e:
+                                control.log(f"Iframe processing failed: {str(e)}")
+                                return []
+
+                        # Keep the sources of the first iframe that produced any
+                        for iframe_sources in thread_pool.pool.map(safe_iframe_worker, promising_iframes, max_workers=2):
+                            if iframe_sources:
+                                sources.extend(iframe_sources)
+                                break
 
                 # FALLBACK 2: Basic iframe source if no APIs found
                 if not sources or len(sources) == 0:
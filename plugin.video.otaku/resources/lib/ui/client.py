@@ -17,45 +17,824 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import functools
 import gzip
 import http.client
 import io
 import json
+import os
 import random
 import re
+import select
+import socket
 import ssl
 import sys
+import threading
 import time
 import urllib.request
 import urllib.parse
 import urllib.error
 import urllib.response
 import http.cookiejar
+import zlib
 import xbmcvfs
 
-from resources.lib.ui import control
+from resources.lib.ui import control, database
 
 TRANSLATEPATH = xbmcvfs.translatePath
 CERT_FILE = TRANSLATEPATH('special://xbmc/system/certs/cacert.pem')
 _COOKIE_HEADER = "Cookie"
 _HEADER_RE = re.compile(r"^([\w\d-]+?)=(.*?)$")
 
-# Session-like storage for cookies and connection reuse with automatic cleanup
+# Cookies kept per scheme://host by session_request, until clear_session
 _session_cookies = {}
-_session_openers = {}
-_session_timestamps = {}
-_SESSION_TIMEOUT = 600  # 10 minutes
 
 
-def _cleanup_old_sessions():
-    """Clean up sessions older than timeout to prevent memory leaks"""
-    import time
-    current_time = time.time()
-    expired_keys = [k for k, v in _session_timestamps.items() if current_time - v > _SESSION_TIMEOUT]
-    for key in expired_keys:
-        _session_cookies.pop(key, None)
-        _session_openers.pop(key, None)
-        _session_timestamps.pop(key, None)
+# Keep-alive connection pool shared by every opener built in this module
+POOL_MAX_PER_HOST = 8  # idle connections kept per (scheme, host, port, tls)
+POOL_IDLE_TIMEOUT = 30  # seconds, most servers drop idle keep-alive sockets soon after
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+
+class _ConnectionPool:
+    """
+    Thread-safe store of idle HTTP/1.1 connections. A connection is checked out by one
+    request at a time and only comes back once its response body has been read to the end.
+    """
+    def __init__(self, max_per_host=POOL_MAX_PER_HOST, idle_timeout=POOL_IDLE_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key):
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used < self.idle_timeout and not _is_dropped(conn):
+                    return conn
+                conn.close()
+        return None
+
+    def release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+
+def _is_dropped(conn):
+    # An idle keep-alive socket that is readable has been closed (or spoken to) by the server
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+_pool = _ConnectionPool()
+
+
+# Request tracing, opt-in through general.request.trace. Every client.request call records a span
+# (method, host, path, status, bytes, cache, retries and dns/connect/tls/ttfb/wait/total in ms) and
+# trace_dump writes the spans of one plugin invocation to traces/ in the add-on data folder as a JSON
+# summary that also loads as a flame chart in chrome://tracing or ui.perfetto.dev
+TRACE_PATH = os.path.join(control.dataPath, 'traces')
+TRACE_KEEP = 20  # trace files kept, the oldest are removed first
+_trace_local = threading.local()
+_trace_spans = []
+_trace_started = time.perf_counter()
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def _trace_span():
+    """The span of the request running on this thread, None when it is not traced"""
+    return getattr(_trace_local, 'span', None)
+
+
+def _trace_set(key, value):
+    if span := _trace_span():
+        span[key] = value
+
+
+def _trace_add(key, value=1):
+    if span := _trace_span():
+        span[key] = round(span[key] + value, 1)
+
+
+def _traced(func):
+    """Records each call of client.request as a span while tracing is enabled"""
+    @functools.wraps(func)
+    def wrapper(url, *args, **kwargs):
+        if not url or not control.settingids.request_trace:
+            return func(url, *args, **kwargs)
+        uri = urllib.parse.urlparse(url)
+        start = time.perf_counter()
+        span = {
+            'method': 'POST' if kwargs.get('post') is not None else kwargs.get('method') or 'GET',
+            'host': uri.hostname,
+            'path': uri.path or '/',  # query strings are left out, they carry API keys and tokens
+            'status': None,
+            'bytes': 0,
+            'cache': None,
+            'retries': 0,
+            'reused': None,
+            'dns': 0,
+            'connect': 0,
+            'tls': 0,
+            'ttfb': None,
+            'wait': 0,
+            'total': None,
+            'start': _ms(start - _trace_started),
+            'thread': threading.current_thread().name
+        }
+        # The Cloudflare TLS fallback calls request again, that call gets its own span
+        parent, _trace_local.span = _trace_span(), span
+        try:
+            return func(url, *args, **kwargs)
+        finally:
+            span['total'] = _ms(time.perf_counter() - start)
+            _trace_local.span = parent
+            _trace_spans.append(span)
+    return wrapper
+
+
+def _trace_connection(conn):
+    """Times DNS, TCP connect and the TLS handshake of a new connection for the span that opens it"""
+    def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, **kwargs):
+        host, port = address
+        start = time.perf_counter()
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        _trace_add('dns', _ms(resolved - start))
+        err = None
+        try:
+            for *_, sockaddr in addresses:
+                try:
+                    return socket.create_connection(sockaddr[:2], timeout, source_address, **kwargs)
+                except OSError as e:
+                    err = e
+            raise err or OSError(f'getaddrinfo returned nothing for {host}')
+        finally:
+            _trace_add('connect', _ms(time.perf_counter() - resolved))
+
+    def connect():
+        start = time.perf_counter()
+        span = _trace_span()
+        before = span and span['dns'] + span['connect']
+        _connect()
+        if span and isinstance(conn, http.client.HTTPSConnection):
+            # whatever HTTPSConnection.connect spent beyond DNS and TCP is the handshake
+            _trace_add('tls', max(_ms(time.perf_counter() - start) - (span['dns'] + span['connect'] - before), 0))
+
+    _connect = conn.connect
+    conn._create_connection = create_connection
+    conn.connect = connect
+
+
+def trace_begin():
+    """Starts a new trace, called when a plugin invocation begins"""
+    global _trace_started
+    _trace_spans.clear()
+    _trace_started = time.perf_counter()
+
+
+def trace_dump(label=''):
+    """Writes the spans recorded since trace_begin to TRACE_PATH and returns the file path, None when there are none"""
+    spans, duration = list(_trace_spans), _ms(time.perf_counter() - _trace_started)
+    trace_begin()
+    if not spans:
+        return
+    spans.sort(key=lambda span: span['start'])
+    hosts = {}
+    for span in spans:
+        host = hosts.setdefault(span['host'], {'requests': 0, 'bytes': 0, 'total': 0, 'max': 0, 'retries': 0, 'errors': 0})
+        host['requests'] += 1
+        host['bytes'] += span['bytes']
+        host['total'] = round(host['total'] + span['total'], 1)
+        host['max'] = max(host['max'], span['total'])
+        host['retries'] += span['retries']
+        host['errors'] += not span['status'] or span['status'] >= 400
+    cache = {}
+    for span in spans:
+        if span['cache']:
+            cache[span['cache']] = cache.get(span['cache'], 0) + 1
+    threads = {name: tid for tid, name in enumerate(dict.fromkeys(span['thread'] for span in spans), 1)}
+    trace = {
+        'invocation': label,
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'duration': duration,
+        'requests': len(spans),
+        'bytes': sum(span['bytes'] for span in spans),
+        'retries': sum(span['retries'] for span in spans),
+        'cache': cache,
+        'hosts': dict(sorted(hosts.items(), key=lambda item: item[1]['total'], reverse=True)),
+        'slowest': sorted(spans, key=lambda span: span['total'], reverse=True)[:10],
+        'traceEvents': [{
+            'name': f"{span['method']} {span['host']}{span['path']}",
+            'cat': span['host'],
+            'ph': 'X',
+            'ts': int(span['start'] * 1000),
+            'dur': int(span['total'] * 1000),
+            'pid': 1,
+            'tid': threads[span['thread']],
+            'args': span
+        } for span in spans] + [
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': name}} for name, tid in threads.items()
+        ]
+    }
+    try:
+        os.makedirs(TRACE_PATH, exist_ok=True)
+        path = os.path.join(TRACE_PATH, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=1)
+        for old in sorted(name for name in os.listdir(TRACE_PATH) if name.startswith('trace-'))[:-TRACE_KEEP]:
+            os.remove(os.path.join(TRACE_PATH, old))
+    except OSError as e:
+        control.log(f'Could not write request trace: {e}', 'warning')
+        return
+    control.log(f"Request trace: {trace['requests']} requests, {trace['bytes']} bytes, {duration} ms -> {path}")
+    return path
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    _release = None
+    _closing = False
+
+    def close(self):
+        self._closing = True
+        super().close()
+
+    def _close_conn(self):
+        super()._close_conn()
+        release, self._release = self._release, None
+        if release:
+            # reusable only when the body was consumed to the end, not cut short by close()
+            release(not self.will_close and (not self._closing or self.length == 0))
+
+
+class _PooledHandlerMixin:
+    """do_open replacement that borrows a keep-alive connection from _pool instead of opening and closing one per request"""
+    pool_key = None
+
+    def _pooled_open(self, http_class, req, **http_conn_args):
+        if req._tunnel_host:
+            return self.do_open(http_class, req, **http_conn_args)
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+        key = (http_class.__name__, host, self.pool_key)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers['Connection'] = 'keep-alive'
+        headers = {name.title(): val for name, val in headers.items()}
+
+        conn = _pool.acquire(key)
+        while True:
+            reused = conn is not None
+            if not reused:
+                conn = http_class(host, timeout=req.timeout, **http_conn_args)
+                conn.response_class = _PooledResponse
+                if _trace_span() is not None:
+                    _trace_connection(conn)
+            elif conn.sock is not None:
+                conn.sock.settimeout(req.timeout)
+            try:
+                try:
+                    sent = time.perf_counter()
+                    conn.request(req.get_method(), req.selector, req.data, headers, encode_chunked=req.has_header('Transfer-encoding'))
+                    r = conn.getresponse()
+                    _trace_set('ttfb', _ms(time.perf_counter() - sent))
+                    _trace_set('reused', reused)
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    # the server closed the idle connection under us, try once more on a fresh one
+                    conn.close()
+                    conn = None
+                    continue
+                except OSError as err:
+                    raise urllib.error.URLError(err)
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        r._release = functools.partial(self._release, key, conn)
+        if r.fp is None:
+            # nothing left to read (or the server asked us to close)
+            r._release, release = None, r._release
+            release(not r.will_close)
+        r.url = req.get_full_url()
+        r.msg = r.reason
+        return r
+
+    @staticmethod
+    def _release(key, conn, reusable):
+        if reusable and conn.sock is not None:
+            _pool.release(key, conn)
+        else:
+            conn.close()
+
+
+class _PooledHTTPHandler(_PooledHandlerMixin, urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self._pooled_open(http.client.HTTPConnection, req)
+
+
+class _PooledHTTPSHandler(_PooledHandlerMixin, urllib.request.HTTPSHandler):
+    def __init__(self, context=None, pool_key=None):
+        super().__init__(context=context)
+        # connections are only shared between requests asking for the same kind of TLS setup
+        self.pool_key = pool_key
+
+    def https_open(self, req):
+        return self._pooled_open(http.client.HTTPSConnection, req, context=self._context)
+
+
+# Prebuilt SSL contexts keyed by (verify, tls_version, alpn), loading cacert.pem once per process
+_ssl_contexts = {}
+_ssl_lock = threading.Lock()
+_TLS_PROTOCOLS = {
+    'TLSv1_1': 'PROTOCOL_TLSv1_1',
+    'TLSv1_2': 'PROTOCOL_TLSv1_2'
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _is_xbox():
+    try:
+        import platform
+        return platform.uname()[1] == 'XboxOne'
+    except BaseException:
+        return False
+
+
+def _ssl_context(verify=True, tls_version=None, alpn=('http/1.1',)):
+    """
+    Returns the shared SSLContext for these settings, or None if it cannot be built on this platform.
+    Contexts are never modified after they are built, so they are safe to share between threads.
+    """
+    key = (verify, tls_version, alpn)
+    try:
+        return _ssl_contexts[key]
+    except KeyError:
+        pass
+    with _ssl_lock:
+        if key not in _ssl_contexts:
+            _ssl_contexts[key] = _build_ssl_context(verify, tls_version, alpn)
+        return _ssl_contexts[key]
+
+
+def _build_ssl_context(verify, tls_version, alpn):
+    try:
+        if tls_version:
+            ssl_context = ssl.SSLContext(getattr(ssl, _TLS_PROTOCOLS.get(tls_version, 'PROTOCOL_TLS')))
+            ssl_context.check_hostname = verify
+            ssl_context.verify_mode = ssl.CERT_REQUIRED if verify else ssl.CERT_NONE
+            if verify:
+                ssl_context.load_verify_locations(cafile=CERT_FILE)
+        elif not verify:
+            ssl_context = ssl._create_unverified_context()
+        elif _is_xbox():
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+        else:
+            ssl_context = ssl.create_default_context(cafile=CERT_FILE)
+        if alpn:
+            ssl_context.set_alpn_protocols(list(alpn))
+        return ssl_context
+    except Exception as e:
+        control.log(f"SSL context {tls_version or 'default'} (verify={verify}) unavailable: {e}")
+        return None
+
+
+# Token bucket per API host: (requests per second, burst). Hosts that are not listed are only
+# held back after they answer 429 with a Retry-After
+RATE_LIMITS = {
+    'api.jikan.moe': (3, 1),  # 3 requests per second
+    'api.anidb.net': (0.25, 1),  # one request every 4 seconds, AniDB bans clients that flood it
+    'graphql.anilist.co': (1.5, 10),  # 90 requests per minute
+    'kitsu.io': (10, 10),
+    'api.simkl.com': (10, 10)
+}
+# Hosts whose last request time is also kept in a setting so the gap holds across plugin invocations
+RATE_LIMIT_SETTINGS = {
+    'api.anidb.net': 'anidb_last_request'
+}
+RATE_LIMIT_MAX_WAIT = 30  # seconds, a longer Retry-After is returned to the caller as an error
+RATE_LIMIT_DEFAULT_BACKOFF = 2  # seconds to back off after a 429 without Retry-After
+
+
+class _TokenBucket:
+    """
+    Reservation based token bucket: every caller takes a token straight away, going negative when
+    the bucket is empty, and sleeps exactly until its token would have been refilled. Parallel
+    workers are therefore spaced at the allowed rate instead of polling or sleeping fixed amounts.
+    """
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                if self.rate:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            # updated is in the future while the host is backing off after a 429
+            wait = self.updated - now
+            if self.rate:
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait += -self.tokens / self.rate
+            return wait
+
+    def block(self, seconds):
+        with self._lock:
+            self.updated = max(self.updated, time.monotonic() + seconds)
+            self.tokens = min(self.tokens, 0)
+
+
+_rate_buckets = {}
+_rate_lock = threading.Lock()
+
+
+def _rate_bucket(host, create=False):
+    bucket = _rate_buckets.get(host)
+    if bucket is None and (create or host in RATE_LIMITS):
+        with _rate_lock:
+            bucket = _rate_buckets.get(host)
+            if bucket is None:
+                bucket = _rate_buckets[host] = _TokenBucket(*RATE_LIMITS.get(host, (None, 1)))
+    return bucket
+
+
+def _retry_after(headers):
+    value = headers.get('Retry-After') if headers else None
+    if not value:
+        return RATE_LIMIT_DEFAULT_BACKOFF
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        import email.utils
+        return max(0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return RATE_LIMIT_DEFAULT_BACKOFF
+
+
+class RetryPolicy:
+    """
+    Declarative retry rules for client.request, looked up per host in RETRY_POLICIES.
+    Only idempotent methods are retried, on the listed status codes and on connection or read
+    errors, with exponential backoff and full jitter. Attempts stop at the first of `attempts`
+    or `deadline` seconds since the first try; a deadline of None uses the request's own timeout,
+    so retries never make a call slower than a single timed out attempt.
+    A 429 is retried for any method after its Retry-After, the server did not process it.
+    """
+    IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'))
+
+    def __init__(self, attempts=3, statuses=(429, 502, 503, 504), backoff=0.25, max_backoff=8, deadline=None, errors=True):
+        self.attempts = attempts
+        self.statuses = frozenset(statuses)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.errors = errors
+
+    def begin(self, method, timeout):
+        return _RetryState(self, method.upper() in self.IDEMPOTENT_METHODS, self.deadline or timeout)
+
+
+class _RetryState:
+    """Attempt counter and deadline of one client.request call"""
+    def __init__(self, policy, idempotent, deadline):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.deadline = time.monotonic() + deadline
+        self.attempt = 1
+
+    def backoff(self, status=None, delay=None):
+        """Seconds to wait before the next attempt, None when the failure is final"""
+        policy = self.policy
+        if self.attempt >= policy.attempts:
+            return None
+        if status is None:
+            if not (policy.errors and self.idempotent):
+                return None
+        elif status not in policy.statuses or not (self.idempotent or status == 429):
+            return None
+        if delay is None:
+            delay = random.uniform(0, min(policy.max_backoff, policy.backoff * 2 ** (self.attempt - 1)))
+        if time.monotonic() + delay >= self.deadline:
+            return None
+        self.attempt += 1
+        _trace_add('retries')
+        return delay
+
+    def timeout(self, timeout):
+        # later attempts only get what is left of the deadline
+        return max(1, min(timeout, self.deadline - time.monotonic()))
+
+
+# API hosts opt in to status retries. Everything else is a scraped site, where a 503 is usually a
+# Cloudflare challenge that has to reach the challenge handling, not be fetched again
+RETRY_POLICIES = {
+    'api.jikan.moe': RetryPolicy(attempts=4, statuses=(429, 500, 502, 503, 504), deadline=30),
+    'graphql.anilist.co': RetryPolicy(attempts=3, statuses=(429, 500, 502, 503, 504), deadline=30),
+    'api.anidb.net': RetryPolicy(attempts=2, statuses=(429, 503), deadline=30),
+    'kitsu.io': RetryPolicy(attempts=3, statuses=(429, 502, 503, 504)),
+    'api.simkl.com': RetryPolicy(attempts=3, statuses=(429, 502, 503, 504)),
+    'api.ani.zip': RetryPolicy(attempts=3, statuses=(429, 502, 503, 504)),
+    'animeschedule.net': RetryPolicy(attempts=2, statuses=(429, 502, 503, 504))
+}
+# One more try after a dropped connection or a cut short body, status codes go back to the caller
+DEFAULT_RETRY_POLICY = RetryPolicy(attempts=2, statuses=())
+NO_RETRY = RetryPolicy(attempts=1)
+# Raised by urllib/http.client for a dropped connection or a body cut short
+_RETRY_ERRORS = (urllib.error.URLError, http.client.HTTPException, OSError)
+
+
+def _retry_policy(host, retry=None):
+    if retry is None:
+        return RETRY_POLICIES.get(host, DEFAULT_RETRY_POLICY)
+    if retry is False:
+        return NO_RETRY
+    return retry
+
+
+def _open(opener, req, timeout, retry=None):
+    """opener.open honouring RATE_LIMITS and the host's RetryPolicy, a 429 also backs the whole host off"""
+    host = urllib.parse.urlparse(req.full_url).hostname
+    setting = RATE_LIMIT_SETTINGS.get(host)
+    if retry is None:
+        retry = _retry_policy(host).begin(req.get_method(), timeout)
+    while True:
+        wait = 0
+        if bucket := _rate_bucket(host):
+            wait = bucket.reserve()
+        if setting:
+            wait = max(wait, control.getInt(setting) + 1 / RATE_LIMITS[host][0] - time.time())
+        if wait > 0:
+            _trace_add('wait', _ms(wait))
+            time.sleep(wait)
+        try:
+            response = opener.open(req, timeout=retry.timeout(timeout))
+            _trace_set('status', response.code)
+            return response
+        except urllib.error.HTTPError as e:
+            _trace_set('status', e.code)
+            if e.code == 429:
+                delay = _retry_after(e.headers)
+                _rate_bucket(host, create=True).block(delay)
+                if delay > RATE_LIMIT_MAX_WAIT or retry.backoff(429, delay) is None:
+                    raise
+                # the bucket already holds the host back for the Retry-After
+                control.log(f'{host} rate limited, retrying in {delay:.1f}s', 'warning')
+            else:
+                delay = retry.backoff(e.code)
+                if delay is None:
+                    raise
+                control.log(f'{host} answered {e.code}, retry {retry.attempt} in {delay:.2f}s', 'warning')
+                _trace_add('wait', _ms(delay))
+                time.sleep(delay)
+            e.close()
+        except _RETRY_ERRORS as e:
+            delay = retry.backoff()
+            if delay is None:
+                _trace_set('error', str(e))
+                raise
+            control.log(f'{host} request failed ({e}), retry {retry.attempt} in {delay:.2f}s', 'warning')
+            _trace_add('wait', _ms(delay))
+            time.sleep(delay)
+        finally:
+            if setting:
+                control.setInt(setting, int(time.time()))
+
+
+# Conditional request cache, RFC 7234 style. Bodies are kept in cache.db under 'http:<url>' together
+# with their validators: a fresh entry is answered without touching the network, a stale one is sent
+# with If-None-Match/If-Modified-Since and a 304 is answered from disk. Rows live in the regular cache
+# table, so cache_sweep and cache.maxsize bound the store
+HTTP_CACHE_HOSTS = {
+    'raw.githubusercontent.com',  # mal_dub.json, MegaCloud keys.json
+    'webservice.fanart.tv',
+    'api.themoviedb.org'
+}
+HTTP_CACHE_KEEP = 7 * 24  # hours a stale entry is kept for revalidation
+HTTP_CACHE_MAX_BODY = 2097152  # larger bodies are not cached
+HTTP_CACHE_HEURISTIC_MAX = 86400  # cap for freshness derived from Last-Modified
+_HTTP_CACHE_DROP_HEADERS = {'connection', 'content-encoding', 'content-length', 'keep-alive', 'set-cookie', 'transfer-encoding'}
+
+
+def _http_cache_key(url):
+    return f'http:{url}'
+
+
+def _http_cache_load(url):
+    key = _http_cache_key(url)
+    entry = database.memory_cache.get(key)
+    if entry is None:
+        row = database.cache_get(key)
+        if not row or row['format'] not in database.CACHE_CODECS:
+            return None
+        entry = (row['format'], row['value'], row['date'])
+    try:
+        return database.cache_decode(entry[0], entry[1])
+    except Exception:
+        return None
+
+
+def _http_cache_save(url, entry):
+    database.cache_insert(_http_cache_key(url), entry, max(entry['expires'] - time.time(), 0) / 3600 + HTTP_CACHE_KEEP)
+
+
+def _cache_control(headers):
+    directives = {}
+    for item in (headers.get('Cache-Control') or '').split(','):
+        name, _, value = item.strip().partition('=')
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _parse_http_date(value):
+    try:
+        import email.utils
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _freshness(headers, min_fresh=0):
+    """Seconds the response may be reused without revalidation, None when it must not be stored"""
+    directives = _cache_control(headers)
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        lifetime = 0
+    elif 'max-age' in directives:
+        try:
+            lifetime = max(0, int(directives['max-age']) - int(headers.get('Age') or 0))
+        except ValueError:
+            lifetime = 0
+    elif headers.get('Expires'):
+        expires = _parse_http_date(headers['Expires'])
+        date = _parse_http_date(headers.get('Date')) or time.time()
+        lifetime = max(0, expires - date) if expires else 0
+    elif last_modified := _parse_http_date(headers.get('Last-Modified')):
+        # RFC 7234 4.2.2 heuristic: a tenth of the time since the last change
+        date = _parse_http_date(headers.get('Date')) or time.time()
+        lifetime = min(max(0, date - last_modified) / 10, HTTP_CACHE_HEURISTIC_MAX)
+    else:
+        lifetime = 0
+    return max(lifetime, min_fresh)
+
+
+def _http_cache_entry(url, headers, body, min_fresh=0, entry=None):
+    lifetime = _freshness(headers, min_fresh)
+    if lifetime is None:
+        return None
+    entry = dict(entry) if entry else {'body': body}
+    stored = [(k, v) for k, v in headers.items() if k.lower() not in _HTTP_CACHE_DROP_HEADERS]
+    if entry.get('headers'):
+        # A 304 only carries the headers that changed, the rest of the stored set is kept
+        updated = {k.lower() for k, _ in stored}
+        stored += [(k, v) for k, v in entry['headers'] if k.lower() not in updated]
+    entry['headers'] = stored
+    entry['etag'] = headers.get('ETag') or entry.get('etag')
+    entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+    entry['expires'] = time.time() + lifetime
+    if lifetime == 0 and not entry['etag'] and not entry['last_modified']:
+        # Nothing to reuse and nothing to revalidate with
+        return None
+    return entry
+
+
+def conditional_headers(url):
+    """If-None-Match/If-Modified-Since for url from the validators stored by remember_validators or a cached response"""
+    entry = _http_cache_load(url)
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def remember_validators(url, headers):
+    """Stores only the validators of a response whose body is kept elsewhere, e.g. a downloaded file"""
+    entry = _http_cache_entry(url, headers, None)
+    if entry:
+        _http_cache_save(url, entry)
+
+
+class _CachedResponse:
+    """Stands in for the urllib response when the body comes from the HTTP cache"""
+    code = status = 200
+
+    def __init__(self, entry, url):
+        import email.message
+        self.headers = email.message.Message()
+        for k, v in entry['headers']:
+            self.headers[k] = v
+        self.headers['Content-Length'] = str(len(entry['body']))
+        self.url = entry.get('url') or url
+        self._body = io.BytesIO(entry['body'])
+
+    def read(self, amt=None):
+        return self._body.read(amt)
+
+    def info(self):
+        return self.headers
+
+    def getcode(self):
+        return self.code
+
+    def geturl(self):
+        return self.url
+
+    def close(self):
+        self._body.close()
+
+
+def _cached_open(opener, req, timeout, entry, min_fresh=0, retry=None):
+    """_open backed by the HTTP cache: fresh entries skip the network and a 304 is answered from entry"""
+    url = req.full_url
+    if entry is not None:
+        if entry['expires'] > time.time():
+            _trace_set('cache', 'hit')
+            _trace_set('status', 200)
+            return _CachedResponse(entry, url)
+        if entry.get('etag'):
+            req.add_header('If-None-Match', entry['etag'])
+        if entry.get('last_modified'):
+            req.add_header('If-Modified-Since', entry['last_modified'])
+    _trace_set('cache', 'miss')
+    try:
+        return _open(opener, req, timeout, retry)
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or entry is None:
+            raise
+        _trace_set('cache', 'revalidated')
+        e.close()
+        refreshed = _http_cache_entry(url, e.headers, None, min_fresh, entry)
+        if refreshed:
+            _http_cache_save(url, refreshed)
+        return _CachedResponse(refreshed or entry, url)
+
+
+def _http_cache_store(url, response, raw_length, body, min_fresh=0):
+    if isinstance(response, _CachedResponse) or response.code != 200 or len(body) > HTTP_CACHE_MAX_BODY:
+        return
+    try:
+        complete = raw_length == int(response.headers['Content-Length'])
+    except (KeyError, TypeError, ValueError):
+        complete = raw_length < 5242880
+    if not complete:
+        # Truncated or capped reads must never be replayed as the full body
+        return
+    entry = _http_cache_entry(url, response.headers, body, min_fresh)
+    if entry:
+        entry['url'] = response.geturl()
+        _http_cache_save(url, entry)
+
+
+class _NoRedirectHandler(urllib.request.HTTPRedirectHandler):
+    def http_error_302(self, req, fp, code, msg, headers):
+        infourl = urllib.response.addinfourl(fp, headers, req.full_url)
+        infourl.code = code
+        if sys.version_info < (3, 9, 0):
+            infourl.status = code
+        return infourl
+    http_error_300 = http_error_302
+    http_error_301 = http_error_302
+    http_error_303 = http_error_302
+    http_error_307 = http_error_302
 
 
 def _get_cached_useragent(mobile=False):
@@ -103,21 +882,29 @@ class Response:
         cookies: Response cookies dict
         ok: True if status_code < 400
     """
-    def __init__(self, content, status_code=200, headers=None, url='', cookies=None, is_binary=False):
+    def __init__(self, content, status_code=200, headers=None, url='', cookies=None, is_binary=False, raw=None):
         self._raw_content = content
         self._is_binary = is_binary
+        self.raw = raw
         self.status_code = status_code
         self.headers = headers or {}
         self.url = url
         self.cookies = cookies or {}
         self.ok = 200 <= status_code < 400
 
+    def _consume(self):
+        # stream=True responses are read from the network on first access
+        if self._raw_content is None and self.raw is not None:
+            with self.raw:
+                self._raw_content = self.raw.read()
+
     @property
     def text(self):
         """Response content as string"""
+        self._consume()
         if isinstance(self._raw_content, bytes):
             try:
-                return self._raw_content.decode('utf-8', errors='ignore')
+                return self._raw_content.decode(self.raw.encoding if self.raw and self.raw.encoding else 'utf-8', errors='ignore')
             except:
                 return self._raw_content.decode('latin-1', errors='ignore')
         return self._raw_content or ''
@@ -125,25 +912,126 @@ class Response:
     @property
     def content(self):
         """Response content as bytes"""
+        self._consume()
         if isinstance(self._raw_content, str):
             return self._raw_content.encode('utf-8', errors='ignore')
         return self._raw_content or b''
 
+    def iter_content(self, chunk_size=None):
+        """Iterate over the body in decompressed chunks, without holding it in memory when stream=True"""
+        if self._raw_content is None and self.raw is not None:
+            with self.raw:
+                yield from self.raw.iter_content(chunk_size)
+            return
+        content = self.content
+        chunk_size = chunk_size or len(content) or 1
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
     def json(self):
         """Parse response content as JSON"""
         try:
+            if self.raw is not None:
+                # json decodes utf-8/16/32 bytes itself, no need for an intermediate str
+                return json.loads(self.content)
             return json.loads(self.text)
         except (json.JSONDecodeError, ValueError) as e:
             raise ValueError(f"Invalid JSON response: {str(e)}")
 
     def __bool__(self):
         """Allow truthiness check like: if response:"""
-        return self._raw_content is not None and self.ok
+        return (self._raw_content is not None or self.raw is not None) and self.ok
 
     def __repr__(self):
         return f"<Response [{self.status_code}]>"
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class StreamingBody:
+    """
+    File-like view over a response body returned by request(output='stream') and get(stream=True).
+    gzip and deflate bodies are decompressed chunk by chunk as they are read and nothing is capped
+    at 5MB, so large pages are never held compressed and decompressed at the same time.
+
+    Usage:
+        response = client.get(url, stream=True)
+        soup = BeautifulSoup(response.raw, 'html.parser')
+        for chunk in response.iter_content(): ...
+    """
+    def __init__(self, response, url=''):
+        self._response = response
+        self.status_code = response.code
+        self.headers = response.headers
+        self.url = getattr(response, 'url', None) or url
+        content_type = self.headers.get('Content-Type', '').lower()
+        self.encoding = content_type.split('charset=')[-1].split(';')[0].strip() if 'charset=' in content_type else None
+        self._content_encoding = self.headers.get('Content-Encoding', '').lower()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if self._content_encoding == 'gzip' else None
+        self._buffer = b''
+        self._eof = False
+
+    def _read_chunk(self, size=STREAM_CHUNK_SIZE):
+        # highly compressed pages would otherwise inflate a single network read into megabytes
+        if self._decoder is not None and self._decoder.unconsumed_tail:
+            return self._decoder.decompress(self._decoder.unconsumed_tail, size)
+        while not self._eof:
+            try:
+                data = self._response.read(size)
+            except http.client.IncompleteRead as e:
+                control.log(f'IncompleteRead: stream from {self.url} ended early', 'warning')
+                data = e.partial
+                self._eof = True
+            if not data:
+                self._eof = True
+                return self._decoder.flush() if self._decoder else b''
+            if self._decoder is None and self._content_encoding == 'deflate':
+                # 'deflate' is meant to be zlib wrapped but some servers send raw deflate
+                wbits = zlib.MAX_WBITS if (data[0] & 0x0f) == 8 and int.from_bytes(data[:2], 'big') % 31 == 0 else -zlib.MAX_WBITS
+                self._decoder = zlib.decompressobj(wbits)
+            if self._decoder is not None:
+                data = self._decoder.decompress(data, size)
+            if data:
+                return data
+        return b''
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            chunks = [self._buffer]
+            while chunk := self._read_chunk():
+                chunks.append(chunk)
+            self._buffer = b''
+            return b''.join(chunks)
+        while len(self._buffer) < size and (chunk := self._read_chunk()):
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def iter_content(self, chunk_size=None):
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            yield data
+        while chunk := self._read_chunk(chunk_size or STREAM_CHUNK_SIZE):
+            yield chunk
+
+    def __iter__(self):
+        return self.iter_content()
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+@_traced
 def request(
         url,
         close=True,
@@ -165,16 +1053,14 @@ def request(
         params=None,
         method='',
         use_session=False,
-        tls_version=None
+        tls_version=None,
+        cache=None,
+        retry=None
 ):
     try:
         if not url:
             return
 
-        # Clean up old sessions periodically (1 in 20 requests)
-        if random.randint(1, 20) == 1:
-            _cleanup_old_sessions()
-
         # Initialize response to None to avoid UnboundLocalError
         response = None
 
@@ -191,11 +1077,10 @@ def request(
         uri = urllib.parse.urlparse(url)
         domain = uri.scheme + '://' + uri.netloc
 
+        # Everything below builds a private opener for this call, nothing is installed globally
+        # so provider threads and parallel workers cannot pick up each other's handlers
         if proxy is not None:
-            handlers += [urllib.request.ProxyHandler(
-                {'http': '%s' % proxy}), urllib.request.HTTPHandler]
-            opener = urllib.request.build_opener(*handlers)
-            opener = urllib.request.install_opener(opener)
+            handlers += [urllib.request.ProxyHandler({'http': '%s' % proxy})]
 
         if params is not None:
             if isinstance(params, dict):
@@ -204,83 +1089,32 @@ def request(
 
         if output == 'cookie' or output == 'extended' or not close:
             cookies = http.cookiejar.LWPCookieJar()
-            handlers += [urllib.request.HTTPHandler(),
-                         urllib.request.HTTPSHandler(),
-                         urllib.request.HTTPCookieProcessor(cookies)]
-            opener = urllib.request.build_opener(*handlers)
-            opener = urllib.request.install_opener(opener)
+            handlers += [urllib.request.HTTPCookieProcessor(cookies)]
 
         if output == 'elapsed':
             start_time = time.time() * 1000
 
-        try:
-            import platform
-            node = platform.uname()[1]
-        except BaseException:
-            node = ''
-
         # Enhanced SSL/TLS handling with multiple protocol support (WNT2-style)
-        ssl_context_created = False
-
         # TLS version override for Cloudflare bypass (like WNT2's TLS adapters)
-        if tls_version:
-            try:
-                if tls_version == 'TLSv1_1':
-                    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_1)
-                elif tls_version == 'TLSv1_2':
-                    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLSv1_2)
-                else:
-                    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS)
-
-                ssl_context.check_hostname = False if not verify else True
-                ssl_context.verify_mode = ssl.CERT_NONE if not verify else ssl.CERT_REQUIRED
-                ssl_context.set_alpn_protocols(['http/1.1'])
-                handlers += [urllib.request.HTTPSHandler(context=ssl_context)]
-                ssl_context_created = True
+        verify = verify is not False
+        ssl_key = (verify, tls_version, ('http/1.1',))
+        ssl_context = _ssl_context(*ssl_key)
+        if ssl_context is None and tls_version:
+            control.log(f"TLS override failed: {tls_version}")
+            ssl_key = (verify, None, ('http/1.1',))
+            ssl_context = _ssl_context(*ssl_key)
+        if ssl_context is not None:
+            if ssl_key[1]:
                 control.log(f"Using TLS version: {tls_version}")
-            except Exception as e:
-                control.log(f"TLS override failed: {str(e)}")
+            handlers += [_PooledHTTPSHandler(context=ssl_context, pool_key=ssl_key)]
+        else:
+            handlers += [_PooledHTTPSHandler()]
+        handlers += [_PooledHTTPHandler()]
 
-        if not ssl_context_created:
-            if verify is False and sys.version_info >= (2, 7, 12):
-                try:
-                    ssl_context = ssl._create_unverified_context()
-                    ssl._create_default_https_context = ssl._create_unverified_context
-                    ssl_context.set_alpn_protocols(['http/1.1'])
-                    handlers += [urllib.request.HTTPSHandler(context=ssl_context)]
-                    ssl_context_created = True
-                except BaseException:
-                    pass
-
-            if not ssl_context_created and verify and ((2, 7, 8) < sys.version_info < (2, 7, 12)
-                                                       or node == 'XboxOne'):
-                try:
-                    ssl_context = ssl.create_default_context()
-                    ssl_context.check_hostname = False
-                    ssl_context.verify_mode = ssl.CERT_NONE
-                    ssl_context.set_alpn_protocols(['http/1.1'])
-                    handlers += [urllib.request.HTTPSHandler(context=ssl_context)]
-                    ssl_context_created = True
-                except BaseException:
-                    pass
-            elif not ssl_context_created:
-                try:
-                    ssl_context = ssl.create_default_context(cafile=CERT_FILE)
-                    ssl_context.set_alpn_protocols(['http/1.1'])
-                    handlers += [urllib.request.HTTPSHandler(context=ssl_context)]
-                    ssl_context_created = True
-                except BaseException:
-                    pass
-
-        # Build opener with handlers
-        if handlers:
-            opener = urllib.request.build_opener(*handlers)
-            if use_session:
-                # Store opener for session reuse with timestamp
-                _session_openers[domain] = opener
-                _session_timestamps[domain] = time.time()
-            else:
-                urllib.request.install_opener(opener)
+        if redirect is False:
+            handlers += [_NoRedirectHandler()]
+
+        opener = urllib.request.build_opener(*handlers)
 
         if url.startswith('//'):
             url = 'http:' + url
@@ -331,27 +1165,23 @@ def request(
         if 'Accept-Encoding' in _headers:
             pass
         elif compression and limit is None:
-            _headers['Accept-Encoding'] = 'gzip'
-
-        if redirect is False:
-            class NoRedirectHandler(urllib.request.HTTPRedirectHandler):
-                def http_error_302(self, req, fp, code, msg, headers):
-                    infourl = urllib.response.addinfourl(fp, headers, req.full_url)
-                    if sys.version_info < (3, 9, 0):
-                        infourl.status = code
-                        infourl.code = code
-                    return infourl
-                http_error_300 = http_error_302
-                http_error_301 = http_error_302
-                http_error_303 = http_error_302
-                http_error_307 = http_error_302
-
-            opener = urllib.request.build_opener(NoRedirectHandler())
-            urllib.request.install_opener(opener)
+            _headers['Accept-Encoding'] = 'gzip, deflate' if output == 'stream' else 'gzip'
 
         url = byteify(url.replace(' ', '%20'))
         req = urllib.request.Request(url)
 
+        # cache: None follows HTTP_CACHE_HOSTS, True/False force it on or off, a number of seconds
+        # additionally keeps the response fresh for at least that long
+        if cache is None:
+            cache = uri.hostname in HTTP_CACHE_HOSTS
+        http_cache = cache is not False and post is None and method in ('', 'GET') and limit is None and output in ('', 'extended')
+        if http_cache:
+            min_fresh = 0 if cache is True else int(cache)
+            http_entry = _http_cache_load(url)
+            if http_entry is not None and http_entry.get('body') is None:
+                # Validators only, kept by remember_validators for a body stored elsewhere
+                http_entry = None
+
         if post is not None:
             if jpost:
                 post = json.dumps(post)
@@ -379,13 +1209,14 @@ def request(
             req.get_method = lambda: method
 
         _add_request_header(req, _headers)
+        # retry: None follows RETRY_POLICIES, False disables retries, or a RetryPolicy for this call
+        retry_state = _retry_policy(uri.hostname, retry).begin(req.get_method(), int(timeout))
 
         try:
-            # Use session opener if available
-            if use_session and domain in _session_openers:
-                response = _session_openers[domain].open(req, timeout=int(timeout))
+            if http_cache:
+                response = _cached_open(opener, req, int(timeout), http_entry, min_fresh, retry_state)
             else:
-                response = urllib.request.urlopen(req, timeout=int(timeout))
+                response = _open(opener, req, int(timeout), retry_state)
         except urllib.error.HTTPError as e:
             if error is True:
                 response = e
@@ -445,7 +1276,7 @@ def request(
                         _headers['User-Agent'] = cf_ua
                         req = urllib.request.Request(url, data=post)
                         _add_request_header(req, _headers)
-                        response = urllib.request.urlopen(req, timeout=int(timeout))
+                        response = opener.open(req, timeout=int(timeout))
                     else:
                         control.log('%s has a Cloudflare challenge.' % (netloc))
                         if not error:
@@ -468,7 +1299,7 @@ def request(
                     _headers['User-Agent'] = ddg_ua
                     req = urllib.request.Request(url, data=post)
                     _add_request_header(req, _headers)
-                    response = urllib.request.urlopen(req, timeout=int(timeout))
+                    response = opener.open(req, timeout=int(timeout))
                 else:
                     control.log('%s has a DDoS-Guard challenge.' % (netloc))
                     if not error:
@@ -490,6 +1321,9 @@ def request(
         if response is None:
             return None
 
+        if output == 'stream':
+            return StreamingBody(response, url)
+
         if output == 'cookie':
             try:
                 result = '; '.join(['%s=%s' % (i.name, i.value)
@@ -544,51 +1378,54 @@ def request(
             response.close()
             return content
 
-        if limit == '0' or limit == 0:
-            result = response.read(1 * 1024)
-        elif limit is not None:
-            result = response.read(int(limit) * 1024)
-        else:
-            # Smart buffer sizing - check Content-Length header
-            try:
-                content_length = int(response.headers.get('Content-Length', 0))
+        while True:
+            expected = 0
+            if limit == '0' or limit == 0:
+                read_size = 1 * 1024
+            elif limit is not None:
+                read_size = int(limit) * 1024
+            else:
+                # Smart buffer sizing - read exactly Content-Length, up to 5MB max for safety
+                try:
+                    content_length = int(response.headers.get('Content-Length', 0))
+                except (ValueError, TypeError):
+                    content_length = 0
                 if content_length > 0:
-                    # Read exactly what we need (up to 5MB max for safety)
-                    buffer_size = min(content_length, 5242880)
-                    try:
-                        result = response.read(buffer_size)
-                    except http.client.IncompleteRead as e:
-                        # Handle incomplete read - use partial data if available
-                        control.log(f'IncompleteRead: Expected {buffer_size} bytes, got {len(e.partial)} bytes from {url}', 'warning')
-                        result = e.partial
-                        if not result:
-                            # If no partial data, return None to trigger retry
-                            return None
+                    read_size = expected = min(content_length, 5242880)
                 else:
-                    # Fallback to 5MB default
-                    try:
-                        result = response.read(5242880)
-                    except http.client.IncompleteRead as e:
-                        control.log(f'IncompleteRead: Got {len(e.partial)} bytes from {url}', 'warning')
-                        result = e.partial
-                        if not result:
-                            return None
-            except (ValueError, TypeError):
-                # Fallback if Content-Length is malformed
-                try:
-                    result = response.read(5242880)
-                except http.client.IncompleteRead as e:
-                    control.log(f'IncompleteRead: Got {len(e.partial)} bytes from {url}', 'warning')
-                    result = e.partial
-                    if not result:
-                        return None
+                    read_size = 5242880
+            try:
+                result = response.read(read_size)
+                if len(result) < expected:
+                    # http.client returns a short body instead of raising when the peer closes early
+                    raise http.client.IncompleteRead(result, expected - len(result))
+                break
+            except (http.client.IncompleteRead, OSError) as e:
+                # A truncated body is never handed to the caller, the request is sent again while the policy allows it
+                response.close()
+                delay = retry_state.backoff()
+                if delay is None:
+                    control.log(f'Read failed ({e!r}) from {url}', 'warning')
+                    return None
+                control.log(f'Read failed ({e!r}) from {url}, retry {retry_state.attempt} in {delay:.2f}s', 'warning')
+                _trace_add('wait', _ms(delay))
+                time.sleep(delay)
+                if http_cache:
+                    response = _cached_open(opener, req, int(timeout), http_entry, min_fresh, retry_state)
+                else:
+                    response = _open(opener, req, int(timeout), retry_state)
 
         encoding = None
         text_content = False
 
+        raw_length = len(result)
+        _trace_set('bytes', raw_length)
         if response.headers.get('content-encoding', '').lower() == 'gzip':
             result = gzip.GzipFile(fileobj=io.BytesIO(result)).read()
 
+        if http_cache:
+            _http_cache_store(url, response, raw_length, result, min_fresh)
+
         content_type = response.headers.get('content-type', '').lower()
 
         text_content = any(x in content_type for x in ['text', 'json', 'xml', 'mpegurl'])
@@ -653,7 +1490,7 @@ def request(
         return
 
 
-def get(url, headers=None, timeout=20, verify=True, cookies=None, params=None):
+def get(url, headers=None, timeout=20, verify=True, cookies=None, params=None, stream=False, cache=None, retry=None):
     """
     Requests-like GET method that returns a Response object
 
@@ -664,8 +1501,28 @@ def get(url, headers=None, timeout=20, verify=True, cookies=None, params=None):
         print(response.content)  # As bytes
         print(response.status_code)  # HTTP status
         data = response.json()  # Parse JSON
+
+    With stream=True the body is left on the connection and exposed as response.raw (a StreamingBody),
+    response cookies are not collected in that mode.
+
+    cache=True/False opts in or out of the HTTP response cache (default: hosts in HTTP_CACHE_HOSTS),
+    a number of seconds also keeps the cached response fresh for at least that long.
+    retry=False disables retries, a RetryPolicy replaces the host's entry in RETRY_POLICIES.
     """
-    result = request(url, headers=headers or {}, timeout=timeout, verify=verify, cookie=cookies, params=params, output='extended')
+    if stream:
+        body = request(url, headers=headers or {}, timeout=timeout, verify=verify, cookie=cookies, params=params, output='stream', retry=retry)
+        if body is None:
+            return Response(content=None, status_code=0, url=url)
+        content_type = body.headers.get('Content-Type', '').lower()
+        return Response(
+            content=None,
+            status_code=int(body.status_code or 200),
+            headers={k.title(): v for k, v in body.headers.items()},
+            url=body.url,
+            is_binary=not any(x in content_type for x in ['text', 'json', 'xml', 'html', 'javascript']),
+            raw=body
+        )
+    result = request(url, headers=headers or {}, timeout=timeout, verify=verify, cookie=cookies, params=params, output='extended', cache=cache, retry=retry)
 
     if result and isinstance(result, tuple) and len(result) >= 5:
         content, status_code, response_headers, request_headers, cookie, response_url = result
@@ -961,10 +1818,8 @@ def session_request(url, method='GET', data=None, headers=None, timeout=20, veri
 
 
 def clear_session():
-    """Clear all session cookies and openers"""
-    global _session_cookies, _session_openers
+    """Clear all session cookies"""
     _session_cookies.clear()
-    _session_openers.clear()
     control.log("Session cache cleared")
 
 
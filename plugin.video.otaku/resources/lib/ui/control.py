@@ -557,6 +557,8 @@ def clear_settings(silent=False):
             return
 
     if os.path.exists(dataPath):
+        from resources.lib.ui.database import close_connections
+        close_connections()
         shutil.rmtree(dataPath)
 
     os.mkdir(dataPath)
@@ -627,8 +629,12 @@ class SettingIDs:
         self.showdub = getBool("divflavors.showdub")
         self.watchlist_data = getBool('interface.watchlist.data')
         self.fanart_select = getBool('context.otaku.fanartselect')
+        self.cache_swr = getBool('cache.swr.enabled')
+        self.mappings_memindex = getBool('mappings.memory.index')
+        self.request_trace = getBool('general.request.trace')
 
         # Ints
+        self.cache_swr_maxstale = getInt('cache.swr.maxstale')
 
         # Str
         self.browser_api = getStr('browser.api')
@@ -1,13 +1,36 @@
-import ast
+import copy
 import hashlib
+import os
 import pickle
 import re
+import sys
 import time
 import threading
+import zlib
 import xbmcvfs
 
+from array import array
+from collections import OrderedDict
 from sqlite3 import OperationalError, dbapi2
-from resources.lib.ui import control
+from resources.lib.ui import control, thread_pool
+
+# Per-thread connection pool keyed by (path, thread ident)
+_pool = {}
+_pool_lock = threading.Lock()
+_pool_files = {}
+# Open `with SQL(...)` blocks per connection, and connections dropped from the pool while
+# checked out, which are closed when their last block exits
+_checked_out = {}
+_retired = set()
+_POOL_CACHE_KB = 8192
+
+# In-flight database.get calls keyed by cache key
+_inflight = {}
+_inflight_lock = threading.Lock()
+SINGLE_FLIGHT_TIMEOUT = 60
+
+# Bound parameter count per IN (...) query, below SQLITE_MAX_VARIABLE_NUMBER on old builds
+SQL_CHUNK_SIZE = 500
 
 
 def get(function, duration, *args, **kwargs):
@@ -22,24 +45,119 @@ def get(function, duration, *args, **kwargs):
     key = hash_function(function, args, kwargs)
     if 'key' in kwargs:
         key += kwargs.pop('key')
+    memory_result = memory_cache.get(key, duration)
+    if memory_result:
+        return cache_decode(memory_result[0], memory_result[1])
     cache_result = cache_get(key)
-    if cache_result and is_cache_valid(cache_result['date'], duration):
+    # Rows written by an older format (or unknown codec) are re-fetched below
+    if cache_result and cache_result.get('format') in CACHE_CODECS:
+        if is_cache_valid(cache_result['date'], duration):
+            try:
+                return_data = cache_decode(cache_result['format'], cache_result['value'])
+                memory_cache.put(key, cache_result['format'], cache_result['value'], cache_result['date'])
+                _touch(key, cache_result.get('accessed'))
+                return return_data
+            except Exception:
+                import traceback
+                control.log(traceback.format_exc(), level='error')
+                # Cache is corrupted, invalidate it and fetch fresh data
+                control.log("Cache corrupted for key: %s, fetching fresh data" % key, level='warning')
+        elif control.settingids.cache_swr and is_cache_valid(cache_result['date'], duration + control.settingids.cache_swr_maxstale):
+            # Stale-while-revalidate: serve the expired row now and refresh it in the background
+            try:
+                return_data = cache_decode(cache_result['format'], cache_result['value'])
+            except Exception:
+                control.log("Cache corrupted for key: %s, fetching fresh data" % key, level='warning')
+            else:
+                _revalidate(key, function, args, kwargs, duration)
+                return return_data
+
+    return _single_flight(key, function, args, kwargs, duration)
+
+
+def _revalidate(key, function, args, kwargs, duration):
+    with _inflight_lock:
+        if key in _inflight:
+            return
+
+    def _refresh():
         try:
-            return_data = ast.literal_eval(cache_result['value'])
-            return return_data
-        except:
-            import traceback
-            control.log(traceback.format_exc(), level='error')
-            # Cache is corrupted, invalidate it and fetch fresh data
-            control.log("Cache corrupted for key: %s, fetching fresh data" % key, level='warning')
-            # Don't return None, fall through to fetch fresh data
+            # fan-out done by the refreshed function must not compete with the UI
+            with thread_pool.lane(thread_pool.PRIORITY_BACKGROUND):
+                _single_flight(key, function, args, kwargs, duration)
+        except Exception as e:
+            control.log("Background refresh failed for key: %s (%s)" % (key, e), level='warning')
+
+    # Not a daemon so the refresh still completes after the plugin invocation returns
+    threading.Thread(target=_refresh, name='otaku-cache-refresh').start()
+
 
-    fresh_result = repr(function(*args, **kwargs))
-    cache_insert(key, fresh_result)
-    if not fresh_result:
-        return cache_result if cache_result else fresh_result
-    data = ast.literal_eval(fresh_result)
-    return data
+class _Flight:
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.event = threading.Event()
+        self.result = None
+        self.encoded = None
+        self.error = None
+
+
+def _fetch(key, function, args, kwargs, duration=None):
+    fresh_result = function(*args, **kwargs)
+    encoded = None
+    try:
+        encoded = cache_insert(key, fresh_result, duration)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        control.log("Unable to cache result for key: %s (%s)" % (key, e), level='warning')
+    return fresh_result, encoded
+
+
+def _waiter_error(error):
+    # Every waiter raises its own copy, so they do not all append their frames to the
+    # leader's __traceback__. An exception that cannot be copied is shared as before
+    try:
+        return copy.copy(error)
+    except Exception:
+        return error
+
+
+def _single_flight(key, function, args, kwargs, duration=None):
+    """
+    Coalesces concurrent cache misses so only one thread runs function for a given key.
+
+    Waiting threads receive a decoded copy of the leader's result, or a copy of the leader's
+    exception chained to the original.
+    If the leader takes longer than SINGLE_FLIGHT_TIMEOUT seconds the waiter stops waiting
+    and runs function itself.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        if flight.owner == threading.get_ident():
+            # function re-entered get() with its own key, waiting would deadlock
+            return _fetch(key, function, args, kwargs, duration)[0]
+        if not flight.event.wait(SINGLE_FLIGHT_TIMEOUT):
+            control.log("Timed out waiting on in-flight call for key: %s, executing directly" % key, level='warning')
+            return _fetch(key, function, args, kwargs, duration)[0]
+        if flight.error is not None:
+            raise _waiter_error(flight.error) from flight.error
+        if flight.encoded:
+            return cache_decode(*flight.encoded)
+        return flight.result
+
+    try:
+        flight.result, flight.encoded = _fetch(key, function, args, kwargs, duration)
+        return flight.result
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.event.set()
 
 
 def remove(function, *args, **kwargs):
@@ -69,23 +187,180 @@ def generate_md5(*args):
     return str(md5_hash.hexdigest())
 
 
+def _pickle_dumps(value):
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _zlib_pickle_dumps(value):
+    return zlib.compress(_pickle_dumps(value), CACHE_COMPRESS_LEVEL)
+
+
+def _zlib_pickle_loads(value):
+    return pickle.loads(zlib.decompress(value))
+
+
+# format id -> (encode, decode). Format 0 is the legacy repr()/literal_eval row and is never decoded
+CACHE_FORMAT_PICKLE = 1
+CACHE_FORMAT_PICKLE_ZLIB = 2
+CACHE_CODECS = {
+    CACHE_FORMAT_PICKLE: (_pickle_dumps, pickle.loads),
+    CACHE_FORMAT_PICKLE_ZLIB: (_zlib_pickle_dumps, _zlib_pickle_loads)
+}
+CACHE_COMPRESS_THRESHOLD = 32768
+CACHE_COMPRESS_LEVEL = 1
+
+
+def cache_encode(value):
+    """
+    Serializes a function result for cache.db, compressing payloads above CACHE_COMPRESS_THRESHOLD
+
+    :return: (format id, encoded bytes)
+    """
+    data = _pickle_dumps(value)
+    if len(data) > CACHE_COMPRESS_THRESHOLD:
+        return CACHE_FORMAT_PICKLE_ZLIB, zlib.compress(data, CACHE_COMPRESS_LEVEL)
+    return CACHE_FORMAT_PICKLE, data
+
+
+def cache_decode(format_id, data):
+    return CACHE_CODECS[format_id][1](data)
+
+
+_cache_table_ready = False
+_CACHE_COLUMNS = [('format', 'INTEGER DEFAULT 0'), ('expires', 'INTEGER'), ('accessed', 'INTEGER')]
+CACHE_TOUCH_INTERVAL = 3600
+CACHE_SWEEP_BATCH = 500
+CACHE_EVICT_BATCH = 50
+
+
+def _ensure_cache_table(cursor):
+    global _cache_table_ready
+    if _cache_table_ready:
+        return
+    cursor.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT, value BLOB, date INTEGER, format INTEGER DEFAULT 0, expires INTEGER, accessed INTEGER, UNIQUE(key))')
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS ix_cache ON cache (key)')
+    columns = [row['name'] for row in cursor.execute('PRAGMA table_info(cache)').fetchall()]
+    for column, column_type in _CACHE_COLUMNS:
+        if column not in columns:
+            # Pre-existing rows keep format 0, which marks them as legacy: re-fetched on read, removed by the sweep
+            cursor.execute(f'ALTER TABLE cache ADD COLUMN {column} {column_type}')
+    cursor.execute('CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache (expires)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed)')
+    cursor.connection.commit()
+    _cache_table_ready = True
+
+
 def cache_get(key):
     with SQL(control.cacheFile) as cursor:
+        _ensure_cache_table(cursor)
         cursor.execute('SELECT * FROM cache WHERE key=?', (key,))
         results = cursor.fetchone()
         return results
 
 
-def cache_insert(key, value):
+def cache_insert(key, value, duration=None):
+    """
+    Stores value under key for duration hours. Without a duration the row never expires and only
+    leaves cache.db through cache_remove or size-cap eviction.
+    """
+    now = int(time.time())
+    expires = now + int(duration * 3600) if duration is not None else None
+    format_id, data = cache_encode(value)
+    with SQL(control.cacheFile) as cursor:
+        _ensure_cache_table(cursor)
+        cursor.execute('REPLACE INTO cache (key, value, date, format, expires, accessed) VALUES (?, ?, ?, ?, ?, ?)', (key, data, now, format_id, expires, now))
+        cursor.connection.commit()
+    memory_cache.put(key, format_id, data, now)
+    return format_id, data
+
+
+def _touch(key, accessed):
+    # Access time only feeds size-cap eviction, so it is refreshed at most once per interval
     now = int(time.time())
+    if accessed and now - accessed < CACHE_TOUCH_INTERVAL:
+        return
     with SQL(control.cacheFile) as cursor:
-        cursor.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key))')
-        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS ix_cache ON cache (key)')
-        cursor.execute('REPLACE INTO cache (key, value, date) VALUES (?, ?, ?)', (key, value, now))
+        cursor.execute('UPDATE cache SET accessed=? WHERE key=?', (now, key))
         cursor.connection.commit()
 
 
+def _cache_db_size(cursor):
+    page_size = cursor.execute('PRAGMA page_size').fetchone()['page_size']
+    page_count = cursor.execute('PRAGMA page_count').fetchone()['page_count']
+    freelist = cursor.execute('PRAGMA freelist_count').fetchone()['freelist_count']
+    return (page_count - freelist) * page_size
+
+
+def _enable_incremental_vacuum(cursor):
+    """
+    One-off switch of cache.db to auto_vacuum=INCREMENTAL, which only takes effect after a full VACUUM.
+    The VACUUM rewrites the whole file, so it only runs when no other connection has cache.db open
+    (a WAL database cannot be locked exclusively otherwise) and is otherwise left for the next sweep.
+    """
+    busy_timeout = cursor.execute('PRAGMA busy_timeout').fetchone()['timeout']
+    cursor.execute('PRAGMA busy_timeout=0')
+    cursor.execute('PRAGMA locking_mode=EXCLUSIVE')
+    try:
+        cursor.execute('BEGIN EXCLUSIVE')
+        cursor.connection.commit()
+    except OperationalError:
+        control.log('### Cache sweep: cache.db is in use, auto_vacuum conversion postponed')
+    else:
+        cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        cursor.execute('VACUUM')
+        auto_vacuum = cursor.execute('PRAGMA auto_vacuum').fetchone()['auto_vacuum']
+        if auto_vacuum != 2:
+            control.log(f'### Cache sweep: auto_vacuum is still {auto_vacuum} after VACUUM', level='warning')
+    finally:
+        # the exclusive lock is only given up on the next read in normal locking mode
+        cursor.execute('PRAGMA locking_mode=NORMAL')
+        cursor.execute('SELECT 1 FROM cache LIMIT 1')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout}')
+
+
+def cache_sweep():
+    """
+    Maintenance pass for cache.db, run from the service.
+    Deletes expired and legacy rows in batches, evicts least recently accessed rows while
+    the database is above cache.maxsize, then returns freed pages to the filesystem.
+    """
+    now = int(time.time())
+    grace = control.getInt('cache.swr.maxstale') * 3600 if control.getBool('cache.swr.enabled') else 0
+    max_size = control.getInt('cache.maxsize') * 1048576
+    stats = {'expired': 0, 'evicted': 0}
+    with SQL(control.cacheFile) as cursor:
+        _ensure_cache_table(cursor)
+        if cursor.execute('PRAGMA auto_vacuum').fetchone()['auto_vacuum'] != 2:
+            _enable_incremental_vacuum(cursor)
+        size_before = _cache_db_size(cursor)
+
+        while True:
+            cursor.execute('DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache WHERE expires < ? OR format=0 LIMIT ?)',
+                           (now - grace, CACHE_SWEEP_BATCH))
+            cursor.connection.commit()
+            stats['expired'] += cursor.rowcount
+            if cursor.rowcount < CACHE_SWEEP_BATCH:
+                break
+
+        while max_size and _cache_db_size(cursor) > max_size:
+            cursor.execute('DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY accessed LIMIT ?)', (CACHE_EVICT_BATCH,))
+            cursor.connection.commit()
+            stats['evicted'] += cursor.rowcount
+            if cursor.rowcount == 0:
+                break
+
+        cursor.execute('PRAGMA incremental_vacuum')
+        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        stats['rows'] = cursor.execute('SELECT COUNT(*) AS rows FROM cache').fetchone()['rows']
+        stats['size_before'] = size_before
+        stats['size_after'] = _cache_db_size(cursor)
+    memory_cache.clear()
+    control.log(f"### Cache sweep: {stats}")
+    return stats
+
+
 def cache_remove(key):
+    memory_cache.pop(key)
     with SQL(control.cacheFile) as cursor:
         cursor.execute('DELETE FROM cache WHERE key = ?', (key,))
         cursor.connection.commit()
@@ -93,11 +368,14 @@ def cache_remove(key):
 
 
 def cache_clear():
+    global _cache_table_ready
+    memory_cache.clear()
     with SQL(control.cacheFile) as cursor:
         cursor.execute("DROP TABLE IF EXISTS cache")
         cursor.execute("VACUUM")
         cursor.connection.commit()
-        cursor.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT, value TEXT, date INTEGER, UNIQUE(key))')
+        _cache_table_ready = False
+        _ensure_cache_table(cursor)
         control.notify(f'{control.ADDON_NAME}: {control.lang(30086)}', control.lang(30087), time=5000, sound=False)
 
 
@@ -107,31 +385,110 @@ def is_cache_valid(cached_time, cache_timeout):
     return (cache_timeout * 3600) > diff
 
 
+class MemoryCache:
+    """
+    Size bounded LRU tier in front of cache.db.
+    Entries hold the encoded payload so every hit decodes a private copy, and
+    the module level instance survives between invocations under reuselanguageinvoker.
+    """
+    def __init__(self, max_bytes=16777216, max_entries=2048):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, duration=None):
+        # An entry older than duration hours is left in place for the disk tier's stale handling
+        # but counts as a miss, so the stats show what was actually served from memory
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (duration is not None and not is_cache_valid(entry[2], duration)):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, format_id, data, date):
+        if len(data) > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.size -= len(old[1])
+            self._entries[key] = (format_id, data, date)
+            self.size += len(data)
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted[1])
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.size -= len(old[1])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+memory_cache = MemoryCache()
+
+
+def _replace_without_foreign_keys(cursor, query, params):
+    # REPLACE deletes the old row first, which would cascade into the child tables.
+    # The pragma is a no-op inside a transaction, so it is only switched back on after
+    # the commit (or rollback), otherwise the pooled connection would keep it off.
+    cursor.execute('PRAGMA foreign_keys=OFF')
+    try:
+        cursor.execute(query, params)
+        cursor.connection.commit()
+    finally:
+        if cursor.connection.in_transaction:
+            cursor.connection.rollback()
+        cursor.execute('PRAGMA foreign_keys=ON')
+
+
 def update_show(mal_id, kodi_meta, anime_schedule_route=''):
+    _invalidate_prefetch(mal_id, 'shows')
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('PRAGMA foreign_keys=OFF')
-        cursor.execute('REPLACE INTO shows (mal_id, kodi_meta, anime_schedule_route) VALUES (?, ?, ?)', (mal_id, kodi_meta, anime_schedule_route))
-        cursor.execute('PRAGMA foreign_keys=ON')
-        cursor.connection.commit()
+        _replace_without_foreign_keys(cursor, 'REPLACE INTO shows (mal_id, kodi_meta, anime_schedule_route) VALUES (?, ?, ?)', (mal_id, kodi_meta, anime_schedule_route))
 
 
 def update_show_meta(mal_id, meta_ids, art):
+    _invalidate_prefetch(mal_id, 'shows_meta')
     meta_ids = pickle.dumps(meta_ids)
     art = pickle.dumps(art)
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('PRAGMA foreign_keys=OFF')
-        cursor.execute("REPLACE INTO shows_meta (mal_id, meta_ids, art) VALUES (?, ?, ?)", (mal_id, meta_ids, art))
-        cursor.execute('PRAGMA foreign_keys=ON')
-        cursor.connection.commit()
+        _replace_without_foreign_keys(cursor, "REPLACE INTO shows_meta (mal_id, meta_ids, art) VALUES (?, ?, ?)", (mal_id, meta_ids, art))
 
 
 def add_mapping_id(mal_id, column, value):
+    _invalidate_prefetch(mal_id, 'shows')
     with SQL(control.malSyncDB) as cursor:
         cursor.execute('UPDATE shows SET %s=? WHERE mal_id=?' % column, (value, mal_id))
         cursor.connection.commit()
 
 
 def update_kodi_meta(mal_id, kodi_meta):
+    _invalidate_prefetch(mal_id, 'shows')
     kodi_meta = pickle.dumps(kodi_meta)
     with SQL(control.malSyncDB) as cursor:
         cursor.execute('UPDATE shows SET kodi_meta=? WHERE mal_id=?', (kodi_meta, mal_id))
@@ -141,18 +498,60 @@ def update_kodi_meta(mal_id, kodi_meta):
 def update_show_data(mal_id, data, last_updated=''):
     data = pickle.dumps(data)
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('PRAGMA foreign_keys=OFF')
-        cursor.execute("REPLACE INTO show_data (mal_id, data, last_updated) VALUES (?, ?, ?)", (mal_id, data, last_updated))
-        cursor.execute('PRAGMA foreign_keys=ON')
-        cursor.connection.commit()
+        _replace_without_foreign_keys(cursor, "REPLACE INTO show_data (mal_id, data, last_updated) VALUES (?, ?, ?)", (mal_id, data, last_updated))
 
 
 def update_episode(mal_id, season, number, update_time, kodi_meta, filler='', anidb_ep_id=''):
+    row = (mal_id, season, kodi_meta, update_time, number, filler, anidb_ep_id)
+    with _episode_batch_lock:
+        batch = _episode_batches.get(str(mal_id))
+        if batch is not None:
+            batch['rows'].append(row)
+            return
+    update_episodes([row])
+
+
+def update_episodes(rows):
+    """Writes (mal_id, season, kodi_meta, last_updated, number, filler, anidb_ep_id) rows in one transaction."""
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('REPLACE INTO episodes (mal_id, season, kodi_meta, last_updated, number, filler, anidb_ep_id) VALUES (?, ?, ?, ?, ?, ?, ?)', (mal_id, season, kodi_meta, update_time, number, filler, anidb_ep_id))
+        cursor.executemany('REPLACE INTO episodes (mal_id, season, kodi_meta, last_updated, number, filler, anidb_ep_id) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
         cursor.connection.commit()
 
 
+_episode_batches = {}
+_episode_batch_lock = threading.Lock()
+
+
+class episode_batch:
+    """
+    Collects the update_episode calls made for a show while the block is active and writes them
+    with a single executemany/commit on exit. The batch is shared by every thread, so rows added
+    from parallel_process workers are included; nested blocks for the same show flush once.
+
+    Usage:
+        with database.episode_batch(mal_id):
+            all_results = utils.parallel_process(result_ep, mapfunc, max_workers=8)
+    """
+    def __init__(self, mal_id):
+        self.mal_id = str(mal_id)
+
+    def __enter__(self):
+        with _episode_batch_lock:
+            batch = _episode_batches.setdefault(self.mal_id, {'rows': [], 'depth': 0})
+            batch['depth'] += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with _episode_batch_lock:
+            batch = _episode_batches[self.mal_id]
+            batch['depth'] -= 1
+            if batch['depth']:
+                return
+            del _episode_batches[self.mal_id]
+        if batch['rows']:
+            update_episodes(batch['rows'])
+
+
 def update_episode_column(mal_id, episode, column, value):
     with SQL(control.malSyncDB) as cursor:
         cursor.execute('UPDATE episodes SET %s=? WHERE mal_id=? AND number=?' % column, (value, mal_id, episode))
@@ -185,20 +584,59 @@ def get_episode(mal_id, episode=None):
 
 
 def get_show(mal_id):
+    if (show := _prefetched('shows', mal_id)) is not _MISSING:
+        return show
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('SELECT * FROM shows WHERE mal_id IN (%s)' % mal_id)
+        cursor.execute('SELECT * FROM shows WHERE mal_id=?', (mal_id,))
         shows = cursor.fetchone()
         return shows
 
 
 def get_show_meta(mal_id):
+    if (show_meta := _prefetched('shows_meta', mal_id)) is not _MISSING:
+        return show_meta
     with SQL(control.malSyncDB) as cursor:
-        cursor.execute('SELECT * FROM shows_meta WHERE mal_id IN (%s)' % mal_id)
+        cursor.execute('SELECT * FROM shows_meta WHERE mal_id=?', (mal_id,))
         shows = cursor.fetchone()
         return shows
 
 
+def _chunks(ids):
+    ids = list(dict.fromkeys(i for i in ids if i is not None and i != ''))
+    for i in range(0, len(ids), SQL_CHUNK_SIZE):
+        yield ids[i:i + SQL_CHUNK_SIZE]
+
+
+def _get_rows_by_mal_id(table, mal_ids):
+    rows = {}
+    with SQL(control.malSyncDB) as cursor:
+        for chunk in _chunks(mal_ids):
+            cursor.execute(f'SELECT * FROM {table} WHERE mal_id IN ({", ".join("?" * len(chunk))})', chunk)
+            for row in cursor.fetchall():
+                rows[str(row['mal_id'])] = row
+    return rows
+
+
+def get_shows(mal_ids):
+    """
+    Bulk version of get_show
+
+    :return: dict of str(mal_id) -> shows row, ids without a row are left out
+    """
+    return _get_rows_by_mal_id('shows', mal_ids)
+
+
+def get_show_metas(mal_ids):
+    """
+    Bulk version of get_show_meta
+
+    :return: dict of str(mal_id) -> shows_meta row, ids without a row are left out
+    """
+    return _get_rows_by_mal_id('shows_meta', mal_ids)
+
+
 def remove_from_database(table, mal_id):
+    _invalidate_prefetch(mal_id, table)
     with SQL(control.malSyncDB) as cursor:
         cursor.execute(f"DELETE FROM {table} WHERE mal_id=?", (mal_id,))
         cursor.connection.commit()
@@ -212,6 +650,8 @@ def get_info(api_name):
 
 
 def get_mal_ids(anime_id, send_id):
+    if (index := mapping_index()) is not None and index.has_column(send_id):
+        return _get_mappings_by_rowid(index.rowids_for(anime_id, send_id))
     with SQL(control.mappingDB) as cursor:
         cursor.execute(f'SELECT * FROM anime WHERE {send_id}=?', (anime_id,))
         mappings = cursor.fetchall()
@@ -219,33 +659,335 @@ def get_mal_ids(anime_id, send_id):
 
 
 def get_mappings(anime_id, send_id):
+    if (index := mapping_index()) is not None and index.has_column(send_id):
+        mappings = _get_mappings_by_rowid(index.rowids_for(anime_id, send_id)[:1])
+        return mappings[0] if mappings else {}
     with SQL(control.mappingDB) as cursor:
         cursor.execute(f'SELECT * FROM anime WHERE {send_id}=?', (anime_id,))
         mappings = cursor.fetchall()
         return mappings[0] if mappings else {}
 
 
+def _get_mappings_by_rowid(rowids):
+    if not rowids:
+        return []
+    with SQL(control.mappingDB) as cursor:
+        cursor.execute(f'SELECT * FROM anime WHERE rowid IN ({", ".join("?" * len(rowids))}) ORDER BY rowid', rowids)
+        return cursor.fetchall()
+
+
+_UNIQUE_ID_COLUMNS = 'mal_id, mal_dub_id, anilist_id, kitsu_id, anidb_id, simkl_id, thetvdb_id, themoviedb_id, imdb_id, trakt_id'
+
+
+def _unique_ids_dict(mappings):
+    return {
+        'mal_id': mappings.get('mal_id'),
+        'mal_dub_id': mappings.get('mal_dub_id'),
+        'anilist_id': mappings.get('anilist_id'),
+        'kitsu_id': mappings.get('kitsu_id'),
+        'anidb': mappings.get('anidb_id'),
+        'simkl': mappings.get('simkl_id'),
+        'tvdb': mappings.get('thetvdb_id'),
+        'tmdb': mappings.get('themoviedb_id'),
+        'imdb': mappings.get('imdb_id'),
+        'trakt': mappings.get('trakt_id')
+    }
+
+
 def get_unique_ids(anime_id, send_id):
+    if (unique_ids := _prefetched(send_id, anime_id)) is not _MISSING:
+        return dict(unique_ids)
+    if (index := mapping_index()) is not None and index.has_column(send_id):
+        return index.unique_ids(anime_id, send_id)
     with SQL(control.mappingDB) as cursor:
-        cursor.execute(f'SELECT mal_id, mal_dub_id, anilist_id, kitsu_id, anidb_id, simkl_id, thetvdb_id, themoviedb_id, imdb_id, trakt_id FROM anime WHERE {send_id}=?', (anime_id,))
+        cursor.execute(f'SELECT {_UNIQUE_ID_COLUMNS} FROM anime WHERE {send_id}=?', (anime_id,))
         mappings = cursor.fetchone()
         if mappings:
-            mappings_dict = {
-                'mal_id': mappings.get('mal_id'),
-                'mal_dub_id': mappings.get('mal_dub_id'),
-                'anilist_id': mappings.get('anilist_id'),
-                'kitsu_id': mappings.get('kitsu_id'),
-                'anidb': mappings.get('anidb_id'),
-                'simkl': mappings.get('simkl_id'),
-                'tvdb': mappings.get('thetvdb_id'),
-                'tmdb': mappings.get('themoviedb_id'),
-                'imdb': mappings.get('imdb_id'),
-                'trakt': mappings.get('trakt_id')
-            }
-            return mappings_dict
+            return _unique_ids_dict(mappings)
         return {}
 
 
+def get_unique_ids_many(anime_ids, send_id):
+    """
+    Bulk version of get_unique_ids
+
+    :return: dict of str(anime_id) -> unique ids dict, ids without a mapping are left out
+    """
+    if (index := mapping_index()) is not None and index.has_column(send_id):
+        return {str(i): ids for i in set(anime_ids) if (ids := index.unique_ids(i, send_id))}
+    unique_ids = {}
+    columns = _UNIQUE_ID_COLUMNS if send_id in _UNIQUE_ID_COLUMNS.split(', ') else f'{_UNIQUE_ID_COLUMNS}, {send_id}'
+    with SQL(control.mappingDB) as cursor:
+        for chunk in _chunks(anime_ids):
+            cursor.execute(f'SELECT {columns} FROM anime WHERE {send_id} IN ({", ".join("?" * len(chunk))})', chunk)
+            for mappings in cursor.fetchall():
+                unique_ids.setdefault(str(mappings[send_id]), _unique_ids_dict(mappings))
+    return unique_ids
+
+
+def prepare_mappings_db(path):
+    """
+    Post-processes a freshly downloaded mappings database before it is swapped in: checks that it is
+    a readable sqlite file with a populated anime table, indexes every id column we look up by and
+    refreshes the planner statistics.
+
+    :return: True if the file is usable
+    """
+    conn = dbapi2.connect(path)
+    try:
+        if conn.execute('PRAGMA quick_check').fetchone()[0] != 'ok':
+            control.log('mappings.db failed quick_check', 'warning')
+            return False
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(anime)')}
+        if 'mal_id' not in columns or not conn.execute('SELECT 1 FROM anime LIMIT 1').fetchone():
+            control.log('mappings.db has no anime mappings', 'warning')
+            return False
+        for column in _UNIQUE_ID_COLUMNS.split(', '):
+            if column in columns:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS ix_anime_{column} ON anime ({column})')
+        conn.execute('ANALYZE')
+        conn.commit()
+        return True
+    except dbapi2.DatabaseError as e:
+        control.log(f'mappings.db is not a valid database: {e}', 'warning')
+        return False
+    finally:
+        conn.close()
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class MappingIndex:
+    """
+    Compact in-memory copy of the id columns of mappings.db.
+
+    Every id column is held as an array('q') (or a list when the column is not purely integer)
+    indexed by row position, and a value -> row position dict is built the first time a column
+    is looked up by, so get_unique_ids is answered without touching sqlite.
+    """
+    def __init__(self, path, signature=None):
+        t0 = time.perf_counter()
+        self.signature = signature
+        self._lock = threading.Lock()
+        self._lookups = {}
+        conn = dbapi2.connect(path)
+        try:
+            present = {row[1] for row in conn.execute('PRAGMA table_info(anime)')}
+            self.column_names = [c for c in _UNIQUE_ID_COLUMNS.split(', ') if c in present]
+            rows = conn.execute(f'SELECT rowid, {", ".join(self.column_names)} FROM anime ORDER BY rowid').fetchall()
+        finally:
+            conn.close()
+        self.rowids = array('q', (row[0] for row in rows))
+        self.columns = {}
+        for pos, name in enumerate(self.column_names, 1):
+            values = [row[pos] for row in rows]
+            if all(v is None or (type(v) is int and v >= 0) for v in values):
+                # ids are never negative, -1 stands in for NULL
+                self.columns[name] = array('q', (-1 if v is None else v for v in values))
+            else:
+                self.columns[name] = values
+        self.build_ms = (time.perf_counter() - t0) * 1000
+        control.log(f'Mapping index: {len(self.rowids)} rows in {self.build_ms:.0f} ms, {self.size() // 1024} KB', 'info')
+
+    def has_column(self, column):
+        return column in self.columns
+
+    @staticmethod
+    def _key(column_values, value):
+        if isinstance(column_values, array):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        return str(value)
+
+    def _lookup(self, column):
+        lookup = self._lookups.get(column)
+        if lookup is None:
+            with self._lock:
+                lookup = self._lookups.get(column)
+                if lookup is None:
+                    values = self.columns[column]
+                    lookup = {}
+                    is_array = isinstance(values, array)
+                    for pos, value in enumerate(values):
+                        if value is not None and value != -1:
+                            lookup.setdefault(value if is_array else str(value), []).append(pos)
+                    # most ids map to a single row, keep those as bare ints
+                    lookup = {k: v[0] if len(v) == 1 else tuple(v) for k, v in lookup.items()}
+                    self._lookups[column] = lookup
+        return lookup
+
+    def positions(self, value, column):
+        key = self._key(self.columns[column], value)
+        pos = self._lookup(column).get(key)
+        if pos is None:
+            return ()
+        return (pos,) if isinstance(pos, int) else pos
+
+    def rowids_for(self, value, column):
+        return [self.rowids[pos] for pos in self.positions(value, column)]
+
+    def unique_ids(self, value, column):
+        positions = self.positions(value, column)
+        if not positions:
+            return {}
+        mappings = {name: None if (v := values[positions[0]]) == -1 else v for name, values in self.columns.items()}
+        return _unique_ids_dict(mappings)
+
+    def size(self):
+        total = sys.getsizeof(self.rowids)
+        for values in self.columns.values():
+            total += sys.getsizeof(values)
+            if not isinstance(values, array):
+                total += sum(sys.getsizeof(v) for v in values if v is not None)
+        for lookup in list(self._lookups.values()):
+            total += sys.getsizeof(lookup)
+        return total
+
+    def stats(self):
+        return {
+            'rows': len(self.rowids),
+            'build_ms': round(self.build_ms),
+            'bytes': self.size(),
+            'indexed': sorted(self._lookups)
+        }
+
+
+_mapping_index = None
+_mapping_index_lock = threading.Lock()
+# [checked_at, signature] of mappings.db, it only changes when the service swaps the file
+_mappings_checked = [0, None]
+MAPPINGS_CHECK_INTERVAL = 30
+
+
+def _mappings_signature():
+    now = time.monotonic()
+    if now - _mappings_checked[0] > MAPPINGS_CHECK_INTERVAL:
+        _mappings_checked[1] = _file_signature(control.mappingDB)
+        _mappings_checked[0] = now
+    return _mappings_checked[1]
+
+
+def mapping_index():
+    """
+    Returns the shared MappingIndex when the in-memory mapping index is enabled, building it on first
+    use and rebuilding it once mappings.db has been replaced by update_mappings_db.
+    """
+    global _mapping_index
+    if not control.settingids.mappings_memindex:
+        return None
+    signature = _mappings_signature()
+    if signature is None:
+        return None
+    index = _mapping_index
+    if index is not None and index.signature == signature:
+        return index
+    with _mapping_index_lock:
+        if _mapping_index is None or _mapping_index.signature != signature:
+            try:
+                _mapping_index = MappingIndex(control.mappingDB, signature)
+            except dbapi2.DatabaseError as e:
+                control.log(f'Unable to build mapping index: {e}', 'warning')
+                return None
+        return _mapping_index
+
+
+def invalidate_mapping_index():
+    global _mapping_index
+    _mapping_index = None
+    _mappings_checked[0] = 0
+
+
+def mapping_index_stats():
+    index = _mapping_index
+    return index.stats() if index is not None else None
+
+
+_MISSING = object()
+_prefetch_local = threading.local()
+# Every active prefetch block, so a write from any thread drops the id wherever it was prefetched
+_prefetch_active = set()
+_prefetch_lock = threading.Lock()
+
+
+class prefetch:
+    """
+    Loads the shows, shows_meta and mapping rows for a page of items in one query per table.
+    While the block is active, get_show, get_show_meta and get_unique_ids called from the thread
+    that entered it are answered from the prefetched rows, so the page has to be mapped on that
+    thread; pool workers read the database as usual. Writes through this module from any thread
+    drop the affected ids from every active block.
+
+    Usage:
+        with database.prefetch(mal_ids, anilist_id=anilist_ids):
+            all_results = list(map(mapfunc, res))
+    """
+    def __init__(self, mal_ids, shows=True, **ids):
+        self.mal_ids = [str(i) for i in mal_ids if i]
+        self.shows = shows
+        # mappings column (send_id) -> ids to resolve, mal_id is always included
+        self.ids = dict(ids, mal_id=self.mal_ids)
+        self.tables = {}
+        # (table, id) written while the rows were being loaded
+        self.dropped = set()
+
+    def __enter__(self):
+        # Registered before loading, so a write that lands while the rows are read is not served stale
+        with _prefetch_lock:
+            _prefetch_active.add(self)
+        try:
+            tables = {}
+            if self.shows:
+                rows = get_shows(self.mal_ids)
+                tables['shows'] = {i: rows.get(i) for i in self.mal_ids}
+                rows = get_show_metas(self.mal_ids)
+                tables['shows_meta'] = {i: rows.get(i) for i in self.mal_ids}
+            for send_id, ids in self.ids.items():
+                ids = [str(i) for i in ids if i]
+                rows = get_unique_ids_many(ids, send_id)
+                tables[send_id] = {i: rows.get(i, {}) for i in ids}
+        except BaseException:
+            with _prefetch_lock:
+                _prefetch_active.discard(self)
+            raise
+        with _prefetch_lock:
+            for table, item_id in self.dropped:
+                tables.get(table, {}).pop(item_id, None)
+            self.tables = tables
+        self.previous = getattr(_prefetch_local, 'store', None)
+        _prefetch_local.store = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _prefetch_local.store = self.previous
+        with _prefetch_lock:
+            _prefetch_active.discard(self)
+
+
+def _prefetched(table, item_id):
+    store = getattr(_prefetch_local, 'store', None)
+    if store is not None:
+        with _prefetch_lock:
+            if table in store.tables:
+                return store.tables[table].get(str(item_id), _MISSING)
+    return _MISSING
+
+
+def _invalidate_prefetch(mal_id, *tables):
+    with _prefetch_lock:
+        for store in _prefetch_active:
+            for table in tables:
+                store.dropped.add((table, str(mal_id)))
+                store.tables.get(table, {}).pop(str(mal_id), None)
+
+
 def ensure_tables_and_indexes(cursor):
     tables = ['anime', 'movie', 'tv_show', 'tv_short', 'special', 'ova', 'ona', 'music']
     for table in tables:
@@ -319,25 +1061,127 @@ def dict_factory(cursor, row):
     return d
 
 
+def _open_connection(path, timeout):
+    xbmcvfs.mkdir(control.dataPath)
+    conn = dbapi2.connect(path, timeout=timeout, check_same_thread=False)
+    conn.row_factory = dict_factory
+    # info.db ships with context.otaku and mappings.db is swapped out wholesale by the service,
+    # so only the databases we own are switched to WAL
+    if path not in (control.infoDB, control.mappingDB):
+        conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-%s' % _POOL_CACHE_KB)
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA FOREIGN_KEYS=1')
+    return conn
+
+
+def get_connection(path, timeout=60):
+    """
+    Returns the pooled connection for the calling thread, opening it on first use.
+    Connections live for the life of the interpreter, so they are reused across
+    invocations when reuselanguageinvoker is enabled.
+    """
+    key = (path, threading.get_ident())
+    conn = _pool.get(key)
+    if conn is not None and path == control.mappingDB and _pool_files.get(key) != _mappings_signature():
+        # the service process replaces mappings.db with os.replace, a pooled connection
+        # would keep reading the old file
+        with _pool_lock:
+            _pool.pop(key, None)
+            _pool_files.pop(key, None)
+            _discard(conn)
+        conn = None
+    if conn is None:
+        conn = _open_connection(path, timeout)
+        with _pool_lock:
+            _prune_pool()
+            _pool[key] = conn
+            if path == control.mappingDB:
+                _pool_files[key] = _mappings_signature()
+    return conn
+
+
+def _checkout(path, timeout):
+    # close_connections may drop the connection between get_connection and the checkout,
+    # in which case the next call opens a fresh one
+    key = (path, threading.get_ident())
+    while True:
+        conn = get_connection(path, timeout)
+        with _pool_lock:
+            if _pool.get(key) is conn:
+                _checked_out[conn] = _checked_out.get(conn, 0) + 1
+                return conn
+
+
+def _release(conn):
+    with _pool_lock:
+        depth = _checked_out.pop(conn) - 1
+        if depth:
+            _checked_out[conn] = depth
+        elif conn in _retired:
+            _retired.discard(conn)
+            conn.close()
+
+
+def _discard(conn):
+    # Called under _pool_lock with conn already out of the pool
+    if conn in _checked_out:
+        _retired.add(conn)
+    else:
+        conn.close()
+
+
+def _prune_pool():
+    # Drop connections owned by threads that have exited (executor workers, provider threads)
+    alive = {t.ident for t in threading.enumerate()}
+    for key in [k for k in _pool if k[1] not in alive]:
+        try:
+            _pool_files.pop(key, None)
+            _pool.pop(key).close()
+        except Exception:
+            pass
+
+
+def close_connections(path=None):
+    """
+    Closes pooled connections for path, or every pooled connection if path is None.
+    Must be called before a database file is deleted, truncated or replaced.
+    A connection another thread is using inside `with SQL(...)` is only dropped from the pool
+    and closed when that block exits, so the block finishes against the file it opened.
+    """
+    global _cache_table_ready
+    with _pool_lock:
+        if path is None or path == control.cacheFile:
+            # the file may be gone by the next open, so the schema has to be checked again
+            _cache_table_ready = False
+        for key in [k for k in _pool if path is None or k[0] == path]:
+            try:
+                _pool_files.pop(key, None)
+                _discard(_pool.pop(key))
+            except Exception:
+                pass
+
+
 class SQL:
     def __init__(self, path, timeout=60):
-        self.lock = threading.Lock()
         self.path = path
         self.timeout = timeout
 
     def __enter__(self):
-        self.lock.acquire()
-        xbmcvfs.mkdir(control.dataPath)
-        conn = dbapi2.connect(self.path, timeout=self.timeout)
-        conn.row_factory = dict_factory
-        conn.execute("PRAGMA FOREIGN_KEYS=1")
-        self.cursor = conn.cursor()
+        self.cursor = _checkout(self.path, self.timeout).cursor()
         return self.cursor
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.cursor.close()
-        if self.lock.locked():
-            self.lock.release()
+        conn = self.cursor.connection
+        try:
+            self.cursor.close()
+            # The connection outlives this block, so discard anything left uncommitted
+            # exactly as closing a fresh connection used to
+            if conn.in_transaction:
+                conn.rollback()
+        finally:
+            _release(conn)
         if exc_type:
             import traceback
             control.log('database error', level='error')
@@ -1,6 +1,8 @@
+import os
+
 from resources.lib.ui import control
 from sqlite3 import version
-from resources.lib.ui.database import SQL
+from resources.lib.ui.database import SQL, close_connections
 
 sqlite_version = version
 
@@ -171,8 +173,12 @@ class SyncDatabase:
         service.update_mappings_db()
         service.update_dub_json()
 
+        close_connections(control.malSyncDB)
         with open(control.malSyncDB, 'w'):
             pass
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(control.malSyncDB + suffix):
+                os.remove(control.malSyncDB + suffix)
 
         self.build_sync_activities()
         self.build_show_table()
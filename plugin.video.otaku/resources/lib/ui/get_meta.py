@@ -1,8 +1,7 @@
-import concurrent.futures
 import random
 
 from resources.lib.endpoints import fanart, tmdb, tvdb
-from resources.lib.ui import database, control
+from resources.lib.ui import database, control, thread_pool
 
 
 def collect_meta(anime_list):
@@ -28,7 +27,7 @@ def collect_meta(anime_list):
                 mtype = 'tv'
             anime_to_fetch.append((mal_id, mtype))
 
-    # Fetch metadata in parallel with controlled thread pool (max 8 workers)
+    # Fetch metadata in parallel on the shared pool's background lane (max 8 workers)
     if anime_to_fetch:
         # Fetch AniList banners in batch if enabled
         banner_map = {}
@@ -38,10 +37,13 @@ def collect_meta(anime_list):
             anilist = Anilist()
             banner_map = anilist.get_banners_batch(mal_ids)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            futures = [executor.submit(update_meta, mal_id, mtype, banner_map.get(mal_id)) for mal_id, mtype in anime_to_fetch]
-            # Wait for all to complete
-            concurrent.futures.wait(futures)
+        def fetch(item):
+            try:
+                update_meta(item[0], item[1], banner_map.get(item[0]))
+            except Exception as e:
+                control.log(f"Meta update failed for {item[0]}: {str(e)}")
+
+        thread_pool.pool.map(fetch, anime_to_fetch, max_workers=8, priority=thread_pool.PRIORITY_BACKGROUND)
 
 
 def update_meta(mal_id, mtype='tv', anilist_banner=None):
@@ -104,29 +106,13 @@ def update_meta(mal_id, mtype='tv', anilist_banner=None):
     tvdb_art = {}
 
     if artwork_preference == 0:  # Fanart-TV only
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            fanart_future = executor.submit(fetch_fanart)
-            fanart_art = fanart_future.result()
+        fanart_art = fetch_fanart()
     elif artwork_preference == 1:  # TMDb only
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            tmdb_future = executor.submit(fetch_tmdb)
-            tmdb_art = tmdb_future.result()
+        tmdb_art = fetch_tmdb()
     elif artwork_preference == 2:  # TVDB only
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            tvdb_future = executor.submit(fetch_tvdb)
-            tvdb_art = tvdb_future.result()
+        tvdb_art = fetch_tvdb()
     else:  # All providers (3 or default)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            fanart_future = executor.submit(fetch_fanart)
-            tmdb_future = executor.submit(fetch_tmdb)
-            tvdb_future = executor.submit(fetch_tvdb)
-
-            # Wait for all to complete
-            concurrent.futures.wait([fanart_future, tmdb_future, tvdb_future])
-
-            fanart_art = fanart_future.result()
-            tmdb_art = tmdb_future.result()
-            tvdb_art = tvdb_future.result()
+        fanart_art, tmdb_art, tvdb_art = thread_pool.pool.run(fetch_fanart, fetch_tmdb, fetch_tvdb, priority=thread_pool.PRIORITY_BACKGROUND)
 
     # Combine art from providers with settings applied
     combined_art = merge_artwork(
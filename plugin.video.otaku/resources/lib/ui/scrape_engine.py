@@ -0,0 +1,196 @@
+import asyncio
+import concurrent.futures
+import functools
+import queue
+import threading
+import time
+
+from resources.lib.ui import client, control
+
+# Blocking calls (HTTP through ui.client, BeautifulSoup, debrid checks) in flight at once across every provider
+MAX_CONCURRENCY = 16
+# Unconverted sync providers running at once across every engine
+SYNC_PROVIDER_WORKERS = 32
+
+# Engine per running event loop, so the module level helpers below find the engine of the calling coroutine
+_engines = {}
+_engines_lock = threading.Lock()
+
+# The sync provider a thread is running and the engine that started it, for run_sync
+_local = threading.local()
+
+# (io, sync provider) executors shared by every engine for the life of the interpreter, so back to back and
+# concurrent scrapes stay within one thread bound instead of each leaving its own pools behind
+_executors = None
+
+
+def _shared_executors():
+    global _executors
+    with _engines_lock:
+        if _executors is None:
+            _executors = (
+                concurrent.futures.ThreadPoolExecutor(MAX_CONCURRENCY, thread_name_prefix='otaku-io'),
+                concurrent.futures.ThreadPoolExecutor(SYNC_PROVIDER_WORKERS, thread_name_prefix='otaku-provider')
+            )
+        return _executors
+
+
+class Engine:
+    """
+    asyncio fan-out for provider scraping.
+    One event loop runs on a background thread for the lifetime of the engine. Async providers are
+    coroutines on that loop and do their blocking work through fetch/request/run_blocking, which
+    share one process wide executor behind the engine's semaphore. Unconverted sync providers run
+    through the sync adapter on a separate shared executor, so they never hold a slot the coroutines need. Every job has a
+    deadline and its outcome is queued as soon as it finishes.
+
+    Usage:
+        with Engine() as engine:
+            engine.submit('nyaa', nyaa_worker, query, deadline=30)
+            for name, result, error in engine.as_completed(timeout=30):
+                ...
+    """
+    def __init__(self, max_concurrency=MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.pending = set()
+        self._results = queue.Queue()
+        self._io_executor, self._sync_executor = _shared_executors()
+        self.loop = asyncio.new_event_loop()
+        self._semaphore = None
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), name='otaku-scrape-loop', daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        with _engines_lock:
+            _engines[self.loop] = self
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            with _engines_lock:
+                _engines.pop(self.loop, None)
+            # Cancel what is left so threads blocked in run()/run_sync get an answer instead of waiting forever
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Job submission, callable from any thread
+    def submit(self, name, job, *args, deadline=None, **kwargs):
+        """Schedules job(*args, **kwargs), a coroutine function or a plain function run through the sync adapter"""
+        self.pending.add(name)
+        asyncio.run_coroutine_threadsafe(self._run_job(name, job, args, kwargs, deadline), self.loop)
+
+    async def _run_job(self, name, job, args, kwargs, deadline):
+        start = time.perf_counter()
+        if asyncio.iscoroutinefunction(job):
+            task = job(*args, **kwargs)
+        else:
+            task = self.loop.run_in_executor(self._sync_executor, functools.partial(self._run_sync_job, job, args, kwargs))
+        try:
+            result = await asyncio.wait_for(task, deadline)
+            error = None
+        except asyncio.TimeoutError:
+            # A sync job keeps running on its thread, only its result is dropped
+            result, error = None, 'timeout'
+        except Exception as e:
+            control.log(f'{name} failed: {e!r}', 'warning')
+            result, error = None, e
+        control.log(f'{name} finished in {time.perf_counter() - start:.2f}s{f" ({error})" if error else ""}')
+        self.pending.discard(name)
+        self._results.put((name, result, error))
+
+    def next_result(self, timeout=None):
+        """The next (name, result, error) to finish, or None when nothing finished within timeout"""
+        try:
+            return self._results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def as_completed(self, timeout=None):
+        """Yields (name, result, error) as jobs finish until all are done or timeout passes"""
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.pending or not self._results.empty():
+            remaining = None if end is None else end - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return
+            item = self.next_result(remaining)
+            if item is None:
+                return
+            yield item
+
+    def _run_sync_job(self, job, args, kwargs):
+        # run_sync calls made by the provider go back to this engine, not to another scrape's
+        _local.engine = self
+        try:
+            return job(*args, **kwargs)
+        finally:
+            _local.engine = None
+
+    def run(self, coro, timeout=None):
+        """Runs a coroutine on the engine loop and blocks the calling (non loop) thread for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self):
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(5)
+
+    # Async transport, called from coroutines on the engine loop
+    async def run_blocking(self, func, *args, **kwargs):
+        async with self._semaphore:
+            return await self.loop.run_in_executor(self._io_executor, functools.partial(func, *args, **kwargs))
+
+
+def _engine():
+    return _engines[asyncio.get_running_loop()]
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a blocking callable on the engine's shared executor under the global concurrency cap"""
+    return await _engine().run_blocking(func, *args, **kwargs)
+
+
+async def fetch(url, **kwargs):
+    """Async client.get, returns the same Response object"""
+    return await run_blocking(client.get, url, **kwargs)
+
+
+async def request(url, **kwargs):
+    """Async client.request"""
+    return await run_blocking(client.request, url, **kwargs)
+
+
+async def gather(*coros):
+    """asyncio.gather that turns a failed coroutine into an empty list instead of failing the batch"""
+    results = await asyncio.gather(*coros, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            control.log(f'scrape task failed: {result!r}', 'warning')
+    return [[] if isinstance(result, BaseException) else result for result in results]
+
+
+def run_sync(coro_func, *args, **kwargs):
+    """
+    Sync adapter for async providers: callers that are not coroutines (database.get, older code paths)
+    get the result of coro_func(*args, **kwargs). Called from a sync provider it runs on the engine that
+    started that provider, so the scrape's concurrency cap and deadline cover it, otherwise on a short
+    lived engine. The loop and io threads never carry an engine, so they cannot wait on themselves.
+    """
+    engine = getattr(_local, 'engine', None)
+    if engine is not None and engine.loop.is_running():
+        return engine.run(coro_func(*args, **kwargs))
+    with Engine() as engine:
+        return engine.run(coro_func(*args, **kwargs))
@@ -0,0 +1,96 @@
+import threading
+
+from resources.lib.ui import control
+
+# Quality of each counter slot, in the order the sources dialog shows them (4K, 1080, 720, SD, EQ)
+QUALITY_SLOTS = (4, 3, 2, 1, 0)
+_SLOT = {quality: slot for slot, quality in enumerate(QUALITY_SLOTS)}
+
+
+class SourceCollector:
+    """
+    Thread-safe sink the provider workers push their sources into as each provider returns.
+    Per-quality counters are kept up to date on every add, so the dialog never rescans the lists,
+    and the early exit rules are checked on every add: done is set as soon as one of them holds, so
+    getSources can stop waiting on slow providers and play the best sources found so far.
+    Instant sources are cached torrents, cloud and local files, the ones that play without a wait.
+
+    Usage:
+        collector = SourceCollector.from_settings()
+        collector.add('nyaa', cached=cached, uncached=uncached)
+        if collector.done.is_set():
+            control.log(collector.reason)
+        collector.close()
+    """
+    def __init__(self, min_instant=0, instant_quality=3, preferred_provider=None, terminate_on_cloud=False, terminate_on_local=False):
+        self.min_instant = min_instant
+        self.instant_quality = instant_quality
+        self.preferred_provider = preferred_provider
+        self.terminate_on_cloud = terminate_on_cloud
+        self.terminate_on_local = terminate_on_local
+
+        self.torrents = []
+        self.cached_torrents = []
+        self.uncached_torrents = []
+        self.embeds = []
+        self.cloud = []
+        self.local = []
+        self.torrent_counts = [0] * len(QUALITY_SLOTS)
+        self.embed_counts = [0] * len(QUALITY_SLOTS)
+        self.instant = 0
+
+        self.done = threading.Event()
+        self.reason = None
+        self.closed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        return cls(
+            min_instant=control.getInt('general.earlyexit.count'),
+            instant_quality=control.getInt('general.earlyexit.quality'),
+            preferred_provider=control.getSetting('general.earlyexit.provider') or None,
+            terminate_on_cloud=control.settingids.terminateoncloud,
+            terminate_on_local=control.settingids.terminateonlocal
+        )
+
+    def add(self, provider, cached=(), uncached=(), embeds=(), cloud=(), local=()):
+        """Adds what one provider found, ignored once the collector is closed"""
+        with self._lock:
+            if self.closed:
+                return
+            self.torrents += cached
+            self.torrents += uncached
+            self.cached_torrents += cached
+            self.uncached_torrents += uncached
+            self.embeds += embeds
+            self.cloud += cloud
+            self.local += local
+
+            for sources, counts in ((cached, self.torrent_counts), (uncached, self.torrent_counts), (embeds, self.embed_counts)):
+                for source in sources:
+                    slot = _SLOT.get(source['quality'])
+                    if slot is not None:
+                        counts[slot] += 1
+            for sources in (cached, cloud, local):
+                self.instant += sum(source['quality'] >= self.instant_quality for source in sources)
+
+            if not self.done.is_set():
+                self.reason = self._early_exit(provider, cached or uncached or embeds or cloud or local)
+                if self.reason:
+                    self.done.set()
+
+    def _early_exit(self, provider, found):
+        if self.terminate_on_cloud and self.cloud:
+            return 'cloud sources found'
+        if self.terminate_on_local and self.local:
+            return 'local sources found'
+        if self.min_instant and self.instant >= self.min_instant:
+            return f'{self.instant} instant sources found'
+        if found and provider == self.preferred_provider:
+            return f'{provider} returned'
+
+    def close(self):
+        """Freezes the lists, providers that are still running can no longer change them"""
+        with self._lock:
+            self.closed = True
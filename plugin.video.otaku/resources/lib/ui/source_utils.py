@@ -1,3 +1,4 @@
+import functools
 import re
 import string
 import xbmc
@@ -8,162 +9,163 @@ from resources.lib.ui import control
 res = ['EQ', '480p', '720p', '1080p', '4k']
 
 
-def getAudio_lang(release_title):
-    release_title = cleanTitle(release_title)
-    if any(i in release_title for i in ['multi audio', 'multi lang', 'multiple audio', 'multiple lang']):
-        lang = 0
-    elif any(i in release_title for i in ['dual audio']):
-        lang = 1
-    elif any(i in release_title for i in ['dub', 'dubbed']):
-        lang = 3
-    else:
-        lang = 2
-    return lang
-
-
-def getAudio_channel(release_title):
-    release_title = cleanTitle(release_title)
-    if any(i in release_title for i in ['2 0 ', '2 0ch', '2ch']):
-        channel = 0
-    elif any(i in release_title for i in ['5 1 ', '5 1ch', '6ch']):
-        channel = 1
-    elif any(i in release_title for i in ['7 1 ', '7 1ch', '8ch']):
-        channel = 2
-    else:
-        channel = 3
-    return channel
-
-
-def getSubtitle_lang(release_title):
-    release_title = cleanTitle(release_title)
-    if any(i in release_title for i in ['multi sub', 'multiple sub']):
-        sub = 0
-    else:
-        sub = 1
-    return sub
-
-
-def getQuality(release_title):
-    release_title = release_title.lower()
-    if any(i in release_title for i in ['4k', '2160', "216o"]):
-        quality = 4
-    elif any(i in release_title for i in ["1080", "1o80", "108o", "1o8o"]):
-        quality = 3
-    elif any(i in release_title for i in ["720", "72o"]):
-        quality = 2
-    else:
-        quality = 1
-    return quality
-
-
-def getInfo(release_title):
-    info = []
-    release_title = cleanTitle(release_title)
+# Release title tags, in the order they are listed in a source's info. Each tag is set when any of its
+# needles is a substring of cleanTitle(release_title)
+INFO_TAGS = (
     # info.video
-    if any(i in release_title for i in ['x264', 'x 264', 'h264', 'h 264', 'avc']):
-        info.append('AVC')
-    if any(i in release_title for i in ['x265', 'x 265', 'h265', 'h 265', 'hevc']):
-        info.append('HEVC')
-    if any(i in release_title for i in ['xvid']):
-        info.append('XVID')
-    if any(i in release_title for i in ['divx']):
-        info.append('DIVX')
-    if any(i in release_title for i in ['mp4']):
-        info.append('MP4')
-    if any(i in release_title for i in ['wmv']):
-        info.append('WMV')
-    if any(i in release_title for i in ['mpeg']):
-        info.append('MPEG')
-    if any(i in release_title for i in ['vp9']):
-        info.append('VP9')
-    if any(i in release_title for i in ['av1']):
-        info.append('AV1')
-    if any(i in release_title for i in ['remux', 'bdremux']):
-        info.append('REMUX')
-    if any(i in release_title for i in [' hdr ', 'hdr10', 'hdr 10', 'uhd bluray 2160p', 'uhd blu ray 2160p', '2160p uhd bluray', '2160p uhd blu ray', '2160p bluray hevc truehd', '2160p bluray hevc dts', '2160p bluray hevc lpcm', '2160p us bluray hevc truehd', '2160p us bluray hevc dts']):
-        info.append('HDR')
-    if any(i in release_title for i in [' sdr ']):
-        info.append('SDR')
-    if any(i in release_title for i in [' dv ', 'dovi', 'dolby vision', 'dolbyvision']):
-        info.append('DV')
+    ('AVC', ('x264', 'x 264', 'h264', 'h 264', 'avc')),
+    ('HEVC', ('x265', 'x 265', 'h265', 'h 265', 'hevc')),
+    ('XVID', ('xvid',)),
+    ('DIVX', ('divx',)),
+    ('MP4', ('mp4',)),
+    ('WMV', ('wmv',)),
+    ('MPEG', ('mpeg',)),
+    ('VP9', ('vp9',)),
+    ('AV1', ('av1',)),
+    ('REMUX', ('remux', 'bdremux')),
+    ('HDR', (' hdr ', 'hdr10', 'hdr 10', 'uhd bluray 2160p', 'uhd blu ray 2160p', '2160p uhd bluray', '2160p uhd blu ray', '2160p bluray hevc truehd', '2160p bluray hevc dts', '2160p bluray hevc lpcm', '2160p us bluray hevc truehd', '2160p us bluray hevc dts')),
+    ('SDR', (' sdr ',)),
+    ('DV', (' dv ', 'dovi', 'dolby vision', 'dolbyvision')),
 
     # info.audio
-    if any(i in release_title for i in ['aac']):
-        info.append('AAC')
-    if any(i in release_title for i in ['dts']):
-        info.append('DTS')
-    if any(i in release_title for i in ['hd ma', 'hdma']):
-        info.append('DTS-HDMA')
-    if any(i in release_title for i in ['hd hr', 'hdhr', 'dts hr', 'dtshr']):
-        info.append('DTS-HDHR')
-    if any(i in release_title for i in ['dtsx', ' dts x']):
-        info.append('DTS-X')
-    if any(i in release_title for i in ['atmos']):
-        info.append('ATMOS')
-    if any(i in release_title for i in ['truehd', 'true hd']):
-        info.append('TRUEHD')
-    if any(i in release_title for i in ['ddp', 'dd+', 'eac3', ' e ac3', ' e ac 3']):
-        info.append('DD+')
-    if any(i in release_title for i in [' dd ', 'dd2', 'dd5', 'dd7', ' ac3', ' ac 3']):
-        info.append('DD')
-    if any(i in release_title for i in ['mp3']):
-        info.append('MP3')
-    if any(i in release_title for i in [' wma']):
-        info.append('WMA')
-    if any(i in release_title for i in ['opus']):
-        info.append('OPUS')
-    if any(i in release_title for i in ['dub', 'dubbed']):
-        info.append('DUB')
-    if any(i in release_title for i in ['dual audio']):
-        info.append('DUAL-AUDIO')
-    if any(i in release_title for i in ['multi audio', 'multi lang', 'multiple audio', 'multiple lang']):
-        info.append('MULTI-AUDIO')
+    ('AAC', ('aac',)),
+    ('DTS', ('dts',)),
+    ('DTS-HDMA', ('hd ma', 'hdma')),
+    ('DTS-HDHR', ('hd hr', 'hdhr', 'dts hr', 'dtshr')),
+    ('DTS-X', ('dtsx', ' dts x')),
+    ('ATMOS', ('atmos',)),
+    ('TRUEHD', ('truehd', 'true hd')),
+    ('DD+', ('ddp', 'dd+', 'eac3', ' e ac3', ' e ac 3')),
+    ('DD', (' dd ', 'dd2', 'dd5', 'dd7', ' ac3', ' ac 3')),
+    ('MP3', ('mp3',)),
+    ('WMA', (' wma',)),
+    ('OPUS', ('opus',)),
+    ('DUB', ('dub', 'dubbed')),
+    ('DUAL-AUDIO', ('dual audio',)),
+    ('MULTI-AUDIO', ('multi audio', 'multi lang', 'multiple audio', 'multiple lang')),
 
     # info.channels
-    if any(i in release_title for i in ['2 0 ', '2 0ch', '2ch']):
-        info.append('2.0')
-    if any(i in release_title for i in ['5 1 ', '5 1ch', '6ch']):
-        info.append('5.1')
-    if any(i in release_title for i in ['7 1 ', '7 1ch', '8ch']):
-        info.append('7.1')
+    ('2.0', ('2 0 ', '2 0ch', '2ch')),
+    ('5.1', ('5 1 ', '5 1ch', '6ch')),
+    ('7.1', ('7 1 ', '7 1ch', '8ch')),
 
     # info.subtitles
-    if any(i in release_title for i in ['multi sub', 'multiple sub']):
-        info.append('MULTI-SUB')
+    ('MULTI-SUB', ('multi sub', 'multiple sub')),
 
     # info.source
     # no point at all with WEBRip vs WEB-DL cuz it's always labeled wrong with TV Shows
     # WEB = WEB-DL in terms of size and quality
-    if any(i in release_title for i in ['bluray', 'blu ray', 'bdrip', 'bd rip', 'brrip', 'br rip']):
-        info.append('BLURAY')
-    if any(i in release_title for i in [' web ', 'webrip', 'webdl', 'web rip', 'web dl']):
-        info.append('WEB')
-    if any(i in release_title for i in [' hdrip', ' hd rip']):
-        info.append('HDRIP')
-    if any(i in release_title for i in ['dvdrip', 'dvd rip']):
-        info.append('DVDRIP')
-    if any(i in release_title for i in ['hdtv']):
-        info.append('HDTV')
-    if any(i in release_title for i in ['pdtv']):
-        info.append('PDTV')
-    if any(i in release_title for i in [' cam ', 'camrip', 'hdcam', 'hd cam', ' ts ', 'hd ts', 'hdts', 'telesync', ' tc ', 'hd tc', 'hdtc', 'telecine', 'xbet']):
-        info.append('CAM')
-    if any(i in release_title for i in ['dvdscr', ' scr ', 'screener']):
-        info.append('SCR')
-    if any(i in release_title for i in ['korsub', ' kor ', ' hc']):
-        info.append('HC')
-    if any(i in release_title for i in ['blurred']):
-        info.append('BLUR')
-    if any(i in release_title for i in [" 3d", " half ou", " half sbs"]):
-        info.append('3D')
-    if any(i in release_title for i in [" 60 fps", " 60fps"]):
-        info.append('60-FPS')
+    ('BLURAY', ('bluray', 'blu ray', 'bdrip', 'bd rip', 'brrip', 'br rip')),
+    ('WEB', (' web ', 'webrip', 'webdl', 'web rip', 'web dl')),
+    ('HDRIP', (' hdrip', ' hd rip')),
+    ('DVDRIP', ('dvdrip', 'dvd rip')),
+    ('HDTV', ('hdtv',)),
+    ('PDTV', ('pdtv',)),
+    ('CAM', (' cam ', 'camrip', 'hdcam', 'hd cam', ' ts ', 'hd ts', 'hdts', 'telesync', ' tc ', 'hd tc', 'hdtc', 'telecine', 'xbet')),
+    ('SCR', ('dvdscr', ' scr ', 'screener')),
+    ('HC', ('korsub', ' kor ', ' hc')),
+    ('BLUR', ('blurred',)),
+    ('3D', (' 3d', ' half ou', ' half sbs')),
+    ('60-FPS', (' 60 fps', ' 60fps')),
 
     # info.batch
-    if any(i in release_title for i in ['batch', 'complete series']):
-        info.append('BATCH')
+    ('BATCH', ('batch', 'complete series'))
+)
+
+# Matched against release_title.lower(), the best quality found wins
+QUALITY_TAGS = (
+    (4, ('4k', '2160', '216o')),
+    (3, ('1080', '1o80', '108o', '1o8o')),
+    (2, ('720', '72o'))
+)
+
+
+def _compile_tags(tags):
+    """
+    Folds the needles of tags into a trie shaped regex tried at every position of a title, so a whole
+    title is classified in one scan. The longest needle starting at a position is the one matched, and
+    it maps to the tags of every needle it starts with, so overlapping needles (dts, dtshr) are all seen
+    """
+    needle_tags = {}
+    for tag, needles in tags:
+        for needle in needles:
+            needle_tags.setdefault(needle, set()).add(tag)
+
+    trie = {}
+    for needle in needle_tags:
+        node = trie
+        for char in needle:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def to_regex(node):
+        branches = [re.escape(char) + to_regex(child) for char, child in node.items() if char is not None]
+        if not branches:
+            return ''
+        if None not in node:
+            return branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+        return '(?:%s)?' % '|'.join(branches)
+
+    matched_tags = {
+        needle: frozenset().union(*(needle_tags.get(needle[:end], ()) for end in range(1, len(needle) + 1)))
+        for needle in needle_tags
+    }
+    return re.compile('(?=(%s))' % to_regex(trie)), matched_tags
+
+
+_INFO_RE, _INFO_MATCHES = _compile_tags(INFO_TAGS)
+_QUALITY_RE, _QUALITY_MATCHES = _compile_tags(QUALITY_TAGS)
+
+
+class ReleaseTitleInfo:
+    """
+    Everything the source list shows about a release title (quality, info tags, audio language and
+    channels, subtitles), from one cleanTitle and one scan instead of a cleanTitle per attribute
+    """
+    __slots__ = ('quality', 'info', 'lang', 'channel', 'sub')
+
+    def __init__(self, release_title):
+        found = {tag for match in _INFO_RE.findall(cleanTitle(release_title)) for tag in _INFO_MATCHES[match]}
+        qualities = {quality for match in _QUALITY_RE.findall(release_title.lower()) for quality in _QUALITY_MATCHES[match]}
+        self.quality = max(qualities, default=1)
+        self.info = [tag for tag, _ in INFO_TAGS if tag in found]
+        if 'MULTI-AUDIO' in found:
+            self.lang = 0
+        elif 'DUAL-AUDIO' in found:
+            self.lang = 1
+        elif 'DUB' in found:
+            self.lang = 3
+        else:
+            self.lang = 2
+        if '2.0' in found:
+            self.channel = 0
+        elif '5.1' in found:
+            self.channel = 1
+        elif '7.1' in found:
+            self.channel = 2
+        else:
+            self.channel = 3
+        self.sub = 0 if 'MULTI-SUB' in found else 1
+
+
+def getAudio_lang(release_title):
+    return ReleaseTitleInfo(release_title).lang
+
+
+def getAudio_channel(release_title):
+    return ReleaseTitleInfo(release_title).channel
+
+
+def getSubtitle_lang(release_title):
+    return ReleaseTitleInfo(release_title).sub
 
-    return info
+
+def getQuality(release_title):
+    return ReleaseTitleInfo(release_title).quality
+
+
+def getInfo(release_title):
+    return ReleaseTitleInfo(release_title).info
 
 
 def get_cache_check_reg(episode):
@@ -353,6 +355,112 @@ def get_best_match(dict_key, dictionary_list, episode, pack_select=False):
     return files[0]
 
 
+# Episode, season and part extraction used by filter_sources
+_SEASON_RE = re.compile(r"(?i)\b(?:s(?:eason)?[ ._-]?(\d{1,2}))(?!\d)")
+_EPISODE_RE = re.compile(r"""(?ix)
+    (?:^|[\s._-])                     # separator
+    (?:e(?:p)?\s?(\d{1,4}))           # E12, EP12
+    |
+    -\s?(\d{1,4})\b                   # - 12
+    |
+    \b(?:episode|ep|e)\s?(\d{1,4})\b   # ep 03
+    |
+    s\d{1,2}e(\d{1,4})                # s01e07 format
+    |
+    (\d{1,4})\s+(\d{1,4})             # standalone episode range
+""")
+_EPISODE_RANGE_RE = re.compile(r"(\d{1,4})\s*[~\-]\s*(\d{1,4})")
+_SXXEYY_RE = re.compile(r"s\d{1,2}e(\d{1,4})", re.IGNORECASE)
+_PART_RE = re.compile(r"(?i)\b(?:part|cour)[ ._-]?(\d+)(?:[&-](\d+))?\b")
+_TRAILING_NUMBER_RE = re.compile(r"""(?ix)
+    \b(?:[a-z]{3,})\s+(\d{1,3})\b
+""")
+_ORDINAL_RE = re.compile(r"\b\d+(?:st|nd|rd|th)\b", re.IGNORECASE)
+_BTIH_RE = re.compile(r'btih:(.*?)(?:&|$)')
+_ALLDEBRID_HASH_RE = re.compile(r'/f/([^/]+)')
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_release(title):
+    """
+    (episode, seasons, parts) of a release title as used by filter_sources: episode is '12', '1-12' or
+    '3, 4', seasons is '1' or '1, 2', both None when not found, parts a tuple of the part numbers.
+    Memoized as the same titles come back from every provider and every scrape.
+    """
+    title = title.lower()
+
+    # Clean the title for extraction
+    clean_title = clean_text(title)
+
+    # Extract parts
+    extracted_parts = tuple(group for match in _PART_RE.findall(title) for group in match if group)
+
+    # Extract seasons
+    season_matches = _SEASON_RE.findall(title)
+    extracted_seasons = None
+    if season_matches:
+        extracted_seasons = ", ".join(season_matches)
+
+    # For episode extraction, remove part tokens from the clean title
+    clean_title_no_parts = _PART_RE.sub("", clean_title)
+
+    # Extract episode using the improved logic from testing.py
+    extracted_episode = None
+
+    # First, if an sXXeYY pattern exists, extract the episode number directly
+    se_match = _SXXEYY_RE.search(clean_title_no_parts)
+    if se_match:
+        epnum = se_match.group(1)
+        if not (extracted_parts and epnum in extracted_parts):
+            extracted_episode = epnum
+
+    # Otherwise, check for a dedicated episode range using "~" or "-"
+    if not extracted_episode:
+        range_match = _EPISODE_RANGE_RE.search(clean_title_no_parts)
+        if range_match:
+            start, end = range_match.group(1), range_match.group(2)
+            if not (extracted_parts and (start in extracted_parts or end in extracted_parts)):
+                extracted_episode = f"{start}-{end}"
+
+    # Fallback: use the regex_episode findall approach
+    if not extracted_episode:
+        ep_match = _EPISODE_RE.findall(clean_title_no_parts)
+        if ep_match:
+            episodes = []
+            for match in ep_match:
+                for group in match:
+                    if group and group not in extracted_parts:
+                        episodes.append(group)
+
+            # If season is detected, drop a leading number equal to a season
+            if extracted_seasons and episodes:
+                season_nums = [int(s.strip()) for s in extracted_seasons.split(",") if s.strip().isdigit()]
+                if episodes[0].isdigit() and int(episodes[0]) in season_nums:
+                    episodes = episodes[1:]
+
+            if len(episodes) >= 2 and episodes[0].isdigit() and episodes[-1].isdigit():
+                extracted_episode = f"{episodes[0]}-{episodes[-1]}"
+            elif episodes:
+                extracted_episode = ", ".join(episodes)
+
+    # Fallback: get final word-number match (unless it matches a part)
+    if not extracted_episode:
+        trail_matches = _TRAILING_NUMBER_RE.findall(clean_title_no_parts)
+        if trail_matches:
+            last_num = trail_matches[-1]
+            if not (extracted_parts and last_num in extracted_parts):
+                if extracted_seasons:
+                    season_nums = [int(s.strip()) for s in extracted_seasons.split(",") if s.strip().isdigit()]
+                    if last_num.isdigit() and int(last_num) in season_nums:
+                        extracted_episode = None
+                    elif not _ORDINAL_RE.search(clean_title_no_parts):
+                        extracted_episode = last_num
+                elif not _ORDINAL_RE.search(clean_title_no_parts):
+                    extracted_episode = last_num
+
+    return extracted_episode, extracted_seasons, extracted_parts
+
+
 def filter_sources(provider, torrent_list, mal_id, season=None, episode=None, part=None, anidb_id=True):
     from resources.lib.ui import database
     """
@@ -367,27 +475,6 @@ def filter_sources(provider, torrent_list, mal_id, season=None, episode=None, pa
             if thetvdb_season == 'a' or thetvdb_season == 0:
                 season = None
 
-    # Define regexes from the testing file
-    regex_season = re.compile(r"(?i)\b(?:s(?:eason)?[ ._-]?(\d{1,2}))(?!\d)")
-    regex_episode = re.compile(r"""(?ix)
-        (?:^|[\s._-])                     # separator
-        (?:e(?:p)?\s?(\d{1,4}))           # E12, EP12
-        |
-        -\s?(\d{1,4})\b                   # - 12
-        |
-        \b(?:episode|ep|e)\s?(\d{1,4})\b   # ep 03
-        |
-        s\d{1,2}e(\d{1,4})                # s01e07 format
-        |
-        (\d{1,4})\s+(\d{1,4})             # standalone episode range
-    """)
-    regex_episode_range = re.compile(r"(\d{1,4})\s*[~\-]\s*(\d{1,4})")
-    regex_part = re.compile(r"(?i)\b(?:part|cour)[ ._-]?(\d+)(?:[&-](\d+))?\b")
-    regex_trailing_number = re.compile(r"""(?ix)
-        \b(?:[a-z]{3,})\s+(\d{1,3})\b
-    """)
-    regex_ordinal_check = re.compile(r"\b\d+(?:st|nd|rd|th)\b", re.IGNORECASE)
-
     filtered = []
 
     # Loop over each torrent in the list
@@ -397,12 +484,12 @@ def filter_sources(provider, torrent_list, mal_id, season=None, episode=None, pa
             if 'hash' not in torrent:
                 continue
         elif provider == 'nyaa':
-            torrent['hash'] = re.findall(r'btih:(.*?)(?:&|$)', torrent['magnet'])[0]
+            torrent['hash'] = _BTIH_RE.findall(torrent['magnet'])[0]
         elif provider == 'realdebrid':
             torrent['hash'] = torrent.get('hash', '')
         elif provider == 'alldebrid':
             link = torrent['link']
-            torrent['hash'] = re.search(r'/f/([^/]+)', link).group(1)
+            torrent['hash'] = _ALLDEBRID_HASH_RE.search(link).group(1)
         elif provider == 'premiumize':
             torrent['hash'] = torrent.get('id', '')
         elif provider == 'torbox':
@@ -414,89 +501,11 @@ def filter_sources(provider, torrent_list, mal_id, season=None, episode=None, pa
 
         # Select the title based on provider
         if provider in ['realdebrid', 'alldebrid']:
-            title = torrent['filename'].lower()
+            title = torrent['filename']
         else:
-            title = torrent['name'].lower()
-
-        # Clean the title for extraction
-        clean_title = clean_text(title)
-
-        # Extract parts
-        part_matches = regex_part.findall(title)
-        extracted_parts = []
-        for match in part_matches:
-            for group in match:
-                if group:
-                    extracted_parts.append(group)
-
-        # Extract seasons
-        season_matches = regex_season.findall(title)
-        extracted_seasons = None
-        if season_matches:
-            extracted_seasons = ", ".join(season_matches)
-
-        # For episode extraction, remove part tokens from the clean title
-        clean_title_no_parts = re.sub(regex_part, "", clean_title)
-
-        # Extract episode using the improved logic from testing.py
-        extracted_episode = None
-
-        # First, if an sXXeYY pattern exists, extract the episode number directly
-        se_match = re.search(r"s\d{1,2}e(\d{1,4})", clean_title_no_parts, re.IGNORECASE)
-        if se_match:
-            epnum = se_match.group(1)
-            if not (extracted_parts and epnum in extracted_parts):
-                extracted_episode = epnum
-
-        # Otherwise, check for a dedicated episode range using "~" or "-"
-        if not extracted_episode:
-            range_match = regex_episode_range.search(clean_title_no_parts)
-            if range_match:
-                start, end = range_match.group(1), range_match.group(2)
-                if not (extracted_parts and (start in extracted_parts or end in extracted_parts)):
-                    extracted_episode = f"{start}-{end}"
-
-        # Fallback: use the regex_episode findall approach
-        if not extracted_episode:
-            ep_match = regex_episode.findall(clean_title_no_parts)
-            if ep_match:
-                episodes = []
-                for match in ep_match:
-                    for group in match:
-                        if group and group not in extracted_parts:
-                            episodes.append(group)
-
-                # If season is detected, drop a leading number equal to a season
-                if extracted_seasons and episodes:
-                    try:
-                        season_nums = [int(s.strip()) for s in extracted_seasons.split(",") if s.strip().isdigit()]
-                        if episodes[0].isdigit() and int(episodes[0]) in season_nums:
-                            episodes = episodes[1:]
-                    except Exception:
-                        season_nums = []
-
-                if len(episodes) >= 2 and episodes[0].isdigit() and episodes[-1].isdigit():
-                    extracted_episode = f"{episodes[0]}-{episodes[-1]}"
-                elif episodes:
-                    extracted_episode = ", ".join(episodes)
-
-        # Fallback: get final word-number match (unless it matches a part)
-        if not extracted_episode:
-            trail_matches = regex_trailing_number.findall(clean_title_no_parts)
-            if trail_matches:
-                last_num = trail_matches[-1]
-                if not (extracted_parts and last_num in extracted_parts):
-                    if extracted_seasons:
-                        try:
-                            season_nums = [int(s.strip()) for s in extracted_seasons.split(",") if s.strip().isdigit()]
-                            if last_num.isdigit() and int(last_num) in season_nums:
-                                extracted_episode = None
-                            elif not regex_ordinal_check.search(clean_title_no_parts):
-                                extracted_episode = last_num
-                        except Exception:
-                            season_nums = []
-                    elif not regex_ordinal_check.search(clean_title_no_parts):
-                        extracted_episode = last_num
+            title = torrent['name']
+
+        extracted_episode, extracted_seasons, extracted_parts = parse_release(title)
 
         # Determine if we have any metadata to filter by
         has_info = bool(extracted_episode or extracted_seasons or extracted_parts)
@@ -573,30 +582,35 @@ def filter_sources(provider, torrent_list, mal_id, season=None, episode=None, pa
     return filtered
 
 
+# Quality, codec and audio tags stripped from a title before episode numbers are looked for
+_RELEASE_TAGS_RE = re.compile("|".join([
+    r"\b(?:360p|480p|720p|1080p|2160p|4k)(?!\d)",
+    r"\b10\s?bits?\b",  # matches 10bit, 10bits, 10 bit, 10 bits
+    r"\b(?:h\.?\s?264|x\.?\s?264|h\.?\s?265|x\.?\s?265|hevc|avc|hls)(?!\d)",
+    r"\b(?:web-dl|webrip|bluray|hdrip|dvdrip|hdtv|pdtv|cam|screener)\b",
+    r"\b(?:hdr10|hdr|sdr|dv|dolby vision|dovi)\b",
+    r"\b(?:mp4|vp9|av1|mpeg|xvid|divx|wmv|flac)\b",
+    r"\b(?:aac|mp3|opus|ddp|dd(?:\s?(?:2|5|7))|ac3|dts(?:-hdma|-hdhr|-x)?|atmos|truehd)(?:\d+(?:\.\d+)?)?\b",
+    r"\b(?:1\.0|2\.0|5\.1|7\.1|2ch|5ch|7ch|8ch)\b",
+    r"\b(?:3d|60[-\s]?fps)\b",
+    r"\b(?:multi audio|dual audio|dub(?:bed)?|multi sub|batch|complete series)\b"
+]), re.I)
+_BRACKETED_RE = re.compile(r"\[.*?\]|\(.*?\)")
+_SPECIAL_CHARS_RE = re.compile(r"[:/,!?()'\"\\\[\]_.]")
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
 def remove_patterns(text):
-    patterns = [
-        r"\b(?:360p|480p|720p|1080p|2160p|4k)(?!\d)",
-        r"\b10\s?bits?\b",  # matches 10bit, 10bits, 10 bit, 10 bits
-        r"\b(?:h\.?\s?264|x\.?\s?264|h\.?\s?265|x\.?\s?265|hevc|avc|hls)(?!\d)",
-        r"\b(?:web-dl|webrip|bluray|hdrip|dvdrip|hdtv|pdtv|cam|screener)\b",
-        r"\b(?:hdr10|hdr|sdr|dv|dolby vision|dovi)\b",
-        r"\b(?:mp4|vp9|av1|mpeg|xvid|divx|wmv|flac)\b",
-        r"\b(?:aac|mp3|opus|ddp|dd(?:\s?(?:2|5|7))|ac3|dts(?:-hdma|-hdhr|-x)?|atmos|truehd)(?:\d+(?:\.\d+)?)?\b",
-        r"\b(?:1\.0|2\.0|5\.1|7\.1|2ch|5ch|7ch|8ch)\b",
-        r"\b(?:3d|60[-\s]?fps)\b",
-        r"\b(?:multi audio|dual audio|dub(?:bed)?|multi sub|batch|complete series)\b"
-    ]
-    combined_pattern = "|".join(patterns)
-    return re.sub(combined_pattern, "", text, flags=re.I)
+    return _RELEASE_TAGS_RE.sub("", text)
 
 
 def cleanup_text(text):
     # Remove content within brackets or parentheses
-    text = re.sub(r"\[.*?\]|\(.*?\)", "", text).strip()
+    text = _BRACKETED_RE.sub("", text).strip()
     # Replace special characters with a space, but preserve dashes for episode range detection
-    text = re.sub(r"[:/,!?()'\"\\\[\]_.]", " ", text)
+    text = _SPECIAL_CHARS_RE.sub(" ", text)
     # Collapse multiple spaces into one
-    return re.sub(r"\s+", " ", text).strip()
+    return _WHITESPACE_RE.sub(" ", text).strip()
 
 
 def clean_text(text):
@@ -605,18 +619,21 @@ def clean_text(text):
     return text
 
 
+_NON_PRINTABLE_RE = re.compile('[^%s]' % re.escape(string.printable))
+_TITLE_PUNCTUATION_RE = re.compile(r'[:/,!?()\'"\\\[\]\-_.]')
+
+
 def cleanTitle(title):
-    title = title.lower()
-    result = ''.join(char for char in title if char in string.printable)
-    title = result.encode('ascii', errors='ignore').decode('ascii', errors='ignore')
+    # string.printable is ascii only, so this also drops everything the ascii encode used to
+    title = _NON_PRINTABLE_RE.sub('', title.lower())
     apostrophe_replacement = 's'
     title = title.replace("\\'s", apostrophe_replacement)
     title = title.replace("'s", apostrophe_replacement)
     title = title.replace("&#039;s", apostrophe_replacement)
     title = title.replace(" 039 s", apostrophe_replacement)
-    title = re.sub(r'[:/,!?()\'"\\\[\]\-_.]', ' ', title)
-    title = re.sub(r'\s+', ' ', title)
-    title = re.sub(r'&', 'and', title)
+    title = _TITLE_PUNCTUATION_RE.sub(' ', title)
+    title = _WHITESPACE_RE.sub(' ', title)
+    title = title.replace('&', 'and')
     return title.strip()
 
 
@@ -0,0 +1,195 @@
+import itertools
+import queue
+import threading
+import time
+
+from collections import deque
+from contextlib import contextmanager
+from resources.lib.ui import control
+
+# Lanes, a lower number is taken first when every worker is busy
+PRIORITY_UI = 0
+PRIORITY_BACKGROUND = 1
+_LANE_NAMES = {PRIORITY_UI: 'ui', PRIORITY_BACKGROUND: 'background'}
+
+DEFAULT_MAX_WORKERS = 8
+WORKER_IDLE_TIMEOUT = 30  # seconds before an idle worker exits
+WORKER_POLL_INTERVAL = 1  # seconds between an idle worker's checks for shutdown and resizes
+RESIZE_INTERVAL = 10  # seconds between reads of general.threads
+
+# Lane of the work the current thread is running, inherited by the maps it issues
+_local = threading.local()
+
+
+def current_priority():
+    return getattr(_local, 'priority', PRIORITY_UI)
+
+
+@contextmanager
+def lane(priority):
+    """Runs the block, and every map it issues without an explicit priority, in the given lane"""
+    previous = current_priority()
+    _local.priority = priority
+    try:
+        yield
+    finally:
+        _local.priority = previous
+
+
+class _Batch:
+    """Items of one map call, drained by pool workers and by the calling thread alike"""
+    def __init__(self, func, items, priority):
+        self.func = func
+        self.priority = priority
+        self.pending = deque(enumerate(items))
+        self.results = [None] * len(self.pending)
+        self.errors = {}
+        self.remaining = len(self.pending)
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        if not self.remaining:
+            self.done.set()
+
+    def drain(self, preempted=None):
+        """Runs pending items until none are left, or until preempted() asks for the thread back"""
+        while True:
+            if preempted is not None and preempted():
+                return False
+            with self.lock:
+                if not self.pending:
+                    return True
+                index, item = self.pending.popleft()
+            try:
+                with lane(self.priority):
+                    self.results[index] = self.func(item)
+            except Exception as e:
+                self.errors[index] = e
+            with self.lock:
+                self.remaining -= 1
+                if not self.remaining:
+                    self.done.set()
+
+
+class SharedPool:
+    """
+    Process wide worker pool behind utils.parallel_process/parallel_fetch, collect_meta, debrid checks, etc.
+    Work is queued in priority lanes so UI-critical batches overtake background metadata when the pool is
+    saturated. Submission is nesting safe: the thread calling map drains its own batch alongside the
+    workers, so a map issued from inside a pool worker always makes progress even when every worker is
+    busy, and the total thread count stays at max_workers however deeply calls nest.
+    A map without a priority inherits the lane of the batch it is issued from.
+    Workers are not daemons, so queued work still finishes when the interpreter exits; idle workers
+    leave once the main thread has finished. With max_workers None the size follows general.threads,
+    re-read every RESIZE_INTERVAL seconds so a changed setting applies under reuselanguageinvoker.
+    """
+    def __init__(self, max_workers=None):
+        self._fixed_size = max_workers
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self._sized_at = None
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = 0
+        self._idle = 0
+        self._active = 0
+        self._queued = dict.fromkeys(_LANE_NAMES, 0)
+        self._peak_workers = 0
+        self._batches = 0
+
+    def map(self, func, items, max_workers=None, priority=None):
+        """
+        Ordered results of func over items, like ThreadPoolExecutor.map.
+        max_workers caps the parallelism of this batch, the calling thread counts as one of them.
+        priority defaults to the calling thread's lane, PRIORITY_UI outside of any batch.
+        The first failing item (in order) re-raises its exception once the batch has finished.
+        """
+        if priority is None:
+            priority = current_priority()
+        self._resize()
+        batch = _Batch(func, list(items), priority)
+        helpers = min(batch.remaining, max_workers or self.max_workers, self.max_workers + 1) - 1
+        if helpers > 0:
+            self._enqueue(batch, helpers, priority)
+        batch.drain()
+        batch.done.wait()
+        if batch.errors:
+            raise batch.errors[min(batch.errors)]
+        return batch.results
+
+    def run(self, *funcs, priority=None):
+        """Calls each zero argument function in parallel and returns their results in order"""
+        return self.map(lambda func: func(), funcs, priority=priority)
+
+    def _resize(self):
+        if self._fixed_size:
+            return
+        now = time.monotonic()
+        if self._sized_at is not None and now - self._sized_at < RESIZE_INTERVAL:
+            return
+        self._sized_at = now
+        # Growing applies to the next spawn, surplus workers exit when they next go idle
+        self.max_workers = control.getInt('general.threads') or DEFAULT_MAX_WORKERS
+
+    def _enqueue(self, batch, helpers, priority):
+        with self._lock:
+            self._batches += 1
+            for _ in range(helpers):
+                self._queue.put((priority, next(self._seq), batch))
+                self._queued[priority] += 1
+            spawn = min(helpers - self._idle, self.max_workers - self._workers)
+            self._workers += max(spawn, 0)
+            self._peak_workers = max(self._peak_workers, self._workers)
+        for _ in range(spawn):
+            threading.Thread(target=self._worker, name='otaku-pool').start()
+
+    def _worker(self):
+        idle_since = time.monotonic()
+        while True:
+            with self._lock:
+                self._idle += 1
+            try:
+                priority, _, batch = self._queue.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                with self._lock:
+                    self._idle -= 1
+                    # Work may have been queued against this worker between the timeout and the lock
+                    if not self._queue.empty():
+                        continue
+                    if (time.monotonic() - idle_since < WORKER_IDLE_TIMEOUT and self._workers <= self.max_workers
+                            and threading.main_thread().is_alive()):
+                        continue
+                    self._workers -= 1
+                return
+            with self._lock:
+                self._idle -= 1
+                self._active += 1
+                self._queued[priority] -= 1
+            try:
+                if not batch.drain(lambda: self._waiting_above(priority)):
+                    # A more urgent lane is waiting, hand this batch back and pick that up first
+                    with self._lock:
+                        self._queue.put((priority, next(self._seq), batch))
+                        self._queued[priority] += 1
+            finally:
+                with self._lock:
+                    self._active -= 1
+                idle_since = time.monotonic()
+
+    def _waiting_above(self, priority):
+        with self._queue.mutex:
+            return bool(self._queue.queue) and self._queue.queue[0][0] < priority
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'workers': self._workers,
+                'active': self._active,
+                'idle': self._idle,
+                'queued': {_LANE_NAMES[lane]: count for lane, count in self._queued.items()},
+                'peak_workers': self._peak_workers,
+                'batches': self._batches
+            }
+
+
+pool = SharedPool()
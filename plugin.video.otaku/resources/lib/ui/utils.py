@@ -1,8 +1,7 @@
 import os
-import concurrent.futures
 
 from functools import partial
-from resources.lib.ui import control, database
+from resources.lib.ui import control, database, thread_pool
 
 
 def allocate_item(name, url, isfolder, isplayable, cm, image='', info=None, fanart=None, poster=None, landscape=None, banner=None, clearart=None, clearlogo=None):
@@ -144,14 +143,15 @@ def format_time(seconds):
     return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
 
 
-def parallel_fetch(requests_list, max_workers=5, timeout=30):
+def parallel_fetch(requests_list, max_workers=5, timeout=30, priority=None):
     """
-    Execute multiple HTTP requests in parallel using threading.
+    Execute multiple HTTP requests in parallel on the shared thread pool.
 
     Args:
         requests_list: List of dicts with keys: 'func', 'args' (tuple), 'kwargs' (dict)
-        max_workers: Max number of concurrent threads (default: 5)
+        max_workers: Max number of concurrent requests (default: 5), bounded by the pool size
         timeout: Timeout for all requests combined (default: 30s, set to None for no timeout)
+        priority: thread_pool lane, PRIORITY_UI or PRIORITY_BACKGROUND (default: the caller's lane)
 
     Returns:
         List of results in same order as requests_list
@@ -173,34 +173,20 @@ def parallel_fetch(requests_list, max_workers=5, timeout=30):
             control.log(f"Parallel request error: {str(e)}")
             return None
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks and maintain order with a dict mapping futures to original index
-        future_to_index = {executor.submit(execute_request, req): idx for idx, req in enumerate(requests_list)}
+    # execute_request never raises, so results keep the order of requests_list
+    return thread_pool.pool.map(execute_request, requests_list, max_workers, priority)
 
-        # Create a results list to maintain order
-        results = [None] * len(requests_list)
 
-        # Collect results as they complete (true parallel execution)
-        # No timeout on as_completed since individual requests might take a while
-        for future in concurrent.futures.as_completed(future_to_index):
-            idx = future_to_index[future]
-            try:
-                results[idx] = future.result()
-            except Exception as e:
-                control.log(f"Parallel request failed: {str(e)}")
-                results[idx] = None
-
-    return results
-
-
-def parallel_process(items, process_func, max_workers=5):
+def parallel_process(items, process_func, max_workers=5, priority=None):
     """
-    Process multiple items in parallel using threading.
+    Process multiple items in parallel on the shared thread pool.
+    Safe to nest: a call made from inside another parallel_process worker does not start new threads.
 
     Args:
         items: List of items to process
         process_func: Function to apply to each item
-        max_workers: Max number of concurrent threads (default: 5)
+        max_workers: Max number of concurrent workers (default: 5), bounded by the pool size
+        priority: thread_pool lane, PRIORITY_UI or PRIORITY_BACKGROUND (default: the caller's lane)
 
     Returns:
         List of results in same order as items
@@ -209,6 +195,4 @@ def parallel_process(items, process_func, max_workers=5):
         slugs = ['slug1', 'slug2', 'slug3']
         results = parallel_process(slugs, lambda slug: scraper._process(slug))
     """
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(executor.map(process_func, items))
-    return results
+    return thread_pool.pool.map(process_func, items, max_workers, priority)
@@ -3,7 +3,7 @@ import json
 
 from resources.lib.windows.base_window import BaseWindow
 from resources.lib.ui import control
-from operator import itemgetter
+from operator import neg
 
 # Define available sort methods
 SORT_METHODS = ['none', 'source type', 'debrid provider', 'audio', 'subtitles', 'resolution', 'size', 'seeders', 'audio channels']
@@ -402,60 +402,61 @@ class SortSelect(BaseWindow):
             json.dump(self.sort_options, file)
 
 
-def sort_by_none(list_, reverse):
-    return list_
-
-
-def sort_by_resolution(list_, reverse):
-    list_.sort(key=itemgetter('quality'), reverse=reverse)
-    return list_
-
-
-def sort_by_size(list_, reverse):
-    list_.sort(key=itemgetter('byte_size'), reverse=reverse)
-    return list_
-
-
-def sort_by_seeders(list_, reverse):
-    list_.sort(key=itemgetter('seeders'), reverse=reverse)
-    return list_
-
-
-def sort_by_audio_channels(list_, reverse):
-    list_.sort(key=itemgetter('channel'), reverse=reverse)
-    return list_
-
-
-def sort_by_debrid_provider(list_, reverse):
-    # debrid_order = {provider: index for index, provider in enumerate(SORT_OPTIONS['debrid provider'])}
-    # list_.sort(key=lambda x: debrid_order.get(x['debrid_provider'], float('inf')), reverse=reverse)
-    for i in range(len(SORT_OPTIONS['debrid provider']), 0, -1):
-        list_.sort(key=lambda x: x['debrid_provider'] in debrid_provider[int(sort_options[f'debrid provider.{i}'])], reverse=reverse)
-    return list_
-
-
-def sort_by_source_type(list_, reverse):
-    def source_type_key(item):
-        if item['type'] == 'torrent':
-            return 0
-        elif item['type'] == 'torrent (uncached)':
-            return 1
-        else:
-            return 2
-
-    list_.sort(key=source_type_key)
-    for i in range(len(SORT_OPTIONS['source type']), 0, -1):
-        list_.sort(key=lambda x: x['type'] in source_type[int(sort_options[f'source type.{i}'])], reverse=reverse)
-    return list_
-
-
-def sort_by_audio(list_, reverse):
-    for i in range(len(SORT_OPTIONS['audio']), 0, -1):
-        list_.sort(key=lambda x: x['lang'] == audio[int(sort_options[f'audio.{i}'])], reverse=reverse)
-    return list_
+# Item field and stable passes behind each sort method, as the per-method sort_by_* passes ran them
+# (kept as the reference in tests/test_sort_select.py): a plain field sort, or one
+# "field value in group" pass per configured option, last option first
+_NUMERIC_SORTS = {'resolution': 'quality', 'size': 'byte_size', 'seeders': 'seeders', 'audio channels': 'channel'}
+_OPTION_SORTS = {
+    'source type': ('type', source_type),
+    'debrid provider': ('debrid_provider', debrid_provider),
+    'audio': ('lang', [[value] for value in audio]),
+    'subtitles': ('sub', [[value] for value in subtitles])
+}
 
 
-def sort_by_subtitles(list_, reverse):
-    for i in range(len(SORT_OPTIONS['subtitles']), 0, -1):
-        list_.sort(key=lambda x: x['sub'] == subtitles[int(sort_options[f'subtitles.{i}'])], reverse=reverse)
+def _option_rank(option, groups, reverse):
+    # The passes of one option sort collapse into a tuple per field value, cached since few values occur
+    ranks = {}
+    selected = [groups[int(sort_options[f'{option}.{i}'])] for i in range(1, len(SORT_OPTIONS[option]) + 1)]
+
+    def rank(value):
+        try:
+            return ranks[value]
+        except KeyError:
+            ranks[value] = r = tuple((value in group) != reverse for group in selected)
+            return r
+    return rank
+
+
+def _source_type_order(value):
+    # the unreversed pre-sort the source type passes started with
+    return 0 if value == 'torrent' else 1 if value == 'torrent (uncached)' else 2
+
+
+def sort_key():
+    """
+    Key function equivalent to running the stable passes of every sortmethod level of sort_options,
+    level 9 first, so the sources are sorted once instead of with dozens of stable passes.
+    Each pass becomes one component of a tuple, ordered from the last pass to the first, since a later
+    stable pass is the more significant key. A reversed pass is the ascending sort of the negated key.
+    """
+    fields = []
+    for x in range(1, len(SORT_METHODS) + 1):
+        method = SORT_METHODS[int(sort_options[f'sortmethod.{x}'])]
+        reverse = not sort_options[f'sortmethod.{x}.reverse']
+        if method in _NUMERIC_SORTS:
+            fields.append((_NUMERIC_SORTS[method], neg if reverse else None))
+        elif method in _OPTION_SORTS:
+            field, groups = _OPTION_SORTS[method]
+            fields.append((field, _option_rank(method, groups, reverse)))
+            if method == 'source type':
+                fields.append((field, _source_type_order))
+
+    def key(item):
+        return tuple(item[field] if rank is None else rank(item[field]) for field, rank in fields)
+    return key
+
+
+def sort_sources(list_):
+    list_.sort(key=sort_key())
     return list_
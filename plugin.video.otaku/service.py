@@ -1,10 +1,11 @@
 import time
 import os
 import json
+import shutil
 import urllib.request
 import urllib.error
 
-from resources.lib.ui import control, client, database_sync
+from resources.lib.ui import control, client, database, database_sync
 
 
 def refresh_apis():
@@ -52,13 +53,33 @@ def update_calendars():
 def update_mappings_db():
     control.log("### Updating Mappings")
     url = 'https://github.com/Goldenfreddy0703/Otaku-Mappings/raw/refs/heads/main/anime_mappings.db'
+    # download next to the live file and only swap it in once it has been indexed and validated,
+    # so readers never see a partial or broken mappings.db
+    tmp_path = f'{control.mappingDB}.tmp'
+    # revalidate against the copy we already have, an unchanged file answers 304 without a download
+    headers = client.conditional_headers(url) if os.path.exists(control.mappingDB) else {}
     try:
-        response = urllib.request.urlopen(url)
-        with open(os.path.join(control.dataPath, 'mappings.db'), 'wb') as file:
-            file.write(response.read())
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response, open(tmp_path, 'wb') as file:
+            shutil.copyfileobj(response, file)
+            response_headers = response.headers
+        if not database.prepare_mappings_db(tmp_path):
+            control.log("### Failed to update mappings: downloaded file is invalid")
+            return
+        database.close_connections(control.mappingDB)
+        os.replace(tmp_path, control.mappingDB)
+        database.invalidate_mapping_index()
+        client.remember_validators(url, response_headers)
         control.log("### Mappings updated successfully")
-    except urllib.error.URLError as e:
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            control.log("### Mappings are up to date")
+        else:
+            control.log(f"### Failed to update mappings: {e}")
+    except (urllib.error.URLError, OSError) as e:
         control.log(f"### Failed to update mappings: {e}")
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def sync_watchlist(silent=False):
@@ -227,6 +248,7 @@ if __name__ == "__main__":
     control.log('##################  RUNNING MAINTENANCE  ######################')
     version_check()
     database_sync.SyncDatabase()
+    database.cache_sweep()
     refresh_apis()
     if control.getInt('update.time.30') == 0 or control.getInt('update.time.7') == 0:
         update_mappings_db()
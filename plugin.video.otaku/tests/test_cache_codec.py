@@ -0,0 +1,93 @@
+import ast
+import threading
+import time
+
+from resources.lib.ui import database
+from resources.lib.ui.database import SQL
+
+
+def _anilist_page(count=50):
+    return {
+        'pageInfo': {'hasNextPage': True, 'currentPage': 2},
+        'media': [{
+            'id': 150000 + i,
+            'idMal': None if i % 7 == 0 else 50000 + i,
+            'title': {'romaji': f'Sousou no Frieren {i}', 'english': 'Frieren: Beyond Journey’s End', 'native': '葬送のフリーレン'},
+            'genres': ['Adventure', 'Drama', 'Fantasy'],
+            'averageScore': 91.5 - i / 10,
+            'isAdult': False,
+            'episodes': 28,
+            'description': f'An elf mage outlives her party ({i}). ' * 20,
+            'studios': {'edges': [{'isMain': True, 'node': {'name': 'Madhouse'}}]},
+            'nextAiringEpisode': None
+        } for i in range(count)]
+    }
+
+
+def test_codec_round_trips_what_repr_literal_eval_did():
+    for value in (_anilist_page(3), _anilist_page(), [], None, 'text', 0, [1, 2.5, (3, 4)], {'a': {1, 2}}):
+        assert database.cache_decode(*database.cache_encode(value)) == ast.literal_eval(repr(value)) == value
+
+
+def test_large_results_are_compressed():
+    small_format, _ = database.cache_encode(_anilist_page(3))
+    large_format, large = database.cache_encode(_anilist_page())
+    assert small_format == database.CACHE_FORMAT_PICKLE
+    assert large_format == database.CACHE_FORMAT_PICKLE_ZLIB
+    assert len(large) < len(repr(_anilist_page()))
+
+
+def test_get_serves_equal_copies_from_memory_and_disk():
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return _anilist_page()
+
+    first = database.get(fetch, 1, 'codec')
+    assert database.get(fetch, 1, 'codec') == first
+    database.memory_cache.clear()
+    assert database.get(fetch, 1, 'codec') == first
+    assert calls == ['codec']
+
+
+def test_legacy_rows_are_fetched_again():
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return {'fresh': True}
+
+    key = database.hash_function(fetch, ('legacy',), {})
+    database.cache_insert(key, {'fresh': False}, 1)
+    with SQL(database.control.cacheFile) as cursor:
+        cursor.execute('UPDATE cache SET format=0, value=? WHERE key=?', (repr({'fresh': False}), key))
+        cursor.connection.commit()
+    database.memory_cache.clear()
+    assert database.get(fetch, 1, 'legacy') == {'fresh': True}
+    assert calls == ['legacy']
+
+
+def test_unpicklable_results_are_returned_uncached():
+    lock = threading.Lock()
+    calls = []
+
+    def fetch(page):
+        calls.append(page)
+        return {'lock': lock}
+
+    assert database.get(fetch, 1, 'unpicklable')['lock'] is lock
+    assert database.get(fetch, 1, 'unpicklable')['lock'] is lock
+    assert calls == ['unpicklable', 'unpicklable']
+
+
+def test_expired_memory_entries_count_as_misses():
+    cache = database.MemoryCache()
+    format_id, data = database.cache_encode({'a': 1})
+    cache.put('fresh', format_id, data, int(time.time()))
+    cache.put('old', format_id, data, int(time.time()) - 7200)
+    assert cache.get('fresh', 1) == (format_id, data, cache._entries['fresh'][2])
+    assert cache.get('old', 1) is None
+    assert cache.get('old') is not None  # no duration: the caller judges freshness itself
+    assert cache.get('missing', 1) is None
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 2)
@@ -0,0 +1,15 @@
+import os
+
+from resources.lib.ui import control, database
+
+
+def test_cache_table_recreated_after_data_wipe():
+    database.cache_insert('before_wipe', {'a': 1}, 1)
+    assert database._cache_table_ready
+
+    # what control.clear_settings does before removing the profile
+    database.close_connections()
+    os.remove(control.cacheFile)
+
+    database.cache_insert('after_wipe', {'b': 2}, 1)
+    assert database.cache_get('after_wipe') is not None
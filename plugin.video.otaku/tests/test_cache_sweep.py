@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import time
+
+import pytest
+
+from resources.lib.ui import control, database
+
+
+@pytest.fixture
+def fresh_cache_db():
+    # a cache.db as older versions left it: no auto_vacuum
+    database.close_connections(control.cacheFile)
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(control.cacheFile + suffix):
+            os.remove(control.cacheFile + suffix)
+    database.cache_insert('seed', 'value', 1)
+    yield
+    database.close_connections(control.cacheFile)
+
+
+def _auto_vacuum():
+    with database.SQL(control.cacheFile) as cursor:
+        return cursor.execute('PRAGMA auto_vacuum').fetchone()['auto_vacuum']
+
+
+def test_conversion_waits_until_nothing_else_has_the_file_open(fresh_cache_db):
+    assert _auto_vacuum() == 0
+    other = sqlite3.connect(control.cacheFile, timeout=60)
+    assert other.execute('SELECT COUNT(*) FROM cache').fetchone() == (1,)
+
+    start = time.time()
+    database.cache_sweep()
+    assert time.time() - start < 5
+    assert _auto_vacuum() == 0
+    # the other connection was not locked out, neither is this one afterwards
+    other.execute("INSERT INTO cache (key, value, date, format) VALUES ('other', 'x', 0, 1)")
+    other.commit()
+    database.cache_insert('after', 'value', 1)
+    with database.SQL(control.cacheFile) as cursor:
+        assert cursor.execute('PRAGMA busy_timeout').fetchone()['timeout'] == 60000
+    other.close()
+
+    database.cache_sweep()
+    assert _auto_vacuum() == 2
+
+
+def test_sweep_keeps_rows_stored_without_a_duration(fresh_cache_db):
+    database.cache_insert('forever', {'kept': True})
+    database.cache_insert('expired', {'kept': False}, -1)
+    database.cache_insert('legacy', {'kept': False}, 1)
+    with database.SQL(control.cacheFile) as cursor:
+        cursor.execute("UPDATE cache SET format=0 WHERE key='legacy'")
+        cursor.connection.commit()
+
+    database.cache_sweep()
+    assert database.cache_get('forever') is not None
+    assert database.cache_get('expired') is None
+    assert database.cache_get('legacy') is None
@@ -0,0 +1,71 @@
+import http.server
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resources.lib.ui import client
+
+CALLS = 600
+WORKERS = 12
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/redirect'):
+            self._send(302, headers=[('Location', '/echo')])
+        elif self.path.startswith('/setcookie'):
+            self._send(200, b'ok', [('Set-Cookie', f'who={self.path.split("=")[-1]}; Path=/')])
+        else:
+            body = json.dumps({'path': self.path, 'cookie': self.headers.get('Cookie')}).encode()
+            self._send(200, body, [('Content-Type', 'application/json'), ('Cache-Control', 'no-store')])
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def _echo(response):
+    return json.loads(response)
+
+
+def _call(base_url, i):
+    kind = i % 5
+    if kind == 0:
+        # redirect=False must not leak into a neighbour's opener
+        return client.request(f'{base_url}/redirect?{i}', redirect=False, output='status_code', cache=False) == 302
+    if kind == 1:
+        return _echo(client.request(f'{base_url}/redirect?{i}', cache=False))['path'] == '/echo'
+    if kind == 2:
+        return client.request(f'{base_url}/setcookie?name=t{i}', output='cookie', cache=False) == f'who=t{i}'
+    if kind == 3:
+        return _echo(client.request(f'{base_url}/echo?{i}', cookie=f'who=c{i}', cache=False))['cookie'] == f'who=c{i}'
+    # no cookie given, nothing set by the other calls may be sent
+    return _echo(client.request(f'{base_url}/echo?{i}', cache=False))['cookie'] is None
+
+
+def test_redirects_and_cookies_stay_per_call(base_url):
+    with ThreadPoolExecutor(WORKERS) as executor:
+        results = list(executor.map(lambda i: _call(base_url, i), range(CALLS)))
+    failed = [i for i, ok in enumerate(results) if not ok]
+    assert failed == []
@@ -0,0 +1,69 @@
+import http.server
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resources.lib.ui import client
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            self.connections.add(self.client_address)
+        body = (self.path * 200).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.path.startswith('/close'):
+            self.close_connection = True
+
+    do_HEAD = do_GET
+
+
+@pytest.fixture
+def base_url():
+    client._pool.clear()
+    _Handler.connections.clear()
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+    client._pool.clear()
+
+
+def test_sequential_requests_share_one_connection(base_url):
+    for i in range(50):
+        assert client.request(f'{base_url}/seq{i}', cache=False) == f'/seq{i}' * 200
+    assert client.get(f'{base_url}/get', cache=False).text == '/get' * 200
+    assert len(_Handler.connections) == 1
+
+
+def test_concurrent_requests_get_their_own_body(base_url):
+    def call(i):
+        return client.request(f'{base_url}/par{i}', cache=False) == f'/par{i}' * 200
+
+    with ThreadPoolExecutor(8) as executor:
+        assert all(executor.map(call, range(400)))
+    assert len(_Handler.connections) <= 8
+
+
+def test_cut_short_and_closed_connections_are_not_reused(base_url):
+    # a 1 KB limit read leaves the rest of the body on the socket
+    assert client.request(f'{base_url}/limit', limit=1, cache=False) == ('/limit' * 200)[:1024]
+    assert client.request(f'{base_url}/after-limit', cache=False) == '/after-limit' * 200
+    assert client.request(f'{base_url}/close', cache=False) == '/close' * 200
+    # the server closed that socket, the next call notices and opens a new one
+    assert client.request(f'{base_url}/after-close', cache=False) == '/after-close' * 200
+    assert len(_Handler.connections) == 3
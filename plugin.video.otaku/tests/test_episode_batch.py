@@ -0,0 +1,48 @@
+import pickle
+
+from resources.lib.ui import database, thread_pool
+
+EPISODES = 120
+
+
+def _write(mal_id, number):
+    kodi_meta = pickle.dumps({'title': f'Episode {number}', 'plot': 'x' * (number % 17)})
+    database.update_episode(mal_id, 1 + number // 50, number, '2026-10-18', kodi_meta, filler='Filler' if number % 9 == 0 else '', anidb_ep_id=number * 3)
+
+
+def _show(*mal_ids):
+    for mal_id in mal_ids:
+        database.update_show(mal_id, pickle.dumps({'name': str(mal_id)}))
+
+
+def _rows(mal_id):
+    return sorted((row['season'], row['number'], row['kodi_meta'], row['last_updated'], row['filler'], row['anidb_ep_id'])
+                  for row in database.get_episode_list(mal_id))
+
+
+def test_batched_writes_match_per_row_writes(sync_tables, monkeypatch):
+    _show(1001, 1002)
+    for number in range(1, EPISODES + 1):
+        _write(1001, number)
+
+    flushes = []
+    update_episodes = database.update_episodes
+    monkeypatch.setattr(database, 'update_episodes', lambda rows: flushes.append(len(rows)) or update_episodes(rows))
+    with database.episode_batch(1002):
+        with database.episode_batch(1002):
+            thread_pool.SharedPool(8).map(lambda number: _write(1002, number), range(1, EPISODES + 1))
+        assert database.get_episode_list(1002) == []
+    assert flushes == [EPISODES]
+
+    assert _rows(1002) == _rows(1001)
+    for number in range(1, EPISODES + 1):
+        per_row, batched = database.get_episode(1001, number), database.get_episode(1002, number)
+        assert dict(batched, mal_id=1001) == per_row
+
+
+def test_writes_outside_a_batch_go_straight_through(sync_tables):
+    _show(2001, 2002)
+    with database.episode_batch(2001):
+        _write(2002, 1)
+        assert database.get_episode(2002, 1)['number'] == 1
+    assert database.get_episode(2001) is None
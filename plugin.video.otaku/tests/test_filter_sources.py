@@ -0,0 +1,108 @@
+import copy
+import itertools
+import random
+
+import pytest
+
+from resources.lib.ui import database, source_utils
+import legacy_source_utils as legacy
+
+NAMES = [
+    '[SubsPlease] Sousou no Frieren - 05 (1080p) [F02B9CB2].mkv',
+    '[Erai-raws] Sousou no Frieren - 01 ~ 12 [1080p][Multiple Subtitle]',
+    '[Judas] Mushoku Tensei S2 - 05 [1080p][HEVC x265 10bit][Multi-Subs]',
+    'Jujutsu Kaisen S02E17 Dual Audio 1080p BluRay DTS-HD MA 5.1 x265-GROUP',
+    'Attack on Titan The Final Season Part 2 - 12 [1080p]',
+    'Attack on Titan The Final Season Part 1-2 Batch [BD 1080p]',
+    'Spy x Family Season 2 [Batch] [BD 1080p AV1 Opus 2.0] [Dual Audio]',
+    'Spy x Family Season 1 Cour 2 - 24 [720p]',
+    'Bleach TYBW Episode 20 (WEB 1080p E-AC-3 8ch)',
+    'Mob Psycho 100 III - 12 [720p][HEVC][Opus 2.0ch]',
+    'Oshi no Ko 2nd Season 05 [1080p]',
+    'One Piece E1085 1080p WEB-DL AAC2.0 H.264-VARYG',
+    'Frieren 2023 Complete Series 1080p',
+    'Kaguya-sama S03 E03 [CR WEB-DL 1080p]',
+    'Vinland Saga season 2 ep 24 multi audio',
+    'Made in Abyss 1080p SDR',
+    'Naruto Shippuden Ep 500 Season 20',
+    '',
+]
+
+TOKENS = [
+    'Frieren', 'Sousou no', 'Mushoku Tensei', 'Oshi no Ko', 'The Final Season', 'III', '2nd Season',
+    'S1', 'S2', 'S02', 'Season 1', 'Season 2', 'season 3', 'S01E05', 's2e12', 'E05', 'EP12', 'ep 3',
+    'Episode 24', '- 05', '- 12', '- 1', '01 ~ 12', '1-24', '13 - 24', '05 06', 'Part 1', 'Part 2',
+    'part 1-2', 'Cour 2', 'cour 1&2', '1080p', '720p', '4k', 'x265', 'HEVC', '10bit', 'h.264', 'AAC2.0',
+    'DDP5.1', 'Opus 2.0', 'Dual Audio', 'Dubbed', 'Batch', 'Complete Series', 'WEB-DL', 'BluRay',
+    '[SubsPlease]', '(BD)', '[F02B9CB2]', '.mkv', 'v2', '2023', '1st', '100',
+]
+SEPARATORS = [' ', '.', '_', ' - ', '][', ') (']
+
+
+def _generated_names(count, seed=2022):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = rng.sample(TOKENS, rng.randint(1, 7))
+        name = parts[0]
+        for part in parts[1:]:
+            name += rng.choice(SEPARATORS) + part
+        yield name.upper() if rng.random() < 0.2 else name
+
+
+CORPUS = NAMES + list(_generated_names(3000))
+
+
+def _torrents(provider, names):
+    for i, name in enumerate(names):
+        if provider == 'nyaa':
+            yield {'name': name, 'magnet': f'magnet:?xt=urn:btih:{i:040x}&dn=x'}
+        elif provider == 'realdebrid':
+            yield {'filename': name, 'hash': f'{i:040x}'}
+        elif provider == 'alldebrid':
+            yield {'filename': name, 'link': f'https://alldebrid.com/f/{i:x}/file'}
+        elif provider == 'animetosho':
+            yield {'name': name, 'hash': f'{i:040x}'} if i % 5 else {'name': name}
+        else:
+            yield {'name': name, 'path': f'/media/{i}', 'id': str(i)}
+
+
+def _assert_matches_legacy(provider, names, requests):
+    torrents = list(_torrents(provider, names))
+    for mal_id, season, episode, part in requests:
+        current = source_utils.filter_sources(provider, copy.deepcopy(torrents), mal_id, season, episode, part)
+        expected = legacy.filter_sources(provider, copy.deepcopy(torrents), mal_id, season, episode, part)
+        assert current == expected, (provider, mal_id, season, episode, part)
+
+
+@pytest.fixture(autouse=True)
+def mappings(monkeypatch):
+    # mal_id 1 is an absolute-numbered show whose season 1 must not be filtered on
+    monkeypatch.setattr(database, 'get_mappings', lambda mal_id, key: {'thetvdb_season': 'a'} if mal_id == 1 else None)
+
+
+@pytest.mark.parametrize('provider', ['nyaa', 'realdebrid', 'alldebrid', 'animetosho', 'local', 'premiumize', 'torbox', 'unknown'])
+def test_every_provider_matches_legacy(provider):
+    _assert_matches_legacy(provider, NAMES, itertools.product((1, 2), (None, 1, 2), (None, 1, 5, 12, 24), (None, 1, 2)))
+
+
+@pytest.mark.parametrize('chunk', range(4))
+def test_generated_names_match_legacy(chunk):
+    _assert_matches_legacy('nyaa', CORPUS[chunk::4], itertools.product((1, 2), (None, 1, 2), (None, 5, 12), (None, 2)))
+
+
+def test_title_cleaning_matches_legacy():
+    for name in CORPUS:
+        lowered = name.lower()
+        assert source_utils.remove_patterns(lowered) == legacy.remove_patterns(lowered), name
+        assert source_utils.cleanup_text(lowered) == legacy.cleanup_text(lowered), name
+        assert source_utils.clean_text(lowered) == legacy.clean_text(lowered), name
+        assert source_utils.clean_text(name) == legacy.clean_text(name), name
+
+
+def test_parse_release_is_memoized_per_title():
+    source_utils.parse_release.cache_clear()
+    for name in CORPUS:
+        source_utils.parse_release(name)
+        source_utils.parse_release(name.upper())
+    info = source_utils.parse_release.cache_info()
+    assert info.misses == len(set(CORPUS) | {name.upper() for name in CORPUS})
@@ -0,0 +1,49 @@
+import pickle
+import threading
+
+from resources.lib.ui import database
+
+
+def _meta(show):
+    return pickle.loads(show['kodi_meta'])
+
+
+def test_writes_from_other_threads_drop_prefetched_rows(sync_tables):
+    database.update_show(3001, pickle.dumps({'name': 'old'}))
+    database.update_show(3002, pickle.dumps({'name': 'untouched'}))
+    with database.prefetch([3001, 3002]):
+        assert _meta(database.get_show(3001)) == {'name': 'old'}
+        writer = threading.Thread(target=database.update_show, args=(3001, pickle.dumps({'name': 'new'})))
+        writer.start()
+        writer.join()
+        assert _meta(database.get_show(3001)) == {'name': 'new'}
+        assert database._prefetched('shows', 3002) is not database._MISSING
+    assert not database._prefetch_active
+
+
+def test_prefetch_is_only_read_on_the_entering_thread(sync_tables):
+    database.update_show(3101, pickle.dumps({'name': 'show'}))
+    seen = []
+    with database.prefetch([3101]):
+        assert database._prefetched('shows', 3101) is not database._MISSING
+        worker = threading.Thread(target=lambda: seen.append(database._prefetched('shows', 3101)))
+        worker.start()
+        worker.join()
+    assert seen == [database._MISSING]
+
+
+def test_write_while_loading_is_not_served_stale(sync_tables, monkeypatch):
+    database.update_show(3201, pickle.dumps({'name': 'old'}))
+    get_shows = database.get_shows
+
+    def racing_get_shows(mal_ids):
+        rows = get_shows(mal_ids)
+        # another thread updates the show after its row was read but before the block is active
+        writer = threading.Thread(target=database.update_show, args=(3201, pickle.dumps({'name': 'new'})))
+        writer.start()
+        writer.join()
+        return rows
+
+    monkeypatch.setattr(database, 'get_shows', racing_get_shows)
+    with database.prefetch([3201]):
+        assert _meta(database.get_show(3201)) == {'name': 'new'}
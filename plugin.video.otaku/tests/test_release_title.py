@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from resources.lib.ui import source_utils
+import legacy_source_utils as legacy
+
+TITLES = [
+    '[SubsPlease] Frieren - 01 (1080p) [F02B9CB2].mkv',
+    '[Erai-raws] Sousou no Frieren - 12 [720p][Multiple Subtitle][ENG][POR-BR]',
+    '[Judas] Mushoku Tensei S2 - 05 [1080p][HEVC x265 10bit][Multi-Subs] (Weekly)',
+    'One Piece E1085 1080p WEB-DL AAC2.0 H.264-VARYG',
+    'Jujutsu Kaisen S02E17 Dual Audio 1080p BluRay DTS-HD MA 5.1 x265-GROUP',
+    'Attack on Titan - The Final Season (BD 2160p HDR10 HEVC TrueHD Atmos 7.1) [Dual-Audio]',
+    'Spy x Family Season 2 [Batch] [BD 1080p AV1 Opus 2.0] [Dual Audio]',
+    'Demon Slayer - Complete Series (2019-2024) 1O80p WEBRip DDP5.1 Dubbed',
+    'Cowboy Bebop 1998 720p DVDRip XviD AC3 6ch',
+    'Akira (1988) 4K UHD BluRay 2160p HEVC DTS-X Dolby Vision REMUX',
+    'Your Name 2016 72op HDTV mp4 wmv mpeg divx vp9',
+    'Neon Genesis Evangelion - 01 [BDRip 1920x1080 x264 FLAC] multi audio multi sub',
+    'Bleach TYBW - 20 (WEB 1080p E-AC-3 8ch) [KORSUB] HC',
+    "Kaguya-sama wa Kokurasetai - 03 [CR WEB-DL 216op] Kaguya's Love",
+    'Naruto Shippuden Ep 500 HDCAM TS telesync 60fps 3D half sbs',
+    'Chainsaw Man - 11 (DVDSCR screener) blurred PDTV HDRip',
+    'Vinland Saga S2 - 24 [Multi Lang] [DTS HR] [dd+ eac3] [wma]',
+    'Mob Psycho 100 III - 12 [720p][HEVC][Opus 2.0ch][Multiple Audio]',
+    'Made in Abyss &#039;s Golden City 1080p SDR dv dovi',
+    'Oshi no Ko - 01 [高画質 1080p] ★ dub',
+    '',
+]
+
+# Needles and filler the generated titles are assembled from, so tags meet at word boundaries,
+# inside words and next to punctuation
+TOKENS = [
+    'x264', 'x 264', 'h.264', 'hevc', 'x265', 'avc', 'xvid', 'divx', 'mp4', 'wmv', 'mpeg', 'vp9', 'av1',
+    'remux', 'bdremux', 'hdr', 'hdr10', 'hdr 10', 'sdr', 'dv', 'dovi', 'dolby vision', 'aac', 'aac2.0',
+    'dts', 'dts-hd ma', 'hdma', 'dts hr', 'dtsx', 'dts x', 'atmos', 'truehd', 'true hd', 'ddp', 'dd+',
+    'eac3', 'e-ac3', 'e ac 3', 'dd', 'dd2', 'dd5.1', 'ac3', 'ac 3', 'mp3', 'wma', 'opus', 'dub', 'dubbed',
+    'dual audio', 'dual-audio', 'multi audio', 'multi-lang', 'multiple audio', 'multi sub', 'multiple subs',
+    '2.0', '2ch', '5.1', '5.1ch', '6ch', '7.1', '8ch', 'bluray', 'blu-ray', 'bdrip', 'brrip', 'web',
+    'web-dl', 'webrip', 'hdrip', 'hd rip', 'dvdrip', 'hdtv', 'pdtv', 'cam', 'camrip', 'hdcam', 'ts', 'hdts',
+    'telesync', 'tc', 'hdtc', 'telecine', 'xbet', 'dvdscr', 'scr', 'screener', 'korsub', 'kor', 'hc',
+    'blurred', '3d', 'half ou', 'half sbs', '60 fps', '60fps', 'batch', 'complete series',
+    '4k', '2160p', '216op', '1080p', '1o80', '108op', '720p', '72op', '480p', 'uhd bluray 2160p',
+    '2160p bluray hevc truehd', '2160p us bluray hevc dts',
+    '[SubsPlease]', '(BD)', 'Frieren', 'One Piece', "Kaguya's", '&', '-', '_', '.', '01', 'S02E05', 'Season 2',
+]
+SEPARATORS = [' ', '.', '_', '-', '', '][', ') (']
+
+
+def _generated_titles(count, seed=2021):
+    rng = random.Random(seed)
+    for _ in range(count):
+        parts = rng.sample(TOKENS, rng.randint(1, 8))
+        title = parts[0]
+        for part in parts[1:]:
+            title += rng.choice(SEPARATORS) + part
+        yield title.upper() if rng.random() < 0.2 else title
+
+
+CORPUS = TITLES + list(_generated_titles(5000))
+
+
+@pytest.mark.parametrize('chunk', range(10))
+def test_release_title_info_matches_legacy_parsers(chunk):
+    for title in CORPUS[chunk::10]:
+        info = source_utils.ReleaseTitleInfo(title)
+        assert (info.quality, info.lang, info.sub, info.channel, info.info) == (
+            legacy.getQuality(title),
+            legacy.getAudio_lang(title),
+            legacy.getSubtitle_lang(title),
+            legacy.getAudio_channel(title),
+            legacy.getInfo(title)
+        ), title
+
+
+def test_clean_title_matches_legacy():
+    for title in CORPUS:
+        assert source_utils.cleanTitle(title) == legacy.cleanTitle(title), title
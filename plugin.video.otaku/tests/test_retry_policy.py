@@ -0,0 +1,53 @@
+import collections
+import http.server
+import threading
+
+import pytest
+
+from resources.lib.ui import client
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    hits = collections.Counter()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.hits[self.path] += 1
+        if self.path.startswith('/drop') and self.hits[self.path] == 1:
+            self.close_connection = True
+            return
+        status = 503 if self.path.startswith('/challenge') else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_unlisted_host_gets_its_503_back_on_the_first_hit(base_url):
+    # a Cloudflare challenge must reach the caller instead of being fetched again
+    assert client.request(f'{base_url}/challenge', error=True, output='status_code', cache=False) == 503
+    assert _Handler.hits['/challenge'] == 1
+
+
+def test_unlisted_host_retries_a_dropped_connection(base_url):
+    assert client.get(f'{base_url}/drop', cache=False).text == 'ok'
+    assert _Handler.hits['/drop'] == 2
+
+
+def test_listed_host_retries_its_statuses(base_url, monkeypatch):
+    monkeypatch.setitem(client.RETRY_POLICIES, '127.0.0.1', client.RetryPolicy(attempts=3, statuses=(503,), backoff=0.01))
+    assert client.request(f'{base_url}/challenge-api', error=True, output='status_code', cache=False) == 503
+    assert _Handler.hits['/challenge-api'] == 3
@@ -0,0 +1,32 @@
+from resources.lib.ui import scrape_engine
+
+
+async def _running_engine():
+    return scrape_engine._engine()
+
+
+def _provider():
+    # an unconverted provider going through the sync adapter
+    return scrape_engine.run_sync(_running_engine)
+
+
+def test_run_sync_uses_the_engine_that_started_the_provider():
+    with scrape_engine.Engine() as first, scrape_engine.Engine() as second:
+        first.submit('first', _provider, deadline=5)
+        second.submit('second', _provider, deadline=5)
+        assert dict((name, result) for name, result, _ in first.as_completed(5)) == {'first': first}
+        assert dict((name, result) for name, result, _ in second.as_completed(5)) == {'second': second}
+
+
+def test_run_sync_without_a_scrape_uses_a_short_lived_engine():
+    engine = _provider()
+    assert isinstance(engine, scrape_engine.Engine)
+    assert engine.loop.is_closed()
+
+
+def test_engines_share_executors_that_outlive_them():
+    with scrape_engine.Engine() as first:
+        executors = first._io_executor, first._sync_executor
+    with scrape_engine.Engine() as second:
+        assert (second._io_executor, second._sync_executor) == executors
+        assert second.run(second.run_blocking(sum, (1, 2))) == 3
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from resources.lib.ui import database
+
+CALLERS = 8
+
+
+class _CountingEvent(threading.Event):
+    """Event that counts the threads parked on it, so the leader is only released once every follower waits"""
+    waiting = 0
+    lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with _CountingEvent.lock:
+            _CountingEvent.waiting += 1
+        return super().wait(timeout)
+
+
+class _CountingFlight(database._Flight):
+    def __init__(self):
+        super().__init__()
+        self.event = _CountingEvent()
+
+
+@pytest.fixture(autouse=True)
+def counting_flights(monkeypatch):
+    _CountingEvent.waiting = 0
+    monkeypatch.setattr(database, '_Flight', _CountingFlight)
+
+
+def _run_concurrently(key, function):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = [None] * CALLERS
+    errors = [None] * CALLERS
+
+    def slow(*args):
+        calls.append(args)
+        started.set()
+        release.wait(10)
+        return function(*args)
+
+    def caller(idx):
+        try:
+            results[idx] = database._single_flight(key, slow, ('arg',), {}, 1)
+        except Exception as e:
+            errors[idx] = e
+
+    threads = [threading.Thread(target=caller, args=(idx,)) for idx in range(CALLERS)]
+    threads[0].start()
+    assert started.wait(10)
+    for thread in threads[1:]:
+        thread.start()
+    for _ in range(1000):
+        if _CountingEvent.waiting == CALLERS - 1:
+            break
+        threading.Event().wait(0.01)
+    assert _CountingEvent.waiting == CALLERS - 1
+    release.set()
+    for thread in threads:
+        thread.join(10)
+    assert key not in database._inflight
+    return calls, results, errors
+
+
+def test_concurrent_callers_share_one_execution():
+    calls, results, errors = _run_concurrently('single_flight_result', lambda arg: {'value': [arg]})
+    assert calls == [('arg',)]
+    assert errors == [None] * CALLERS
+    assert results == [{'value': ['arg']}] * CALLERS
+    # followers get a decoded copy, not the leader's object
+    assert len({id(result) for result in results}) == CALLERS
+
+
+def test_error_reaches_every_waiter():
+    def fail(arg):
+        raise ValueError('provider down')
+
+    calls, results, errors = _run_concurrently('single_flight_error', fail)
+    assert calls == [('arg',)]
+    assert results == [None] * CALLERS
+    assert all(isinstance(e, ValueError) and str(e) == 'provider down' for e in errors)
+    # each waiter gets its own exception, chained to the one the leader raised
+    leader, waiters = errors[0], errors[1:]
+    assert len({id(e) for e in errors}) == CALLERS
+    assert all(e.__cause__ is leader for e in waiters)
+
+
+def test_error_copies_keep_their_attributes():
+    error = OSError(2, 'No such file', 'mappings.db')
+    error.provider = 'nyaa'
+    copied = database._waiter_error(error)
+    assert copied is not error
+    assert (type(copied), copied.errno, copied.filename, copied.provider) == (FileNotFoundError, 2, 'mappings.db', 'nyaa')
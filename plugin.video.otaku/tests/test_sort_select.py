@@ -0,0 +1,119 @@
+import random
+from operator import itemgetter
+
+import pytest
+
+from resources.lib.windows import sort_select
+
+TRIALS = 4000
+TYPES = ['torrent', 'torrent (uncached)', 'cloud', 'local', 'embed', 'direct', 'hoster']
+DEBRIDS = ['Real-Debrid', 'Premiumize', 'Alldebrid', 'Debrid-Link', 'Torbox', 'TorBox', 'EasyDebrid', 'Local-Debrid', '', None]
+
+
+# Reference: the per-method stable passes sortSources ran before sort_select.sort_key, level 9 first
+def sort_by_none(list_, reverse):
+    return list_
+
+
+def sort_by_resolution(list_, reverse):
+    list_.sort(key=itemgetter('quality'), reverse=reverse)
+    return list_
+
+
+def sort_by_size(list_, reverse):
+    list_.sort(key=itemgetter('byte_size'), reverse=reverse)
+    return list_
+
+
+def sort_by_seeders(list_, reverse):
+    list_.sort(key=itemgetter('seeders'), reverse=reverse)
+    return list_
+
+
+def sort_by_audio_channels(list_, reverse):
+    list_.sort(key=itemgetter('channel'), reverse=reverse)
+    return list_
+
+
+def sort_by_debrid_provider(list_, reverse):
+    for i in range(len(sort_select.SORT_OPTIONS['debrid provider']), 0, -1):
+        list_.sort(key=lambda x: x['debrid_provider'] in sort_select.debrid_provider[int(sort_select.sort_options[f'debrid provider.{i}'])], reverse=reverse)
+    return list_
+
+
+def sort_by_source_type(list_, reverse):
+    def source_type_key(item):
+        if item['type'] == 'torrent':
+            return 0
+        elif item['type'] == 'torrent (uncached)':
+            return 1
+        else:
+            return 2
+
+    list_.sort(key=source_type_key)
+    for i in range(len(sort_select.SORT_OPTIONS['source type']), 0, -1):
+        list_.sort(key=lambda x: x['type'] in sort_select.source_type[int(sort_select.sort_options[f'source type.{i}'])], reverse=reverse)
+    return list_
+
+
+def sort_by_audio(list_, reverse):
+    for i in range(len(sort_select.SORT_OPTIONS['audio']), 0, -1):
+        list_.sort(key=lambda x: x['lang'] == sort_select.audio[int(sort_select.sort_options[f'audio.{i}'])], reverse=reverse)
+    return list_
+
+
+def sort_by_subtitles(list_, reverse):
+    for i in range(len(sort_select.SORT_OPTIONS['subtitles']), 0, -1):
+        list_.sort(key=lambda x: x['sub'] == sort_select.subtitles[int(sort_select.sort_options[f'subtitles.{i}'])], reverse=reverse)
+    return list_
+
+
+def multi_pass_sort(list_):
+    sort_options = sort_select.sort_options
+    for x in range(len(sort_select.SORT_METHODS), 0, -1):
+        reverse = sort_options[f'sortmethod.{x}.reverse']
+        method = sort_select.SORT_METHODS[int(sort_options[f'sortmethod.{x}'])].replace(' ', '_')
+        list_ = globals()[f'sort_by_{method}'](list_, not reverse)
+    return list_
+
+
+def _random_options(rng):
+    options = {}
+    for x in range(1, len(sort_select.SORT_METHODS) + 1):
+        options[f'sortmethod.{x}'] = rng.randrange(len(sort_select.SORT_METHODS))
+        options[f'sortmethod.{x}.reverse'] = rng.random() < 0.5
+    for category in ('source type', 'debrid provider', 'audio', 'subtitles'):
+        for i in range(1, len(sort_select.SORT_OPTIONS[category]) + 1):
+            # duplicates allowed, cycling the options in the window can produce them
+            options[f'{category}.{i}'] = rng.randrange(len(sort_select.SORT_OPTIONS[category]))
+    return options
+
+
+def _random_source(rng):
+    return {
+        'type': rng.choice(TYPES),
+        'debrid_provider': rng.choice(DEBRIDS),
+        'lang': rng.randint(0, 3),
+        'sub': rng.randint(0, 1),
+        'quality': rng.randint(0, 4),
+        'byte_size': rng.choice([0, rng.randint(0, 5) * 10 ** 9, rng.randint(0, 2 ** 34)]),
+        'seeders': rng.choice([0, rng.randint(0, 20)]),
+        'channel': rng.randint(0, 3)
+    }
+
+
+@pytest.mark.parametrize('preset', ['default_sort_options', 'default_sub_options', 'default_dub_options', 'default_multi_audio_options', 'default_multi_sub_options'])
+def test_presets_match_multi_pass(monkeypatch, preset):
+    rng = random.Random(preset)
+    monkeypatch.setattr(sort_select, 'sort_options', dict(getattr(sort_select, preset)))
+    sources = [_random_source(rng) for _ in range(300)]
+    assert [id(i) for i in sort_select.sort_sources(list(sources))] == [id(i) for i in multi_pass_sort(list(sources))]
+
+
+def test_random_options_match_multi_pass(monkeypatch):
+    rng = random.Random(2024)
+    for trial in range(TRIALS):
+        monkeypatch.setattr(sort_select, 'sort_options', _random_options(rng))
+        sources = [_random_source(rng) for _ in range(rng.randint(0, 60))]
+        expected = [id(i) for i in multi_pass_sort(list(sources))]
+        assert [id(i) for i in sort_select.sort_sources(list(sources))] == expected, trial
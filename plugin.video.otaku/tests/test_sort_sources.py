@@ -0,0 +1,188 @@
+import random
+
+import pytest
+
+pytest.importorskip('bs4')
+
+from resources.lib import pages  # noqa: E402
+from resources.lib.ui import control  # noqa: E402
+from resources.lib.windows import sort_select  # noqa: E402
+
+INFO_TAGS = ['HDR', 'DV', 'HYBRID', 'HEVC', 'AV1', '3D', 'DUAL-AUDIO', 'BLURAY', 'WEB', 'DTS', 'ATMOS']
+TITLE_WORDS = ['Frieren', 'Judas', 'SubsPlease', 'Erai-raws', 'Batch', 'x265', 'Dual Audio', 'Dub', '1080p', 'v2']
+FILTER_WORDS = ['', '', 'judas', 'BATCH', 'dub', 'x265', 'v2', 'raws']
+
+
+def legacy_sort_sources(torrent_list, embed_list, cloud_files, local_files, media_type, duration):
+    """
+    Sources.sortSources before the single identity-based pass, kept verbatim except for the closing
+    sort, which is sort_select.sort_sources (its parity with the old passes lives in test_sort_select.py)
+    """
+    all_list = torrent_list + embed_list + cloud_files + local_files
+    sortedList = [x for x in all_list if control.getInt('general.minResolution') <= x['quality'] <= control.getInt('general.maxResolution')]
+
+    # Filter by size
+    filter_option = control.getInt('general.fileFilter')
+
+    if filter_option == 1:
+        # web speed limit
+        webspeed = control.getInt('general.webspeed')
+        len_in_sec = int(duration) * 60
+
+        _torrent_list = torrent_list
+        torrent_list = [i for i in _torrent_list if i['size'] != 'NA' and ((float(i['size'][:-3]) * 8000) / len_in_sec) <= webspeed]
+
+    elif filter_option == 2:
+        # hard limit
+        _torrent_list = torrent_list
+
+        if media_type == 'movie':
+            max_GB = float(control.getInt('general.movie.maxGB'))
+            min_GB = control.getNumber('general.movie.minGB')
+        else:
+            max_GB = float(control.getInt('general.episode.maxGB'))
+            min_GB = control.getNumber('general.episode.minGB')
+
+        torrent_list = []
+        for i in _torrent_list:
+            if i['size'] != 'NA':
+                size = float(i['size'][:-3])
+                unit = i['size'][-2:].strip()
+
+                if unit == 'MB':
+                    size /= 1024  # convert MB to GB for comparison
+
+                if min_GB <= size <= max_GB:
+                    torrent_list.append(i)
+
+    # Filter by release title
+    if control.getBool('general.release_title_filter.enabled'):
+        release_title_filter1 = control.getSetting('general.release_title_filter.value1')
+        release_title_filter2 = control.getSetting('general.release_title_filter.value2')
+        release_title_filter3 = control.getSetting('general.release_title_filter.value3')
+        release_title_filter4 = control.getSetting('general.release_title_filter.value4')
+        release_title_filter5 = control.getSetting('general.release_title_filter.value5')
+
+        # Get the new settings
+        exclude_filter1 = control.getBool('general.release_title_filter.exclude1')
+        exclude_filter2 = control.getBool('general.release_title_filter.exclude2')
+        exclude_filter3 = control.getBool('general.release_title_filter.exclude3')
+        exclude_filter4 = control.getBool('general.release_title_filter.exclude4')
+        exclude_filter5 = control.getBool('general.release_title_filter.exclude5')
+
+        _torrent_list = torrent_list
+        release_title_logic = control.getInt('general.release_title_filter.logic')
+        if release_title_logic == 0:
+            # AND filter (case-insensitive)
+            torrent_list = [
+                i for i in _torrent_list
+                if (not exclude_filter1 or release_title_filter1.lower() not in i['release_title'].lower())
+                and (not exclude_filter2 or release_title_filter2.lower() not in i['release_title'].lower())
+                and (not exclude_filter3 or release_title_filter3.lower() not in i['release_title'].lower())
+                and (not exclude_filter4 or release_title_filter4.lower() not in i['release_title'].lower())
+                and (not exclude_filter5 or release_title_filter5.lower() not in i['release_title'].lower())
+            ]
+        if release_title_logic == 1:
+            # OR filter (case-insensitive)
+            torrent_list = [
+                i for i in _torrent_list
+                if (release_title_filter1 != "" and (exclude_filter1 ^ (release_title_filter1.lower() in i['release_title'].lower())))
+                or (release_title_filter2 != "" and (exclude_filter2 ^ (release_title_filter2.lower() in i['release_title'].lower())))
+                or (release_title_filter3 != "" and (exclude_filter3 ^ (release_title_filter3.lower() in i['release_title'].lower())))
+                or (release_title_filter4 != "" and (exclude_filter4 ^ (release_title_filter4.lower() in i['release_title'].lower())))
+                or (release_title_filter5 != "" and (exclude_filter5 ^ (release_title_filter5.lower() in i['release_title'].lower())))
+            ]
+
+    # Update sortedList to include the filtered torrent_list
+    sortedList = [x for x in sortedList if x in torrent_list or x in embed_list or x in cloud_files or x in local_files]
+
+    # Apply general.filters (comprehensive filtering like Seren)
+    filter_list = control.getStringList("general.filters")
+    if filter_list:
+        current_filters = set(filter_list)
+        # Special HDR/DV handling (like Seren does for HYBRID sources)
+        disable_dv = "DV" in current_filters
+        disable_hdr = "HDR" in current_filters
+        filter_set = current_filters.difference({"HDR", "DV"})
+
+        filtered = []
+        for source in sortedList:
+            # Skip if ANY filtered tag is in source info (set intersection)
+            if filter_set & set(source['info']):
+                continue
+            # DV filter: exclude DV sources unless they're HYBRID
+            if disable_dv and "DV" in source['info'] and "HYBRID" not in source['info']:
+                continue
+            # HDR filter: exclude HDR sources unless they're HYBRID
+            if disable_hdr and "HDR" in source['info'] and "HYBRID" not in source['info']:
+                continue
+            # Hybrid filter: if both DV and HDR are disabled, exclude HYBRID too
+            if disable_dv and disable_hdr and "HYBRID" in source['info']:
+                continue
+            filtered.append(source)
+        sortedList = filtered
+
+    # Filter by language source
+    source = control.getInt("general.source")
+    if source != 0:
+        if source == 1:
+            sortedList = [i for i in sortedList if i['lang'] in [0, 1, 2]]
+        elif source == 2:
+            sortedList = [i for i in sortedList if i['lang'] in [0, 1, 3]]
+
+    return sort_select.sort_sources(sortedList)
+
+
+def _source(rng, n):
+    return {
+        'hash': n,
+        'quality': rng.randint(0, 4),
+        'size': rng.choice(['NA', f'{rng.uniform(0.05, 30):.2f} GB', f'{rng.randint(50, 2000)} MB']),
+        'release_title': ' '.join(rng.sample(TITLE_WORDS, rng.randint(1, 5))),
+        'info': rng.sample(INFO_TAGS, rng.randint(0, 4)),
+        'lang': rng.randint(0, 3),
+        'sub': rng.randint(0, 2),
+        'channel': rng.randint(0, 3),
+        'type': rng.choice(['torrent', 'torrent (uncached)', 'cloud', 'local', 'embed']),
+        'debrid_provider': rng.choice(['Real-Debrid', 'Premiumize', 'Torbox', '']),
+        'seeders': rng.randint(-1, 500),
+        'byte_size': rng.randint(0, 10 ** 10),
+    }
+
+
+def _settings(rng):
+    minimum = rng.randint(0, 4)
+    settings = {
+        'general.minResolution': minimum,
+        'general.maxResolution': rng.randint(minimum, 4),
+        'general.fileFilter': rng.choice([0, 1, 2]),
+        'general.webspeed': rng.choice([5, 20, 100]),
+        'general.movie.maxGB': rng.randint(1, 40),
+        'general.movie.minGB': rng.choice([0, 0.5, 2]),
+        'general.episode.maxGB': rng.randint(1, 10),
+        'general.episode.minGB': rng.choice([0, 0.1, 0.5]),
+        'general.release_title_filter.enabled': rng.random() < 0.7,
+        'general.release_title_filter.logic': rng.choice([0, 1, 2]),
+        'general.filters': rng.sample(INFO_TAGS, rng.randint(0, 3)),
+        'general.source': rng.choice([0, 1, 2]),
+    }
+    for x in range(1, 6):
+        settings[f'general.release_title_filter.value{x}'] = rng.choice(FILTER_WORDS)
+        settings[f'general.release_title_filter.exclude{x}'] = rng.random() < 0.5
+    return settings
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_sort_sources_matches_legacy(seed, monkeypatch):
+    rng = random.Random(2023 + seed)
+    for _ in range(250):
+        settings = _settings(rng)
+        for name in ('getInt', 'getNumber', 'getBool', 'getSetting', 'getStringList'):
+            monkeypatch.setattr(control, name, settings.__getitem__)
+        sources = [_source(rng, n) for n in range(rng.randint(0, 60))]
+        cut = sorted(rng.randint(0, len(sources)) for _ in range(3))
+        lists = sources[:cut[0]], sources[cut[0]:cut[1]], sources[cut[1]:cut[2]], sources[cut[2]:]
+        media_type, duration = rng.choice(['movie', 'episode']), rng.choice([24, 90])
+        current = pages.Sources.sortSources(*lists, media_type, duration)
+        expected = legacy_sort_sources(*lists, media_type, duration)
+        assert list(map(id, current)) == list(map(id, expected)), settings
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from resources.lib.ui import control, database
+from resources.lib.ui.database import SQL
+
+
+def test_close_connections_waits_for_blocks_on_other_threads():
+    inside = threading.Event()
+    closed = threading.Event()
+    result = {}
+
+    def reader():
+        with SQL(control.cacheFile) as cursor:
+            inside.set()
+            closed.wait(5)
+            result['rows'] = cursor.execute('SELECT 1 AS one').fetchone()
+            result['conn'] = cursor.connection
+        with SQL(control.cacheFile) as cursor:
+            result['next'] = cursor.connection
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    inside.wait(5)
+    database.close_connections()
+    closed.set()
+    thread.join(5)
+
+    assert result['rows'] == {'one': 1}
+    # closed once the block exited, the next block got a fresh connection
+    with pytest.raises(database.dbapi2.ProgrammingError):
+        result['conn'].execute('SELECT 1')
+    assert result['next'] is not result['conn']
+    assert not database._checked_out and not database._retired
+
+
+def test_nested_blocks_keep_the_connection_until_the_outer_one_exits():
+    with SQL(control.cacheFile) as outer:
+        with SQL(control.cacheFile) as inner:
+            assert inner.connection is outer.connection
+            database.close_connections(control.cacheFile)
+        assert outer.execute('SELECT 2 AS two').fetchone() == {'two': 2}
+        with SQL(control.cacheFile) as fresh:
+            assert fresh.connection is not outer.connection
+    with pytest.raises(database.dbapi2.ProgrammingError):
+        outer.connection.execute('SELECT 1')
+    assert not database._checked_out and not database._retired
+
+
+def test_idle_connections_are_closed_right_away():
+    with SQL(control.cacheFile) as cursor:
+        conn = cursor.connection
+    database.close_connections(control.cacheFile)
+    with pytest.raises(database.dbapi2.ProgrammingError):
+        conn.execute('SELECT 1')
@@ -0,0 +1,70 @@
+import http.server
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resources.lib.ui import client
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    monkeypatch.setattr(client, '_ssl_contexts', {})
+    calls = []
+    build = client._build_ssl_context
+
+    def counting_build(*args):
+        calls.append(args)
+        return build(*args)
+
+    monkeypatch.setattr(client, '_build_ssl_context', counting_build)
+    return calls
+
+
+@pytest.fixture
+def base_url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_one_context_per_key_across_threads(builds):
+    with ThreadPoolExecutor(8) as executor:
+        contexts = list(executor.map(lambda _: client._ssl_context(False), range(64)))
+    assert contexts[0] is not None
+    assert all(context is contexts[0] for context in contexts)
+    assert client._ssl_context(False, alpn=None) is not contexts[0]
+    assert client._ssl_context(False, alpn=('h2', 'http/1.1')) is not contexts[0]
+    assert len(builds) == 3
+
+
+def test_requests_reuse_the_built_context(builds, base_url):
+    for i in range(20):
+        assert client.request(f'{base_url}/{i}', verify=False, cache=False) == 'ok'
+    assert builds == [(False, None, ('http/1.1',))]
+
+
+def test_unavailable_context_is_remembered_and_falls_back(builds, base_url, monkeypatch):
+    monkeypatch.setitem(client._TLS_PROTOCOLS, 'TLSv0', 'PROTOCOL_NOT_A_PROTOCOL')
+    assert client._ssl_context(False, 'TLSv0') is None
+    assert client._ssl_context(False, 'TLSv0') is None
+    for _ in range(5):
+        assert client.request(base_url, verify=False, tls_version='TLSv0', cache=False) == 'ok'
+    assert builds == [(False, 'TLSv0', ('http/1.1',)), (False, None, ('http/1.1',))]
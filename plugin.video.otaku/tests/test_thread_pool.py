@@ -0,0 +1,56 @@
+import threading
+
+from resources.lib.ui import control, thread_pool
+
+
+def test_nested_maps_inherit_the_lane_of_their_batch():
+    pool = thread_pool.SharedPool(4)
+
+    def inner(_):
+        return thread_pool.current_priority()
+
+    def outer(_):
+        return pool.map(inner, range(4))
+
+    background = pool.map(outer, range(4), priority=thread_pool.PRIORITY_BACKGROUND)
+    assert background == [[thread_pool.PRIORITY_BACKGROUND] * 4] * 4
+    assert pool.map(outer, range(4)) == [[thread_pool.PRIORITY_UI] * 4] * 4
+    with thread_pool.lane(thread_pool.PRIORITY_BACKGROUND):
+        assert pool.map(inner, range(4)) == [thread_pool.PRIORITY_BACKGROUND] * 4
+    assert thread_pool.current_priority() == thread_pool.PRIORITY_UI
+
+
+def test_size_follows_the_setting(monkeypatch):
+    pool = thread_pool.SharedPool()
+    monkeypatch.setattr(control, 'getInt', lambda key: 3 if key == 'general.threads' else 0)
+    pool.map(str, range(10))
+    assert pool.max_workers == 3
+    assert pool.stats()['peak_workers'] <= 3
+
+    monkeypatch.setattr(control, 'getInt', lambda key: 5)
+    pool.map(str, range(10))
+    assert pool.max_workers == 3  # not re-read within RESIZE_INTERVAL
+    pool._sized_at -= thread_pool.RESIZE_INTERVAL
+    pool.map(str, range(10))
+    assert pool.max_workers == 5
+
+
+def test_workers_are_not_daemons():
+    pool = thread_pool.SharedPool(2)
+    started = threading.Event()
+    release = threading.Event()
+    worker = []
+
+    def task(i):
+        if threading.current_thread().name == 'otaku-pool':
+            worker.append(threading.current_thread())
+            started.set()
+            release.wait(5)
+        return i
+
+    caller = threading.Thread(target=pool.map, args=(task, range(4)))
+    caller.start()
+    started.wait(5)
+    release.set()
+    caller.join(5)
+    assert worker and not any(thread.daemon for thread in worker)